@@ -1,4 +1,4 @@
-from core.ark_logger import ark_logger
+import asyncio
 import logging
 import time
 from collections.abc import AsyncGenerator
@@ -11,9 +11,12 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse, PlainTextResponse
 from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 
+from core.ark_logger import ark_logger
 from modules.assistantia.core import router as assistantia_router
+from modules.assistantia.utils.ollama_connector import close_ollama_client, get_model_catalog
 from modules.monitoring.prometheus_metrics import ArkaliaMetrics
 from modules.reflexia.core_api import router as reflexia_router
+from modules.reflexia.logic.metrics_enhanced import get_metrics_sampler
 from modules.zeroia.core import router as zeroia_router
 
 # Configuration logging
@@ -27,6 +30,16 @@ metrics = ArkaliaMetrics()
 start_time = time.time()
 
 
+def _cached_system_metrics() -> dict | None:
+    """Section système du dernier snapshot Reflexia (aucune I/O)"""
+    snapshot = get_metrics_sampler(start=False).peek()
+    return snapshot.system if snapshot is not None else None
+
+
+# Les gauges système sont lues au scrape depuis le cache du sampler
+metrics.bind_system_snapshot(_cached_system_metrics, lambda: time.time() - start_time)
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     """Gestion du cycle de vie de l'application"""
@@ -38,8 +51,18 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     metrics.arkalia_modules_status.labels(module_name="reflexia").set(1)
     metrics.arkalia_modules_status.labels(module_name="zeroia").set(1)
 
+    # Sampler partagé : première collecte hors boucle d'événements puis rafraîchissement continu
+    sampler = get_metrics_sampler(start=False)
+    await asyncio.to_thread(sampler.refresh)
+    sampler.start()
+
+    # Catalogue des modèles Ollama : sonde périodique, hors du chemin des requêtes
+    get_model_catalog().start()
+
     yield
 
+    sampler.stop()
+    await close_ollama_client()
     logger.info("🛑 Arrêt Arkalia-LUNA API")
 
 
@@ -130,20 +153,7 @@ async def get_metrics():
     📊 Endpoint métriques Prometheus pour l'API principale
     """
     try:
-        # Mettre à jour les métriques système
-        import psutil
-
-        # Uptime
-        metrics.arkalia_system_uptime.set(time.time() - start_time)
-
-        # Mémoire
-        memory = psutil.virtual_memory()
-        metrics.arkalia_memory_usage.set(memory.used)
-
-        # CPU
-        cpu_percent = psutil.cpu_percent(interval=0.1)
-        metrics.arkalia_cpu_usage.set(cpu_percent)
-
+        # Uptime, CPU et mémoire sont servis par les gauges liées au cache
         # Générer le format Prometheus avec le registre unique
         prometheus_data = generate_latest(metrics.get_registry())
 
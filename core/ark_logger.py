@@ -59,40 +59,32 @@ class ArkaliaLogger:
 
         return logger
 
+    def _context(self, extra: dict[str, Any] | None) -> dict[str, Any]:
+        """Construit le contexte structuré (``module`` est réservé par LogRecord)"""
+        context = dict(extra or {})
+        context["arkalia_module"] = context.pop("module", self.module_name)
+        context["timestamp"] = datetime.now().isoformat()
+        return context
+
     def info(self, message: str, extra: dict[str, Any] | None = None) -> None:
         """Log info avec contexte structuré"""
-        if extra:
-            extra["arkalia_module"] = self.module_name
-            extra["timestamp"] = datetime.now().isoformat()
-        self.logger.info(message, extra=extra)
+        self.logger.info(message, extra=self._context(extra))
 
     def error(self, message: str, extra: dict[str, Any] | None = None) -> None:
         """Log error avec contexte structuré"""
-        if extra:
-            extra["arkalia_module"] = self.module_name
-            extra["timestamp"] = datetime.now().isoformat()
-        self.logger.error(message, extra=extra)
+        self.logger.error(message, extra=self._context(extra))
 
     def warning(self, message: str, extra: dict[str, Any] | None = None) -> None:
         """Log warning avec contexte structuré"""
-        if extra:
-            extra["arkalia_module"] = self.module_name
-            extra["timestamp"] = datetime.now().isoformat()
-        self.logger.warning(message, extra=extra)
+        self.logger.warning(message, extra=self._context(extra))
 
     def debug(self, message: str, extra: dict[str, Any] | None = None) -> None:
         """Log debug avec contexte structuré"""
-        if extra:
-            extra["arkalia_module"] = self.module_name
-            extra["timestamp"] = datetime.now().isoformat()
-        self.logger.debug(message, extra=extra)
+        self.logger.debug(message, extra=self._context(extra))
 
     def critical(self, message: str, extra: dict[str, Any] | None = None) -> None:
         """Log critical avec contexte structuré"""
-        if extra:
-            extra["arkalia_module"] = self.module_name
-            extra["timestamp"] = datetime.now().isoformat()
-        self.logger.critical(message, extra=extra)
+        self.logger.critical(message, extra=self._context(extra))
 
 # Instance globale du logger Arkalia
 ark_logger = ArkaliaLogger("core")
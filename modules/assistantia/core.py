@@ -5,27 +5,38 @@ Ce module fait partie du système Arkalia Luna Pro.
 """
 
 import asyncio
+import inspect
 import json
 import logging
-from collections.abc import Callable
+from collections.abc import AsyncIterator, Awaitable, Callable
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Optional
 
+import httpx
 import requests
-from fastapi import APIRouter, BackgroundTasks, Depends, FastAPI, HTTPException
+from fastapi import APIRouter, BackgroundTasks, Depends, FastAPI, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, PlainTextResponse
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest
 from pydantic import BaseModel, Field
 
-from .utils.ollama_connector import check_ollama_health
-from .utils.ollama_connector import query_ollama as real_query_ollama
+from .utils.context_provider import get_context_provider
+from .utils.ollama_connector import aquery_ollama, get_model_catalog, get_ollama_client
 from .utils.processing import process_input
+from .utils.response_cache import get_response_cache
+from .utils.scheduler import PRIORITIES, PRIORITY_NORMAL, SchedulerOverloaded, request_identity
 
+# Nom patché par les tests pour simuler Ollama
+real_query_ollama = aquery_ollama
 
-def _check_ollama_health() -> bool:
-    return check_ollama_health()
+
+async def _check_ollama_health() -> bool:
+    """Santé d'Ollama tenue par le catalogue (aucun appel HTTP hors premier chargement)"""
+    catalog = get_model_catalog()
+    await catalog.ready()
+    return catalog.is_available
 
 
 # Configuration du logging
@@ -49,6 +60,12 @@ assistantia_active_connections = Gauge(
     "assistantia_active_connections", "Nombre de connexions actives à AssistantIA"
 )
 
+assistantia_cache_lookups_total = Counter(
+    "assistantia_cache_lookups_total",
+    "Consultations du cache de réponses AssistantIA",
+    ["result"],
+)
+
 assistantia_context_quality = Gauge(
     "assistantia_context_quality_score", "Score de qualité du contexte Arkalia (0-100)"
 )
@@ -69,6 +86,7 @@ class MessageInput(BaseModel):
         default=0.7, ge=0.0, le=2.0, description="Température de génération"
     )
     include_context: bool | None = Field(default=True, description="Inclure le contexte Arkalia")
+    use_cache: bool | None = Field(default=True, description="Servir une réponse en cache")
 
 
 class ChatResponse(BaseModel):
@@ -83,6 +101,7 @@ class ChatResponse(BaseModel):
     processing_time: float
     context_quality: float
     arkalia_context: str | None = None
+    cached: bool = False
 
 
 class HealthResponse(BaseModel):
@@ -104,107 +123,78 @@ startup_time = datetime.now()
 active_connections = 0
 
 
-def get_query_ollama() -> Callable[[str, str, float], str]:
-    return lambda prompt, model, temp: real_query_ollama(prompt, model, temp)
+def _client_identity(request: Request) -> tuple[str, int]:
+    """Client (en-tête ``X-Client-ID`` ou adresse) et priorité (``X-Priority``)"""
+    client_id = request.headers.get("x-client-id") or (
+        request.client.host if request.client else "anonymous"
+    )
+    priority = PRIORITIES.get(request.headers.get("x-priority", "").lower(), PRIORITY_NORMAL)
+    return client_id, priority
 
 
-async def get_arkalia_context() -> tuple[str, float]:
-    """Récupère le contexte des autres modules Arkalia avec score de qualité"""
-    context_parts = []
-    quality_score = 0.0
-    max_score = 100.0
+def _overloaded(e: SchedulerOverloaded) -> HTTPException:
+    assistantia_prompts_total.labels(status="shed", security_level="medium", model=e.model).inc()
+    return HTTPException(
+        status_code=503,
+        detail="Service IA saturé, réessayez plus tard",
+        headers={"Retry-After": str(e.retry_after)},
+    )
 
-    try:
-        # État ZeroIA
-        zeroia_dashboard = Path("state/zeroia_dashboard.json")
-        if zeroia_dashboard.exists():
-            try:
-                with open(zeroia_dashboard) as f:
-                    dashboard = json.load(f)
-                status = dashboard.get("last_decision", "unknown")
-                context_parts.append(f"ZeroIA: {status}")
-                quality_score += 25.0 if status != "unknown" else 10.0
-            except (json.JSONDecodeError, KeyError, OSError) as e:
-                logger.warning(f"Erreur lecture ZeroIA: {e}")
-                context_parts.append("ZeroIA: error")
-                quality_score += 5.0
-        else:
-            context_parts.append("ZeroIA: inactive")
-            quality_score += 2.0
-    except Exception as e:
-        logger.error(f"Erreur contexte ZeroIA: {e}")
-        context_parts.append("ZeroIA: unavailable")
 
-    try:
-        # État Reflexia
-        reflexia_state = Path("state/reflexia_state.toml")
-        if reflexia_state.exists():
-            try:
-                import toml
-
-                reflexia_data = toml.load(reflexia_state)
-                status = reflexia_data.get("status", "unknown")
-                context_parts.append(f"Reflexia: {status}")
-                quality_score += 25.0 if status != "unknown" else 10.0
-            except Exception as e:
-                logger.warning(f"Erreur lecture Reflexia: {e}")
-                context_parts.append("Reflexia: error")
-                quality_score += 5.0
-        else:
-            context_parts.append("Reflexia: inactive")
-            quality_score += 2.0
-    except Exception as e:
-        logger.error(f"Erreur contexte Reflexia: {e}")
-        context_parts.append("Reflexia: unavailable")
+def get_query_ollama() -> Callable[[str, str, float], Awaitable[str]]:
+    async def _query(prompt: str, model: str, temp: float) -> str:
+        return await real_query_ollama(prompt, model, temp)
 
-    try:
-        # État Sandozia
-        sandozia_state = Path("state/sandozia")
-        if sandozia_state.exists() and any(sandozia_state.iterdir()):
-            context_parts.append("Sandozia: active")
-            quality_score += 25.0
-        else:
-            context_parts.append("Sandozia: inactive")
-            quality_score += 2.0
-    except Exception as e:
-        logger.error(f"Erreur contexte Sandozia: {e}")
-        context_parts.append("Sandozia: unavailable")
+    return _query
 
-    try:
-        # État Cognitive Reactor
-        cognitive_state = Path("state/cognitive_reactor_state.toml")
-        if cognitive_state.exists():
-            try:
-                import toml
-
-                cognitive_data = toml.load(cognitive_state)
-                status = cognitive_data.get("status", "unknown")
-                context_parts.append(f"Cognitive: {status}")
-                quality_score += 25.0 if status != "unknown" else 10.0
-            except Exception as e:
-                logger.warning(f"Erreur lecture Cognitive: {e}")
-                context_parts.append("Cognitive: error")
-                quality_score += 5.0
-        else:
-            context_parts.append("Cognitive: inactive")
-            quality_score += 2.0
-    except Exception as e:
-        logger.error(f"Erreur contexte Cognitive: {e}")
-        context_parts.append("Cognitive: unavailable")
 
-    # Normaliser le score de qualité
-    final_quality = min(quality_score, max_score)
-    assistantia_context_quality.set(final_quality)
+async def get_arkalia_context() -> tuple[str, float]:
+    """Récupère le contexte des autres modules Arkalia avec score de qualité"""
+    context = await get_context_provider().current()
+    assistantia_context_quality.set(context.quality)
+    return context.text, context.quality
+
+
+async def _prepare_prompt(data: MessageInput) -> tuple[str, str | None, float]:
+    """Message prétraité, enrichi du contexte Arkalia si demandé"""
+    message = data.message.strip()
+    arkalia_context = None
+    context_quality = 0.0
+    if data.include_context:
+        arkalia_context, context_quality = await get_arkalia_context()
+        message = f"{message}\n\nContexte système Arkalia-LUNA: {arkalia_context}"
+    return process_input(message), arkalia_context, context_quality
+
+
+def _cache_lookup(data: MessageInput, arkalia_context: str | None) -> str | None:
+    """Réponse en cache pour ce message, ce modèle et ce contexte"""
+    if not data.use_cache:
+        return None
+    hit = get_response_cache().get(data.model, data.temperature, data.message, arkalia_context)
+    assistantia_cache_lookups_total.labels(result=hit.kind if hit else "miss").inc()
+    return hit.response if hit else None
+
+
+def _cache_store(data: MessageInput, arkalia_context: str | None, response: str) -> None:
+    # Les messages d'erreur du connecteur ne sont jamais mis en cache
+    if data.use_cache and response and not response.startswith(("Erreur", "[⚠️")):
+        get_response_cache().put(
+            data.model, data.temperature, data.message, response, arkalia_context
+        )
+
 
-    context_str = " | ".join(context_parts) if context_parts else "Système Arkalia-LUNA"
-    return context_str, final_quality
+def _sse(data: dict[str, Any], event: str | None = None) -> str:
+    """Trame server-sent events"""
+    prefix = f"event: {event}\n" if event else ""
+    return f"{prefix}data: {json.dumps(data, ensure_ascii=False)}\n\n"
 
 
 @router.post("/chat", response_model=ChatResponse)
 async def post_chat(
     data: MessageInput,
     background_tasks: BackgroundTasks,
-    query_ollama: Callable[[str, str, float], str] = Depends(get_query_ollama),
+    request: Request,
+    query_ollama: Callable[..., Awaitable[str] | str] = Depends(get_query_ollama),
 ) -> ChatResponse:
     """Endpoint principal pour le chat avec AssistantIA"""
     global active_connections
@@ -220,24 +210,28 @@ async def post_chat(
         if not message:
             raise HTTPException(status_code=400, detail="Message vide")
 
-        # Vérifier la santé d'Ollama
-        if not _check_ollama_health():
-            raise HTTPException(status_code=503, detail="Service IA temporairement indisponible")
-
-        # Récupérer le contexte Arkalia si demandé
-        arkalia_context = None
-        context_quality = 0.0
-        if data.include_context:
-            arkalia_context, context_quality = await get_arkalia_context()
-            enriched_message = f"{message}\n\nContexte système Arkalia-LUNA: {arkalia_context}"
-        else:
-            enriched_message = message
-
-        # Prétraiter le message
-        processed_message = process_input(enriched_message)
-
-        # Appeler Ollama
-        response = query_ollama(processed_message, data.model, data.temperature)
+        processed_message, arkalia_context, context_quality = await _prepare_prompt(data)
+
+        # Réponse en cache : servie même si Ollama est indisponible
+        response = _cache_lookup(data, arkalia_context)
+        cached = response is not None
+
+        if not cached:
+            # Vérifier la santé d'Ollama
+            if not await _check_ollama_health():
+                raise HTTPException(
+                    status_code=503, detail="Service IA temporairement indisponible"
+                )
+
+            # Appeler Ollama (une dépendance synchrone est déportée dans un thread)
+            request_identity.set(_client_identity(request))
+            if inspect.iscoroutinefunction(query_ollama):
+                response = await query_ollama(processed_message, data.model, data.temperature)
+            else:
+                response = await run_in_threadpool(
+                    query_ollama, processed_message, data.model, data.temperature
+                )
+            _cache_store(data, arkalia_context, response)
 
         # Calculer le temps de traitement
         processing_time = asyncio.get_event_loop().time() - start_time
@@ -259,12 +253,15 @@ async def post_chat(
             processing_time=processing_time,
             context_quality=context_quality,
             arkalia_context=arkalia_context if data.include_context else None,
+            cached=cached,
         )
 
     except HTTPException:
         # Re-raise HTTPException
         raise
-    except requests.exceptions.Timeout:
+    except SchedulerOverloaded as e:
+        raise _overloaded(e) from None
+    except (requests.exceptions.Timeout, httpx.TimeoutException):
         assistantia_prompts_total.labels(
             status="timeout", security_level="medium", model=data.model
         ).inc()
@@ -281,6 +278,118 @@ async def post_chat(
         assistantia_active_connections.set(active_connections)
 
 
+@router.post("/chat/stream")
+async def post_chat_stream(data: MessageInput, request: Request) -> StreamingResponse:
+    """
+    Chat en streaming (server-sent events).
+
+    Chaque fragment généré est émis dans une trame ``data: {"token": ...}``,
+    puis une trame ``event: done`` clôt la réponse. Si le client se
+    déconnecte, la génération amont est interrompue.
+    """
+    message = data.message.strip()
+    if not message:
+        raise HTTPException(status_code=400, detail="Message vide")
+
+    start_time = asyncio.get_event_loop().time()
+    processed_message, arkalia_context, context_quality = await _prepare_prompt(data)
+
+    def done_event(model_used: str, cached: bool) -> str:
+        processing_time = asyncio.get_event_loop().time() - start_time
+        assistantia_response_time.observe(processing_time)
+        return _sse(
+            {
+                "model_used": model_used,
+                "processing_time": processing_time,
+                "context_quality": context_quality,
+                "arkalia_context": arkalia_context,
+                "cached": cached,
+            },
+            event="done",
+        )
+
+    cached_response = _cache_lookup(data, arkalia_context)
+    if cached_response is not None:
+
+        async def cached_stream() -> AsyncIterator[str]:
+            yield _sse({"token": cached_response})
+            yield done_event(data.model, cached=True)
+
+        return StreamingResponse(cached_stream(), media_type="text/event-stream")
+
+    if not await _check_ollama_health():
+        raise HTTPException(status_code=503, detail="Service IA temporairement indisponible")
+
+    client = get_ollama_client()
+    try:
+        model = client.catalog.resolve(data.model)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+
+    client_id, priority = _client_identity(request)
+    tokens = client.stream(processed_message, model, data.temperature, client_id, priority)
+
+    # Premier fragment attendu ici : une erreur amont devient un vrai statut HTTP
+    try:
+        first = await anext(tokens, "")
+    except SchedulerOverloaded as e:
+        raise _overloaded(e) from None
+    except httpx.TimeoutException:
+        assistantia_prompts_total.labels(
+            status="timeout", security_level="medium", model=data.model
+        ).inc()
+        raise HTTPException(status_code=504, detail="Délai de réponse dépassé") from None
+    except (httpx.HTTPError, ValueError) as e:
+        logger.error(f"Erreur AssistantIA stream: {e}")
+        assistantia_prompts_total.labels(
+            status="error", security_level="medium", model=data.model
+        ).inc()
+        raise HTTPException(status_code=503, detail="Service IA temporairement indisponible") from e
+
+    async def event_stream() -> AsyncIterator[str]:
+        global active_connections
+        active_connections += 1
+        assistantia_active_connections.set(active_connections)
+        parts = [first]
+        status = "success"
+        try:
+            if first:
+                yield _sse({"token": first})
+            async for token in tokens:
+                if await request.is_disconnected():
+                    status = "cancelled"
+                    break
+                parts.append(token)
+                yield _sse({"token": token})
+            else:
+                response = "".join(parts)
+                _cache_store(data, arkalia_context, response)
+                yield done_event(model, cached=False)
+                processing_time = asyncio.get_event_loop().time() - start_time
+                await log_chat_interaction(message, response, processing_time, model)
+        except asyncio.CancelledError:
+            status = "cancelled"
+            raise
+        except (httpx.HTTPError, ValueError) as e:
+            status = "error"
+            logger.error(f"Erreur AssistantIA stream: {e}")
+            yield _sse({"error": str(e)}, event="error")
+        finally:
+            # Fermer l'itérateur ferme la connexion amont : Ollama arrête de générer
+            await tokens.aclose()
+            assistantia_prompts_total.labels(
+                status=status, security_level="medium", model=data.model
+            ).inc()
+            active_connections = max(0, active_connections - 1)
+            assistantia_active_connections.set(active_connections)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 async def log_chat_interaction(message: str, response: str, processing_time: float, model: str):
     """Log l'interaction en arrière-plan"""
     try:
@@ -308,7 +417,7 @@ async def health() -> HealthResponse:
     """Endpoint de santé avec informations détaillées"""
     try:
         # Vérifier Ollama
-        ollama_available = check_ollama_health()
+        ollama_available = await _check_ollama_health()
 
         # Récupérer l'état des modules Arkalia
         arkalia_modules = {}
@@ -355,11 +464,11 @@ async def get_metrics():
 async def get_available_models():
     """Récupère la liste des modèles disponibles"""
     try:
-        from .utils.ollama_connector import get_available_models
-
-        models = get_available_models()
+        catalog = get_model_catalog()
+        await catalog.ready()
+        models = catalog.entries
         if models:
-            return {"models": models.get("models", [])}
+            return {"models": models}
         else:
             return {"models": [], "error": "Impossible de récupérer les modèles"}
     except Exception as e:
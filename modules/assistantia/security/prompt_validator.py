@@ -3,11 +3,40 @@
 
 import hashlib
 import re
-import time
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from enum import Enum
+from functools import lru_cache
 from typing import Any, Optional
 
+import numpy as np
+
+from modules.assistantia.security.rate_limiter import RateLimiter, create_rate_limiter
+
+try:  # Python >= 3.11
+    from re import _constants as _sre
+    from re import _parser as _sre_parse
+except ImportError:  # pragma: no cover - Python 3.10
+    import sre_constants as _sre  # type: ignore[no-redef]
+    import sre_parse as _sre_parse  # type: ignore[no-redef]
+
+_PATTERN_FLAGS = re.IGNORECASE | re.MULTILINE
+_IGNORECASE_FOLDS = str.maketrans({"ı": "i", "ſ": "s"})
+_SUSPICIOUS_CHARS = re.compile(r"[<>{}()\[\]`$|&;]")
+
+# Sanitisation en une passe : caractères de contrôle supprimés, caractères
+# dangereux échappés (pas de double échappement de "&" possible)
+_SANITIZE_ESCAPES = {
+    "&": "&amp;",
+    "<": "&lt;",
+    ">": "&gt;",
+    '"': "&quot;",
+    "'": "&#x27;",
+    "`": "&#x60;",
+}
+_SANITIZE_CHARS = re.compile(r"[\x00-\x08\x0B\x0C\x0E-\x1F\x7F&<>\"'`]")
+
 
 class SecurityLevel(Enum):
     """Niveaux de sécurité pour la validation"""
@@ -29,13 +58,176 @@ class ValidationResult:
     blocked_patterns: list[str]
 
 
+def _required_literals(items: Any) -> frozenset[str] | None:
+    """
+    Littéraux dont au moins un figure forcément dans tout texte reconnu par
+    la séquence ``items`` (arbre ``sre_parse``), ou None si aucun n'est garanti
+    """
+    candidates: list[frozenset[str]] = []
+    run: list[str] = []
+
+    def flush() -> None:
+        if run:
+            candidates.append(frozenset(["".join(run)]))
+            run.clear()
+
+    for op, av in items:
+        if op is _sre.LITERAL:
+            char = chr(av).lower()
+            if char.isascii():
+                run.append(char)
+                continue
+        flush()
+        if op is _sre.SUBPATTERN:
+            sub = _required_literals(av[-1])
+        elif op is _sre.BRANCH:
+            alternatives = [_required_literals(branch) for branch in av[1]]
+            sub = None if None in alternatives else frozenset().union(*alternatives)
+        elif op in (_sre.MAX_REPEAT, _sre.MIN_REPEAT) and av[0] >= 1:
+            sub = _required_literals(av[2])
+        else:
+            sub = None
+        if sub:
+            candidates.append(sub)
+    flush()
+
+    # Ancre la plus sélective : celle dont le plus court littéral est le plus long
+    return max(candidates, key=lambda c: min(map(len, c)), default=None)
+
+
+def _anchors(pattern: str) -> frozenset[str] | None:
+    try:
+        return _required_literals(_sre_parse.parse(pattern, _PATTERN_FLAGS))
+    except Exception:
+        # Pattern non analysable : toujours confirmé par la regex
+        return None
+
+
+class InjectionScanner:
+    """
+    Jeu de patterns compilé une fois, avec préfiltre par littéraux
+
+    Chaque pattern est associé aux littéraux dont l'un doit figurer dans le
+    texte pour qu'il puisse correspondre (``instructions`` pour
+    ``ignore.*previous.*instructions``, ``rm``/``del``/... pour
+    ``;\\s*(?:rm|del|...)``). Un test ``in`` sur le prompt écarte la plupart
+    des patterns sans lancer le moteur de regex ; les autres sont confirmés
+    par leur regex précompilée. Le résultat est identique à une recherche
+    ``re.search`` pattern par pattern.
+    """
+
+    def __init__(self, patterns: tuple[str, ...]) -> None:
+        self.patterns = patterns
+        self._entries = [
+            (pattern, re.compile(pattern, _PATTERN_FLAGS), _anchors(pattern))
+            for pattern in patterns
+        ]
+
+    def scan(self, text: str) -> list[str]:
+        """Patterns présents dans ``text``, dans l'ordre de déclaration"""
+        text_lower = text.lower()
+        haystack = text_lower
+        if not text_lower.isascii() and ("ı" in text_lower or "ſ" in text_lower):
+            # Seules lettres que IGNORECASE rapproche d'un littéral ASCII
+            # sans que lower() les y ramène (ı/i, ſ/s)
+            haystack = text_lower.translate(_IGNORECASE_FOLDS)
+        return [
+            pattern
+            for pattern, regex, anchors in self._entries
+            if (anchors is None or any(anchor in haystack for anchor in anchors))
+            and regex.search(text_lower)
+        ]
+
+
+@lru_cache(maxsize=16)
+def get_injection_scanner(patterns: tuple[str, ...]) -> InjectionScanner:
+    """Scanner compilé partagé par les validateurs d'un même jeu de patterns"""
+    return InjectionScanner(patterns)
+
+
+@dataclass
+class PromptAnalysis:
+    """Partie sans état de la validation d'un prompt (calculable hors processus)"""
+
+    blocked_patterns: list[str]
+    entropy: float
+    suspicious_chars: int
+    sanitized_prompt: str
+
+
+def _entropy_rows(counts: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    """Entropie de Shannon de chaque ligne d'un histogramme de caractères"""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        probabilities = counts / lengths[:, None]
+        terms = np.where(counts > 0, probabilities * np.log2(probabilities), 0.0)
+    return -terms.sum(axis=1)
+
+
+def shannon_entropies(texts: Sequence[str]) -> np.ndarray:
+    """
+    Entropie de Shannon (par caractère) de chaque texte
+
+    Les textes ASCII sont traités ensemble : un seul ``np.bincount`` sur
+    (indice du texte, octet) donne l'histogramme de tout le lot. Les autres
+    sont comptés sur leurs points de code (UTF-32).
+    """
+    entropies = np.zeros(len(texts))
+    ascii_rows = [i for i, text in enumerate(texts) if text and text.isascii()]
+    if ascii_rows:
+        lengths = np.array([len(texts[i]) for i in ascii_rows])
+        data = np.frombuffer("".join(texts[i] for i in ascii_rows).encode("ascii"), np.uint8)
+        rows = np.repeat(np.arange(len(ascii_rows)), lengths)
+        counts = np.bincount(rows * 128 + data, minlength=len(ascii_rows) * 128)
+        entropies[ascii_rows] = _entropy_rows(counts.reshape(-1, 128), lengths)
+    for i, text in enumerate(texts):
+        if text and not text.isascii():
+            code_points = np.frombuffer(text.encode("utf-32-le"), np.uint32)
+            if code_points.max() < 0x10000:
+                counts = np.bincount(code_points)
+            else:
+                counts = np.unique(code_points, return_counts=True)[1]
+            entropies[i] = _entropy_rows(counts[None, :], np.array([len(text)]))[0]
+    return entropies
+
+
+def _sanitize_char(match: re.Match) -> str:
+    return _SANITIZE_ESCAPES.get(match.group(), "")
+
+
+def _sanitize(prompt: str) -> str:
+    # Espaces normalisés, puis contrôle et échappement en un seul parcours
+    sanitized = _SANITIZE_CHARS.sub(_sanitize_char, " ".join(prompt.split()))
+    if len(sanitized) > 5000:
+        sanitized = sanitized[:5000] + " [TRONQUÉ]"
+    return sanitized
+
+
+def analyze_prompts(patterns: tuple[str, ...], prompts: Sequence[str]) -> list[PromptAnalysis]:
+    """Analyse d'un lot de prompts (fonction de module : exécutable dans un process pool)"""
+    scanner = get_injection_scanner(patterns)
+    entropies = shannon_entropies(prompts)
+    return [
+        PromptAnalysis(
+            blocked_patterns=scanner.scan(prompt),
+            entropy=float(entropy),
+            suspicious_chars=len(_SUSPICIOUS_CHARS.findall(prompt)),
+            sanitized_prompt=_sanitize(prompt),
+        )
+        for prompt, entropy in zip(prompts, entropies, strict=True)
+    ]
+
+
 class PromptValidator:
     """Validateur principal pour les prompts LLM"""
 
-    def __init__(self, security_level: SecurityLevel = SecurityLevel.MEDIUM) -> None:
+    def __init__(
+        self,
+        security_level: SecurityLevel = SecurityLevel.MEDIUM,
+        rate_limiter: RateLimiter | None = None,
+    ) -> None:
         self.security_level = security_level
         self._load_patterns()
-        self._rate_limit_cache: dict[str, list[float]] = {}
+        self.rate_limiter = rate_limiter if rate_limiter is not None else create_rate_limiter()
 
     def _load_patterns(self):
         """Charge les patterns d'injection selon le niveau de sécurité"""
@@ -117,25 +309,90 @@ class PromptValidator:
                 ]
             )
 
-    def validate_input(self, prompt: str) -> ValidationResult:
+    def validate_input(self, prompt: str, client_id: str | None = None) -> ValidationResult:
         """
         Valide un prompt en entrée
 
         Args:
             prompt: Le prompt à valider
+            client_id: Identité du client pour le rate limiting (par défaut : le prompt)
 
         Returns:
             ValidationResult: Résultat de la validation
         """
         if not prompt or not prompt.strip():
-            return ValidationResult(
-                is_valid=False,
-                security_score=0.0,
-                issues=["Prompt vide"],
-                sanitized_prompt="",
-                blocked_patterns=[],
-            )
+            return self._empty_result()
 
+        analysis = PromptAnalysis(
+            blocked_patterns=self.detect_injection_patterns(prompt),
+            entropy=self._calculate_entropy(prompt),
+            suspicious_chars=len(_SUSPICIOUS_CHARS.findall(prompt)),
+            sanitized_prompt=self.sanitize_prompt(prompt),
+        )
+        return self._build_result(
+            prompt, analysis, self._check_rate_limit(prompt, client_id=client_id)
+        )
+
+    def validate_batch(
+        self,
+        prompts: Sequence[str],
+        client_id: str | None = None,
+        max_workers: int | None = None,
+        chunk_size: int = 256,
+        rate_limit: bool = False,
+    ) -> list[ValidationResult]:
+        """
+        Valide un lot de prompts (audit de logs de chat, validations groupées)
+
+        L'entropie est calculée pour tout le lot en une passe NumPy. Avec
+        ``max_workers``, les lots de plus de ``chunk_size`` prompts sont
+        analysés par morceaux dans un process pool.
+
+        Le rate limiting est désactivé par défaut : un audit de logs ne doit
+        pas consommer le quota des clients en direct.
+
+        Args:
+            prompts: Prompts à valider
+            client_id: Identité du client pour le rate limiting (par défaut : chaque prompt)
+            max_workers: Nombre de processus (None : tout dans le processus courant)
+            chunk_size: Taille des morceaux envoyés aux processus
+            rate_limit: Compter le lot dans ``rate_limiter`` (dans l'ordre du lot)
+
+        Returns:
+            list[ValidationResult]: Un résultat par prompt, dans l'ordre
+        """
+        indices = [i for i, prompt in enumerate(prompts) if prompt and prompt.strip()]
+        texts = [prompts[i] for i in indices]
+        patterns = tuple(self.injection_patterns)
+
+        if max_workers and len(texts) > chunk_size:
+            chunks = [texts[i : i + chunk_size] for i in range(0, len(texts), chunk_size)]
+            with ProcessPoolExecutor(max_workers=max_workers) as pool:
+                parts = pool.map(analyze_prompts, [patterns] * len(chunks), chunks)
+                analyses = [analysis for part in parts for analysis in part]
+        else:
+            analyses = analyze_prompts(patterns, texts)
+
+        results = [self._empty_result() for _ in prompts]
+        for i, analysis in zip(indices, analyses, strict=True):
+            allowed = not rate_limit or self._check_rate_limit(prompts[i], client_id=client_id)
+            results[i] = self._build_result(prompts[i], analysis, allowed)
+        return results
+
+    @staticmethod
+    def _empty_result() -> ValidationResult:
+        return ValidationResult(
+            is_valid=False,
+            security_score=0.0,
+            issues=["Prompt vide"],
+            sanitized_prompt="",
+            blocked_patterns=[],
+        )
+
+    @staticmethod
+    def _build_result(
+        prompt: str, analysis: PromptAnalysis, rate_limit_ok: bool
+    ) -> ValidationResult:
         # Vérifications de base
         issues: list[Any] = []
         blocked_patterns: list[Any] = []
@@ -146,34 +403,27 @@ class PromptValidator:
             issues.append("Prompt trop long (> 10KB)")
             security_score -= 0.3
 
-        # 2. Vérification des patterns d'injection
-        prompt_lower = prompt.lower()
-        for pattern in self.injection_patterns:
-            if re.search(pattern, prompt_lower, re.IGNORECASE | re.MULTILINE):
-                issues.append(f"Pattern suspect détecté: {pattern}")
-                blocked_patterns.append(pattern)
-                security_score -= 0.2
+        # 2. Vérification des patterns d'injection (un seul parcours du prompt)
+        for pattern in analysis.blocked_patterns:
+            issues.append(f"Pattern suspect détecté: {pattern}")
+            blocked_patterns.append(pattern)
+            security_score -= 0.2
 
         # 3. Vérification du rate limiting
-        if not self._check_rate_limit(prompt):
+        if not rate_limit_ok:
             issues.append("Rate limit dépassé")
             security_score -= 0.5
 
         # 4. Entropie suspecte (obfuscation)
-        entropy = self._calculate_entropy(prompt)
-        if entropy > 4.5:  # Seuil d'entropie élevée
+        if analysis.entropy > 4.5:  # Seuil d'entropie élevée
             issues.append("Entropie élevée - possible obfuscation")
             security_score -= 0.2
 
         # 5. Caractères suspects
-        suspicious_chars = len(re.findall(r"[<>{}()\[\]`$|&;]", prompt))
-        if suspicious_chars > len(prompt) * 0.1:  # Plus de 10% de caractères suspects
+        if analysis.suspicious_chars > len(prompt) * 0.1:  # Plus de 10% de caractères suspects
             issues.append("Trop de caractères suspects")
             security_score -= 0.1
 
-        # Sanitization
-        sanitized_prompt = self.sanitize_prompt(prompt)
-
         # Détermination finale
         is_valid = security_score >= 0.5 and len(blocked_patterns) == 0
 
@@ -181,7 +431,7 @@ class PromptValidator:
             is_valid=is_valid,
             security_score=max(0.0, security_score),
             issues=issues,
-            sanitized_prompt=sanitized_prompt,
+            sanitized_prompt=analysis.sanitized_prompt,
             blocked_patterns=blocked_patterns,
         )
 
@@ -197,26 +447,7 @@ class PromptValidator:
         """
         if not prompt:
             return ""
-
-        # 1. Normalisation des espaces
-        sanitized = re.sub(r"\s+", " ", prompt.strip())
-
-        # 2. Suppression des caractères de contrôle
-        sanitized = re.sub(r"[\x00-\x08\x0B\x0C\x0E-\x1F\x7F]", "", sanitized)
-
-        # 3. Échappement des caractères dangereux (ordre important : & en premier)
-        sanitized = sanitized.replace("&", "&amp;")
-        sanitized = sanitized.replace("<", "&lt;")
-        sanitized = sanitized.replace(">", "&gt;")
-        sanitized = sanitized.replace('"', "&quot;")
-        sanitized = sanitized.replace("'", "&#x27;")
-        sanitized = sanitized.replace("`", "&#x60;")
-
-        # 4. Limitation de longueur
-        if len(sanitized) > 5000:
-            sanitized = sanitized[:5000] + " [TRONQUÉ]"
-
-        return sanitized
+        return _sanitize(prompt)
 
     def detect_injection_patterns(self, text: str) -> list[str]:
         """
@@ -228,60 +459,28 @@ class PromptValidator:
         Returns:
             list[str]: Liste des patterns détectés
         """
-        detected: list[Any] = []
-        text_lower = text.lower()
-
-        for pattern in self.injection_patterns:
-            if re.search(pattern, text_lower, re.IGNORECASE | re.MULTILINE):
-                detected.append(pattern)
-
-        return detected
+        # Recompilé seulement si la liste de patterns a été modifiée
+        return get_injection_scanner(tuple(self.injection_patterns)).scan(text)
 
     def _check_rate_limit(
-        self, prompt: str, max_requests: int = 10, window_seconds: int = 60
+        self,
+        prompt: str,
+        max_requests: int = 10,
+        window_seconds: int = 60,
+        client_id: str | None = None,
     ) -> bool:
-        """Vérifie le rate limiting basé sur le hash du prompt"""
-        prompt_hash = hashlib.md5(prompt.encode(), usedforsecurity=False).hexdigest()  # nosec B324
-        current_time = time.time()
-
-        if prompt_hash not in self._rate_limit_cache:
-            self._rate_limit_cache[prompt_hash] = []
-
-        # Nettoie les anciens timestamps
-        self._rate_limit_cache[prompt_hash] = [
-            ts for ts in self._rate_limit_cache[prompt_hash] if current_time - ts < window_seconds
-        ]
-
-        # Vérifie la limite
-        if len(self._rate_limit_cache[prompt_hash]) >= max_requests:
-            return False
-
-        # Ajoute le timestamp actuel
-        self._rate_limit_cache[prompt_hash].append(current_time)
-        return True
+        """Vérifie le rate limiting par client, ou par hash du prompt à défaut"""
+        if client_id is not None:
+            key = f"client:{client_id}"
+        else:
+            key = hashlib.md5(prompt.encode(), usedforsecurity=False).hexdigest()  # nosec B324
+        return self.rate_limiter.allow(key, max_requests, window_seconds)
 
     def _calculate_entropy(self, text: str) -> float:
         """Calcule l'entropie d'un texte (détection d'obfuscation)"""
         if not text:
             return 0.0
-
-        import math
-
-        # Compte la fréquence des caractères
-        char_counts: dict[str, Any] = {}
-        for char in text:
-            char_counts[char] = char_counts.get(char, 0) + 1
-
-        # Calcule l'entropie de Shannon
-        length = len(text)
-        entropy = 0.0
-
-        for count in char_counts.values():
-            probability = count / length
-            if probability > 0:
-                entropy -= probability * math.log2(probability)
-
-        return entropy
+        return float(shannon_entropies([text])[0])
 
 
 # Instance globale par défaut
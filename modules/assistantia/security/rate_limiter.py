@@ -0,0 +1,277 @@
+# Rate limiting AssistantIA - Fenêtre glissante par clé
+# Compteurs bornés en mémoire (LRU) ou partagés entre workers (SQLite)
+
+import logging
+import math
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Base SQLite partagée entre les workers de l'API (vide : compteurs en mémoire)
+ASSISTANTIA_RATE_LIMIT_DB = os.getenv("ASSISTANTIA_RATE_LIMIT_DB", "")
+ASSISTANTIA_RATE_LIMIT_KEYS = int(os.getenv("ASSISTANTIA_RATE_LIMIT_KEYS", "10000"))
+
+
+@dataclass(frozen=True)
+class RateLimitResult:
+    """Décision de rate limiting pour une requête"""
+
+    allowed: bool
+    remaining: int
+    retry_after: float  # secondes avant la prochaine requête acceptée (0.0 si acceptée)
+
+
+@dataclass
+class WindowCounter:
+    """
+    État d'une clé : compteurs de la fenêtre courante et de la précédente
+
+    Les fenêtres sont alignées sur l'epoch ; la charge glissante est estimée
+    par ``previous * (1 - avancement) + current``, en O(1) quel que soit le
+    nombre de requêtes.
+    """
+
+    window_start: float
+    current: int
+    previous: int
+    window: float
+    touched: float
+
+    def advance(self, now: float, window: float) -> None:
+        start = math.floor(now / window) * window
+        if window != self.window or start - self.window_start >= 2 * window:
+            self.current = self.previous = 0
+        elif start > self.window_start:
+            self.previous, self.current = self.current, 0
+        self.window_start = start
+        self.window = window
+
+    def estimate(self, now: float) -> float:
+        progress = (now - self.window_start) / self.window
+        return self.previous * (1.0 - progress) + self.current
+
+    def hit(self, now: float, limit: int, window: float, cost: int) -> RateLimitResult:
+        """Comptabilise la requête si elle tient dans la limite (un refus ne compte pas)"""
+        self.advance(now, window)
+        self.touched = now
+        estimate = self.estimate(now)
+        if estimate + cost <= limit:
+            self.current += cost
+            return RateLimitResult(True, max(0, int(limit - estimate - cost)), 0.0)
+
+        # La part de la fenêtre précédente décroît linéairement : on cherche
+        # l'avancement à partir duquel ``cost`` requêtes tiennent dans la limite
+        if cost > limit:
+            retry_after = 2 * window
+        elif self.current + cost > limit:
+            # La fenêtre courante seule dépasse : attendre qu'elle devienne la précédente
+            progress = 1.0 - (limit - cost) / self.current
+            retry_after = self.window_start + (1.0 + progress) * window - now
+        else:
+            progress = 1.0 - (limit - self.current - cost) / self.previous
+            retry_after = self.window_start + progress * window - now
+        return RateLimitResult(False, 0, max(retry_after, 0.0))
+
+    def idle(self, now: float) -> bool:
+        """Plus aucune requête comptée dans la fenêtre glissante"""
+        return now - self.touched >= 2 * self.window
+
+
+class RateLimiter(ABC):
+    """
+    Limiteur à fenêtre glissante, une entrée par clé (client, prompt...)
+
+    Args:
+        max_keys: nombre maximal de clés suivies (les moins récentes sont évincées)
+        sweep_interval: délai minimal entre deux purges des clés inactives
+        clock: horloge (secondes), injectable pour les tests
+    """
+
+    def __init__(
+        self,
+        max_keys: int = ASSISTANTIA_RATE_LIMIT_KEYS,
+        sweep_interval: float = 60.0,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.max_keys = max(1, max_keys)
+        self.sweep_interval = sweep_interval
+        self.clock = clock
+        self._swept_at = clock()
+
+    def hit(self, key: str, limit: int, window: float, cost: int = 1) -> RateLimitResult:
+        """Enregistre une requête pour ``key`` : au plus ``limit`` par ``window`` secondes"""
+        now = self.clock()
+        result = self._hit(key, limit, window, cost, now)
+        if now - self._swept_at >= self.sweep_interval:
+            self._swept_at = now
+            self.sweep(now)
+        return result
+
+    def allow(self, key: str, limit: int, window: float, cost: int = 1) -> bool:
+        return self.hit(key, limit, window, cost).allowed
+
+    @abstractmethod
+    def _hit(self, key: str, limit: int, window: float, cost: int, now: float) -> RateLimitResult:
+        """Compte ``cost`` requêtes pour ``key`` à l'instant ``now``"""
+
+    @abstractmethod
+    def sweep(self, now: float | None = None) -> int:
+        """Supprime les clés inactives ; retourne le nombre de clés supprimées"""
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """Nombre de clés suivies"""
+
+
+class MemoryRateLimiter(RateLimiter):
+    """
+    Compteurs en mémoire du processus
+
+    Les clés sont gardées dans l'ordre de dernier accès : l'éviction LRU et
+    la purge des clés inactives partent du début et s'arrêtent à la première
+    clé encore active.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._counters: OrderedDict[str, WindowCounter] = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def _hit(self, key: str, limit: int, window: float, cost: int, now: float) -> RateLimitResult:
+        with self._lock:
+            counter = self._counters.get(key)
+            if counter is None:
+                counter = WindowCounter(0.0, 0, 0, window, now)
+                self._counters[key] = counter
+                if len(self._counters) > self.max_keys:
+                    self._counters.popitem(last=False)
+                    self.evictions += 1
+            else:
+                self._counters.move_to_end(key)
+            return counter.hit(now, limit, window, cost)
+
+    def sweep(self, now: float | None = None) -> int:
+        now = self.clock() if now is None else now
+        removed = 0
+        with self._lock:
+            while self._counters:
+                key, counter = next(iter(self._counters.items()))
+                if not counter.idle(now):
+                    break
+                del self._counters[key]
+                removed += 1
+        return removed
+
+    def __len__(self) -> int:
+        return len(self._counters)
+
+
+class SQLiteRateLimiter(RateLimiter):
+    """
+    Compteurs partagés dans une base SQLite (mode WAL)
+
+    Chaque requête est comptée dans une transaction ``BEGIN IMMEDIATE`` : les
+    workers de l'API qui partagent le fichier appliquent la même limite. En
+    cas d'erreur SQLite la requête est acceptée (le rate limiting ne doit pas
+    bloquer l'API).
+    """
+
+    def __init__(self, db_path: str | Path, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            self.db_path, timeout=5.0, isolation_level=None, check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS rate_limits (
+                key TEXT PRIMARY KEY,
+                window_start REAL NOT NULL,
+                current INTEGER NOT NULL,
+                previous INTEGER NOT NULL,
+                window REAL NOT NULL,
+                touched REAL NOT NULL
+            )
+        """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS rate_limits_touched ON rate_limits (touched)"
+        )
+
+    def _hit(self, key: str, limit: int, window: float, cost: int, now: float) -> RateLimitResult:
+        with self._lock:
+            try:
+                self._conn.execute("BEGIN IMMEDIATE")
+                try:
+                    row = self._conn.execute(
+                        "SELECT window_start, current, previous, window, touched"
+                        " FROM rate_limits WHERE key = ?",
+                        (key,),
+                    ).fetchone()
+                    counter = WindowCounter(*row) if row else WindowCounter(0.0, 0, 0, window, now)
+                    result = counter.hit(now, limit, window, cost)
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO rate_limits VALUES (?, ?, ?, ?, ?, ?)",
+                        (
+                            key,
+                            counter.window_start,
+                            counter.current,
+                            counter.previous,
+                            counter.window,
+                            counter.touched,
+                        ),
+                    )
+                    self._conn.execute("COMMIT")
+                    return result
+                except BaseException:
+                    self._conn.execute("ROLLBACK")
+                    raise
+            except sqlite3.Error as e:
+                logger.warning(f"⚠️ Rate limiting SQLite indisponible: {e}")
+                return RateLimitResult(True, limit, 0.0)
+
+    def sweep(self, now: float | None = None) -> int:
+        now = self.clock() if now is None else now
+        with self._lock:
+            try:
+                removed = self._conn.execute(
+                    "DELETE FROM rate_limits WHERE touched <= ? - 2 * window", (now,)
+                ).rowcount
+                # Borne du nombre de clés : les moins récemment vues partent
+                removed += self._conn.execute(
+                    "DELETE FROM rate_limits WHERE key IN ("
+                    " SELECT key FROM rate_limits ORDER BY touched DESC LIMIT -1 OFFSET ?)",
+                    (self.max_keys,),
+                ).rowcount
+                return removed
+            except sqlite3.Error as e:
+                logger.warning(f"⚠️ Purge du rate limiting impossible: {e}")
+                return 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM rate_limits").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def create_rate_limiter(**kwargs: Any) -> RateLimiter:
+    """Limiteur partagé si ``ASSISTANTIA_RATE_LIMIT_DB`` est défini, sinon en mémoire"""
+    if ASSISTANTIA_RATE_LIMIT_DB:
+        return SQLiteRateLimiter(ASSISTANTIA_RATE_LIMIT_DB, **kwargs)
+    return MemoryRateLimiter(**kwargs)
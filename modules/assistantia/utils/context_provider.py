@@ -0,0 +1,172 @@
+# modules/assistantia/utils/context_provider.py
+"""
+Contexte Arkalia d'AssistantIA, tenu en mémoire.
+
+Remplace la lecture des fichiers d'état à chaque ``/chat`` et ``/health`` :
+- Snapshot parsé et versionné du contexte (texte + score de qualité)
+- Chaque fichier n'est reparsé que si sa signature ``stat`` change
+- Vérification bornée à une fois par ``check_interval``, dans un thread
+"""
+
+import asyncio
+import json
+import logging
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import toml
+
+from modules.monitoring.heartbeat_registry import StatCachedProbe
+
+logger = logging.getLogger(__name__)
+
+SCORE_MAX = 100.0
+SCORE_KNOWN = 25.0
+SCORE_UNKNOWN = 10.0
+SCORE_ERROR = 5.0
+SCORE_INACTIVE = 2.0
+
+
+@dataclass(frozen=True)
+class ArkaliaContext:
+    """Snapshot immuable du contexte servi aux requêtes"""
+
+    text: str
+    quality: float
+    version: int
+    parts: tuple[str, ...]
+
+
+def _status_loader(label: str, parse: Callable[[Path], dict], key: str) -> Callable:
+    def load(path: Path) -> dict[str, Any]:
+        try:
+            status = parse(path).get(key, "unknown")
+        except (OSError, ValueError, KeyError, toml.TomlDecodeError) as e:
+            logger.warning(f"Erreur lecture {label}: {e}")
+            return {"part": f"{label}: error", "score": SCORE_ERROR}
+        score = SCORE_KNOWN if status != "unknown" else SCORE_UNKNOWN
+        return {"part": f"{label}: {status}", "score": score}
+
+    return load
+
+
+def _load_json(path: Path) -> dict:
+    with open(path) as f:
+        return json.load(f)
+
+
+def _directory_loader(label: str) -> Callable:
+    def load(path: Path) -> dict[str, Any]:
+        if path.is_dir() and any(path.iterdir()):
+            return {"part": f"{label}: active", "score": SCORE_KNOWN}
+        return {"part": f"{label}: inactive", "score": SCORE_INACTIVE}
+
+    return load
+
+
+def default_sources(base_dir: str | Path = ".") -> list[tuple[str, StatCachedProbe]]:
+    """Sources historiques du contexte : ZeroIA, Reflexia, Sandozia, Cognitive"""
+    state = Path(base_dir) / "state"
+    return [
+        (
+            "ZeroIA",
+            StatCachedProbe(
+                state / "zeroia_dashboard.json",
+                _status_loader("ZeroIA", _load_json, "last_decision"),
+            ),
+        ),
+        (
+            "Reflexia",
+            StatCachedProbe(
+                state / "reflexia_state.toml", _status_loader("Reflexia", toml.load, "status")
+            ),
+        ),
+        ("Sandozia", StatCachedProbe(state / "sandozia", _directory_loader("Sandozia"))),
+        (
+            "Cognitive",
+            StatCachedProbe(
+                state / "cognitive_reactor_state.toml",
+                _status_loader("Cognitive", toml.load, "status"),
+            ),
+        ),
+    ]
+
+
+class ArkaliaContextProvider:
+    """
+    Fournisseur du contexte Arkalia servi depuis la mémoire.
+
+    Args:
+        sources: couples (libellé, sonde stat) composant le contexte
+        check_interval: délai minimal entre deux vérifications ``stat``
+    """
+
+    def __init__(
+        self,
+        sources: list[tuple[str, StatCachedProbe]] | None = None,
+        check_interval: float = 1.0,
+    ) -> None:
+        self.sources = sources if sources is not None else default_sources()
+        self.check_interval = check_interval
+        self._snapshot: ArkaliaContext | None = None
+        self._checked_at = float("-inf")
+        self._lock = threading.Lock()
+
+    @property
+    def snapshot(self) -> ArkaliaContext | None:
+        return self._snapshot
+
+    def refresh(self) -> ArkaliaContext:
+        """Vérifie les sources (``stat``) et reparse celles qui ont changé"""
+        with self._lock:
+            parts: list[str] = []
+            quality = 0.0
+            for label, probe in self.sources:
+                try:
+                    result = probe.read()
+                except Exception as e:
+                    logger.error(f"Erreur contexte {label}: {e}")
+                    parts.append(f"{label}: unavailable")
+                    continue
+                if result is None:
+                    result = {"part": f"{label}: inactive", "score": SCORE_INACTIVE}
+                parts.append(result["part"])
+                quality += result["score"]
+
+            quality = min(quality, SCORE_MAX)
+            text = " | ".join(parts) if parts else "Système Arkalia-LUNA"
+            previous = self._snapshot
+            if previous is None or (previous.text, previous.quality) != (text, quality):
+                version = previous.version + 1 if previous is not None else 1
+                self._snapshot = ArkaliaContext(text, quality, version, tuple(parts))
+            self._checked_at = time.monotonic()
+            return self._snapshot
+
+    async def current(self) -> ArkaliaContext:
+        """
+        Contexte courant : depuis la mémoire, ou après une vérification des
+        sources dans un thread si la dernière date de plus de ``check_interval``.
+        """
+        snapshot = self._snapshot
+        if snapshot is not None and time.monotonic() - self._checked_at < self.check_interval:
+            return snapshot
+        # Les requêtes concurrentes servent le snapshot courant pendant la vérification
+        self._checked_at = time.monotonic()
+        return await asyncio.to_thread(self.refresh)
+
+
+_provider: ArkaliaContextProvider | None = None
+_provider_lock = threading.Lock()
+
+
+def get_context_provider() -> ArkaliaContextProvider:
+    """Fournisseur partagé du processus"""
+    global _provider
+    with _provider_lock:
+        if _provider is None:
+            _provider = ArkaliaContextProvider()
+        return _provider
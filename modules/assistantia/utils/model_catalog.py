@@ -0,0 +1,199 @@
+# modules/assistantia/utils/model_catalog.py
+"""
+Catalogue des modèles Ollama et état de santé, tenus en mémoire.
+
+Le chemin de génération ne fait plus d'appel ``/api/tags`` :
+- Le catalogue est rafraîchi en arrière-plan (TTL, ou plus tôt après un échec)
+- Les alias (``mistral`` -> ``mistral:latest``) sont résolus depuis un index
+- La santé d'Ollama suit le résultat des requêtes réelles et des sondes
+"""
+
+import asyncio
+import logging
+import os
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+OLLAMA_CATALOG_TTL = float(os.getenv("OLLAMA_CATALOG_TTL", "30"))
+OLLAMA_CATALOG_RETRY = float(os.getenv("OLLAMA_CATALOG_RETRY", "5"))
+
+
+class ModelCatalog:
+    """
+    Index des modèles disponibles et santé d'Ollama.
+
+    Args:
+        fetch: récupère ``/api/tags`` (None si Ollama est injoignable)
+        ttl: âge maximal du catalogue quand Ollama répond
+        retry_interval: délai entre deux sondes quand Ollama est injoignable
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[], Awaitable[dict[str, Any] | None]],
+        ttl: float = OLLAMA_CATALOG_TTL,
+        retry_interval: float = OLLAMA_CATALOG_RETRY,
+    ) -> None:
+        self._fetch = fetch
+        self.ttl = ttl
+        self.retry_interval = retry_interval
+
+        self._entries: list[dict[str, Any]] = []
+        self._names: frozenset[str] = frozenset()
+        self._by_base: dict[str, str] = {}
+        self._fetched_at: float | None = None
+        self._checked_at: float | None = None
+        self._healthy: bool | None = None
+        self._consecutive_failures = 0
+        self._last_error: str | None = None
+
+        self._refresh_task: asyncio.Task | None = None
+        self._probe_task: asyncio.Task | None = None
+
+    # ------------------------------------------------------------------
+    # Lecture (aucune I/O)
+    # ------------------------------------------------------------------
+
+    @property
+    def models(self) -> list[str]:
+        return sorted(self._names)
+
+    @property
+    def entries(self) -> list[dict[str, Any]]:
+        """Entrées brutes de ``/api/tags``"""
+        return list(self._entries)
+
+    @property
+    def is_available(self) -> bool:
+        """Ollama est présumé joignable tant qu'aucun échec n'a été observé"""
+        return self._healthy is not False
+
+    def resolve(self, model: str) -> str:
+        """
+        Résout ``model`` depuis l'index (ex: mistral -> mistral:latest).
+
+        Sans catalogue chargé, le nom est renvoyé tel quel.
+
+        Raises:
+            ValueError: Si aucun modèle du catalogue ne correspond
+        """
+        if self._fetched_at is None or model in self._names:
+            return model
+        resolved = self._by_base.get(model.split(":")[0])
+        if resolved is None:
+            raise ValueError(
+                f"Modèle '{model}' non disponible. Modèles disponibles: {', '.join(self.models)}"
+            )
+        return resolved
+
+    def status(self) -> dict[str, Any]:
+        now = time.monotonic()
+        return {
+            "healthy": self._healthy,
+            "models": self.models,
+            "catalog_age_seconds": (
+                round(now - self._fetched_at, 3) if self._fetched_at is not None else None
+            ),
+            "consecutive_failures": self._consecutive_failures,
+            "last_error": self._last_error,
+        }
+
+    # ------------------------------------------------------------------
+    # Santé passive
+    # ------------------------------------------------------------------
+
+    def record_success(self) -> None:
+        if self._healthy is False:
+            logger.info("✅ Ollama de nouveau joignable")
+        self._healthy = True
+        self._consecutive_failures = 0
+        self._last_error = None
+
+    def record_failure(self, error: str) -> None:
+        if self._healthy is not False:
+            logger.warning(f"⚠️ Ollama injoignable: {error}")
+        self._healthy = False
+        self._consecutive_failures += 1
+        self._last_error = error
+
+    def invalidate(self) -> None:
+        """Force le rafraîchissement du catalogue au prochain accès"""
+        self._fetched_at = None if self._fetched_at is None else self._fetched_at - self.ttl
+
+    # ------------------------------------------------------------------
+    # Rafraîchissement
+    # ------------------------------------------------------------------
+
+    def _load(self, data: dict[str, Any]) -> None:
+        names = [m.get("name", "") for m in data.get("models", []) if m.get("name")]
+        by_base: dict[str, str] = {}
+        for name in names:
+            # Premier modèle du catalogue par nom de base, comme resolve_model
+            by_base.setdefault(name.split(":")[0], name)
+        self._entries = list(data.get("models", []))
+        self._names = frozenset(names)
+        self._by_base = by_base
+
+    async def _do_refresh(self) -> bool:
+        data = await self._fetch()
+        now = time.monotonic()
+        self._checked_at = now
+        if data is None:
+            self.record_failure("GET /api/tags failed")
+            return False
+        self._load(data)
+        self._fetched_at = now
+        self.record_success()
+        return True
+
+    async def refresh(self) -> bool:
+        """Recharge ``/api/tags`` (un seul appel en vol, partagé par les appelants)"""
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._do_refresh())
+        return await asyncio.shield(self._refresh_task)
+
+    def needs_refresh(self, now: float | None = None) -> bool:
+        now = time.monotonic() if now is None else now
+        if self._checked_at is None:
+            return True
+        if self._healthy is False or self._fetched_at is None:
+            return now - self._checked_at >= self.retry_interval
+        return now - self._fetched_at >= self.ttl
+
+    def ensure_fresh(self) -> None:
+        """Planifie un rafraîchissement en arrière-plan si le catalogue est périmé"""
+        running = self._refresh_task is not None and not self._refresh_task.done()
+        if not running and self.needs_refresh():
+            self._refresh_task = asyncio.create_task(self._do_refresh())
+
+    async def ready(self) -> None:
+        """Charge le catalogue au premier accès, sinon rafraîchit en arrière-plan"""
+        if self._checked_at is None:
+            await self.refresh()
+        else:
+            self.ensure_fresh()
+
+    # ------------------------------------------------------------------
+    # Sonde périodique
+    # ------------------------------------------------------------------
+
+    async def _probe_loop(self) -> None:
+        while True:
+            await self.refresh()
+            await asyncio.sleep(self.retry_interval if self._healthy is False else self.ttl)
+
+    def start(self) -> None:
+        """Démarre la sonde périodique sur la boucle courante (idempotent)"""
+        if self._probe_task is None or self._probe_task.done():
+            self._probe_task = asyncio.create_task(self._probe_loop())
+
+    async def stop(self) -> None:
+        tasks = [t for t in (self._probe_task, self._refresh_task) if t is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._probe_task = None
+        self._refresh_task = None
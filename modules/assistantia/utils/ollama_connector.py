@@ -1,16 +1,56 @@
 # modules/assistantia/utils/ollama_connector.py
 
+import asyncio
 import json
 import os
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from typing import Any, Optional
 
+import httpx
 import requests
 
+from .model_catalog import ModelCatalog
+from .scheduler import GenerationScheduler, SchedulerOverloaded, request_identity
+
 # Configuration Ollama - utiliser l'IP de l'hôte pour Docker
 OLLAMA_HOST = os.getenv("OLLAMA_HOST", "host.docker.internal")  # Accès à l'hôte depuis Docker
 OLLAMA_PORT = os.getenv("OLLAMA_PORT", "11434")
 OLLAMA_BASE_URL = f"http://{OLLAMA_HOST}:{OLLAMA_PORT}"
 
+# Erreurs signifiant qu'Ollama est injoignable (et non une génération lente)
+_UNREACHABLE_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.RemoteProtocolError)
+
+# Générations simultanées autorisées par modèle (les suivantes attendent leur tour)
+OLLAMA_MAX_CONCURRENCY_PER_MODEL = int(os.getenv("OLLAMA_MAX_CONCURRENCY_PER_MODEL", "2"))
+OLLAMA_TIMEOUT = float(os.getenv("OLLAMA_TIMEOUT", "30"))
+
+
+def resolve_model(model: str, catalog: dict[str, Any] | None) -> str:
+    """
+    Résout ``model`` dans le catalogue ``/api/tags`` (ex: mistral -> mistral:latest).
+
+    Sans catalogue (Ollama injoignable), le nom est renvoyé tel quel.
+
+    Raises:
+        ValueError: Si aucun modèle du catalogue ne correspond
+    """
+    if not catalog:
+        return model
+    model_names = [m.get("name", "") for m in catalog.get("models", [])]
+    # Vérifier si le modèle exact existe ou si une version avec tag existe
+    if model in model_names:
+        return model
+    # Essayer de trouver une version avec tag (ex: mistral -> mistral:latest)
+    base_model = model.split(":")[0]
+    matching_models = [m for m in model_names if m.startswith(f"{base_model}:")]
+    if not matching_models:
+        raise ValueError(
+            f"Modèle '{model}' non disponible. Modèles disponibles: {', '.join(model_names)}"
+        )
+    # Utiliser le premier modèle trouvé avec le bon préfixe
+    return matching_models[0]
+
 
 def query_ollama(prompt: str, model: str = "llama2", temperature: float = 0.7) -> str:
     """Interroge l'API Ollama avec un prompt donné."""
@@ -20,20 +60,7 @@ def query_ollama(prompt: str, model: str = "llama2", temperature: float = 0.7) -
 
     try:
         # Vérifier si le modèle est disponible
-        available_models = get_available_models()
-        if available_models:
-            model_names = [m.get("name", "") for m in available_models.get("models", [])]
-            # Vérifier si le modèle exact existe ou si une version avec tag existe
-            if model not in model_names:
-                # Essayer de trouver une version avec tag (ex: mistral -> mistral:latest)
-                base_model = model.split(":")[0]
-                matching_models = [m for m in model_names if m.startswith(f"{base_model}:")]
-                if not matching_models:
-                    raise ValueError(
-                        f"Modèle '{model}' non disponible. Modèles disponibles: {', '.join(model_names)}"
-                    )
-                # Utiliser le premier modèle trouvé avec le bon préfixe
-                model = matching_models[0]
+        model = resolve_model(model, get_available_models())
 
         url = f"{OLLAMA_BASE_URL}/api/generate"
         payload = {"model": model, "prompt": prompt, "temperature": temperature, "stream": False}
@@ -77,3 +104,224 @@ def check_ollama_health() -> bool:
         return response.status_code == 200
     except Exception:
         return False
+
+
+class AsyncOllamaClient:
+    """
+    Client Ollama asynchrone sur un pool de connexions keep-alive.
+
+    Les générations passent par le ``scheduler`` : au plus
+    ``max_concurrency_per_model`` en vol par modèle, file d'attente par
+    priorité et par client, fusion des prompts identiques. Le résultat de
+    chaque génération alimente la santé du ``catalog``. Le pool (et la file)
+    sont liés à la boucle qui a créé le client.
+    """
+
+    def __init__(
+        self,
+        base_url: str | None = None,
+        max_concurrency_per_model: int = OLLAMA_MAX_CONCURRENCY_PER_MODEL,
+        timeout: float = OLLAMA_TIMEOUT,
+        max_connections: int = 20,
+    ) -> None:
+        self.base_url = base_url or OLLAMA_BASE_URL
+        self.max_concurrency_per_model = max(1, max_concurrency_per_model)
+        self._http = httpx.AsyncClient(
+            base_url=self.base_url,
+            timeout=httpx.Timeout(timeout, connect=5.0),
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+                keepalive_expiry=60.0,
+            ),
+        )
+        self.scheduler = GenerationScheduler(self.max_concurrency_per_model)
+        self.catalog = ModelCatalog(self.list_models)
+
+    @property
+    def is_closed(self) -> bool:
+        return self._http.is_closed
+
+    @asynccontextmanager
+    async def _observe(self) -> AsyncIterator[None]:
+        """Reporte l'issue d'une requête de génération sur la santé du catalogue"""
+        try:
+            yield
+        except _UNREACHABLE_ERRORS as e:
+            self.catalog.record_failure(f"{type(e).__name__}: {e}")
+            raise
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code == 404:
+                # Modèle retiré côté Ollama : le catalogue est périmé
+                self.catalog.invalidate()
+            raise
+
+    def in_flight(self, model: str) -> int:
+        """Nombre de générations en cours pour ``model``"""
+        return self.scheduler.in_flight(model)
+
+    @staticmethod
+    def _payload(prompt: str, model: str, temperature: float, stream: bool) -> dict[str, Any]:
+        return {
+            "model": model,
+            "prompt": prompt,
+            "options": {"temperature": temperature},
+            "stream": stream,
+        }
+
+    async def list_models(self) -> dict[str, Any] | None:
+        """Catalogue ``/api/tags`` (None si Ollama est injoignable)"""
+        try:
+            response = await self._http.get("/api/tags", timeout=10.0)
+            response.raise_for_status()
+            return response.json()
+        except (httpx.HTTPError, json.JSONDecodeError):
+            return None
+
+    async def health(self) -> bool:
+        try:
+            response = await self._http.get("/api/tags", timeout=5.0)
+            return response.status_code == 200
+        except httpx.HTTPError:
+            return False
+
+    async def generate(
+        self,
+        prompt: str,
+        model: str,
+        temperature: float = 0.7,
+        client_id: str | None = None,
+        priority: int | None = None,
+    ) -> str:
+        """
+        Génération complète (``stream: false``).
+
+        ``client_id`` et ``priority`` valent par défaut l'identité de la
+        requête API en cours (``request_identity``).
+
+        Raises:
+            SchedulerOverloaded: Si la file du modèle est saturée
+        """
+
+        async def _generate() -> str:
+            async with self._observe():
+                response = await self._http.post(
+                    "/api/generate", json=self._payload(prompt, model, temperature, stream=False)
+                )
+                response.raise_for_status()
+            self.catalog.record_success()
+            return response.json().get("response", "Aucune réponse reçue")
+
+        default_client, default_priority = request_identity.get()
+        return await self.scheduler.run(
+            model,
+            _generate,
+            client_id=client_id or default_client,
+            priority=default_priority if priority is None else priority,
+            coalesce_key=(model, round(temperature, 2), prompt),
+        )
+
+    async def stream(
+        self,
+        prompt: str,
+        model: str,
+        temperature: float = 0.7,
+        client_id: str | None = None,
+        priority: int | None = None,
+    ) -> AsyncIterator[str]:
+        """
+        Itère sur les fragments de réponse au fil de la génération (``stream: true``).
+
+        Fermer l'itérateur avant la fin (``aclose()``, annulation) ferme la
+        connexion amont, ce qui interrompt la génération côté Ollama.
+        """
+        default_client, default_priority = request_identity.get()
+        client_id = client_id or default_client
+        priority = default_priority if priority is None else priority
+        async with self.scheduler.slot(model, client_id, priority), self._observe():
+            request = self._http.build_request(
+                "POST", "/api/generate", json=self._payload(prompt, model, temperature, True)
+            )
+            response = await self._http.send(request, stream=True)
+            try:
+                response.raise_for_status()
+                self.catalog.record_success()
+                async for line in response.aiter_lines():
+                    if not line.strip():
+                        continue
+                    chunk = json.loads(line)
+                    if "error" in chunk:
+                        raise httpx.HTTPError(f"Ollama: {chunk['error']}")
+                    if chunk.get("response"):
+                        yield chunk["response"]
+                    if chunk.get("done"):
+                        return
+            finally:
+                await response.aclose()
+
+    async def aclose(self) -> None:
+        await self.catalog.stop()
+        await self._http.aclose()
+
+
+_client: AsyncOllamaClient | None = None
+_client_loop: asyncio.AbstractEventLoop | None = None
+
+
+def get_ollama_client() -> AsyncOllamaClient:
+    """Client partagé de la boucle d'événements courante (créé au premier accès)"""
+    global _client, _client_loop
+    loop = asyncio.get_running_loop()
+    if _client is None or _client_loop is not loop or _client.is_closed:
+        # Un pool httpx ne survit pas à sa boucle : nouveau client par boucle
+        _client = AsyncOllamaClient()
+        _client_loop = loop
+    return _client
+
+
+def get_model_catalog() -> ModelCatalog:
+    """Catalogue des modèles du client partagé"""
+    return get_ollama_client().catalog
+
+
+async def close_ollama_client() -> None:
+    """Ferme le pool du client partagé (arrêt de l'application)"""
+    global _client, _client_loop
+    if _client is not None and _client_loop is asyncio.get_running_loop():
+        await _client.aclose()
+    _client = None
+    _client_loop = None
+
+
+async def aquery_ollama(
+    prompt: str,
+    model: str = "llama2",
+    temperature: float = 0.7,
+    client_id: str | None = None,
+    priority: int | None = None,
+) -> str:
+    """
+    Équivalent asynchrone de :func:`query_ollama` sur le client partagé.
+
+    Raises:
+        SchedulerOverloaded: Si la génération est délestée
+    """
+    if not prompt.strip():
+        return "[⚠️ Réponse IA vide]"
+
+    client = get_ollama_client()
+    try:
+        await client.catalog.ready()
+        model = client.catalog.resolve(model)
+        return await client.generate(prompt, model, temperature, client_id, priority)
+    except SchedulerOverloaded:
+        raise
+    except json.JSONDecodeError:
+        return "Erreur de décodage JSON"
+    except ValueError:
+        # Re-raise ValueError pour les modèles invalides
+        raise
+    except httpx.HTTPError as e:
+        return f"Erreur IA: {str(e)}"
+    except Exception as e:
+        return f"Erreur inattendue: {str(e)}"
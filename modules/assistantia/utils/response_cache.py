@@ -0,0 +1,335 @@
+# modules/assistantia/utils/response_cache.py
+"""
+Cache des réponses AssistantIA.
+
+Une même question posée en boucle (tableaux de bord, sondes) ne relance pas
+une génération complète :
+- Clé exacte : (modèle, température, prompt normalisé, empreinte du contexte Arkalia)
+- Bornes mémoire LRU et expiration TTL
+- Persistance SQLite optionnelle (survit aux redémarrages)
+- Niveau de similarité optionnel : signatures MinHash de n-grammes de
+  caractères, candidats trouvés par bandes LSH (pas de parcours linéaire)
+"""
+
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+ASSISTANTIA_CACHE_SIZE = int(os.getenv("ASSISTANTIA_CACHE_SIZE", "512"))
+ASSISTANTIA_CACHE_TTL = float(os.getenv("ASSISTANTIA_CACHE_TTL", "300"))
+# Chemin SQLite (vide : cache mémoire seulement)
+ASSISTANTIA_CACHE_DB = os.getenv("ASSISTANTIA_CACHE_DB", "")
+# Seuil de similarité Jaccard estimée (vide : niveau désactivé)
+ASSISTANTIA_CACHE_SIMILARITY = os.getenv("ASSISTANTIA_CACHE_SIMILARITY", "")
+
+_WHITESPACE = re.compile(r"\s+")
+_MERSENNE_PRIME = (1 << 31) - 1
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Casse et espaces normalisés (``"  Quel  ÉTAT ?"`` == ``"quel état ?"``)"""
+    return _WHITESPACE.sub(" ", prompt).strip().casefold()
+
+
+def context_digest(context: str | None) -> str:
+    return hashlib.sha256((context or "").encode("utf-8")).hexdigest()[:16]
+
+
+class MinHasher:
+    """
+    Signatures MinHash sur les n-grammes de caractères.
+
+    La proportion de composantes égales entre deux signatures estime la
+    similarité de Jaccard des ensembles de n-grammes.
+    """
+
+    def __init__(self, num_perm: int = 64, ngram: int = 3, bands: int = 16, seed: int = 1) -> None:
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.num_perm = num_perm
+        self.ngram = ngram
+        self.bands = bands
+        self.rows = num_perm // bands
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, _MERSENNE_PRIME, size=num_perm, dtype=np.int64)
+        self._b = rng.integers(0, _MERSENNE_PRIME, size=num_perm, dtype=np.int64)
+
+    def signature(self, text: str) -> np.ndarray:
+        if len(text) < self.ngram:
+            grams = {text}
+        else:
+            grams = {text[i : i + self.ngram] for i in range(len(text) - self.ngram + 1)}
+        hashes = np.fromiter(
+            (zlib.crc32(g.encode("utf-8")) for g in grams), dtype=np.int64, count=len(grams)
+        )
+        # (a·h + b) mod p pour chaque permutation, minimum sur les n-grammes
+        return ((np.outer(hashes, self._a) + self._b) % _MERSENNE_PRIME).min(axis=0)
+
+    def band_keys(self, signature: np.ndarray) -> list[bytes]:
+        return [
+            band.tobytes() + bytes([i])
+            for i, band in enumerate(signature.reshape(self.bands, self.rows))
+        ]
+
+    @staticmethod
+    def similarity(left: np.ndarray, right: np.ndarray) -> float:
+        return float(np.count_nonzero(left == right)) / len(left)
+
+
+@dataclass
+class CacheEntry:
+    response: str
+    created_at: float
+    group: str
+    signature: np.ndarray | None = field(default=None, repr=False)
+
+
+@dataclass(frozen=True)
+class CacheHit:
+    response: str
+    kind: str  # "exact" ou "similar"
+    similarity: float = 1.0
+
+
+class ResponseCache:
+    """
+    Cache LRU + TTL des réponses, indexé par clé exacte et (optionnellement)
+    par bandes LSH des signatures MinHash.
+
+    Args:
+        max_entries: nombre maximal de réponses gardées en mémoire
+        ttl: durée de validité d'une réponse (secondes)
+        persist_path: base SQLite de persistance (None : mémoire seulement)
+        similarity_threshold: active le niveau de similarité à partir de ce
+            seuil de Jaccard estimée (None : correspondance exacte seulement)
+    """
+
+    def __init__(
+        self,
+        max_entries: int = ASSISTANTIA_CACHE_SIZE,
+        ttl: float = ASSISTANTIA_CACHE_TTL,
+        persist_path: str | Path | None = None,
+        similarity_threshold: float | None = None,
+        hasher: MinHasher | None = None,
+    ) -> None:
+        self.max_entries = max(1, max_entries)
+        self.ttl = ttl
+        self.similarity_threshold = similarity_threshold
+        self.hasher = hasher or (MinHasher() if similarity_threshold is not None else None)
+
+        self._entries: OrderedDict[str, CacheEntry] = OrderedDict()
+        self._bands: dict[tuple[str, bytes], set[str]] = {}
+        self._lock = threading.Lock()
+        self.stats = {"hits_exact": 0, "hits_similar": 0, "misses": 0, "evictions": 0}
+
+        self._db: sqlite3.Connection | None = None
+        if persist_path is not None:
+            self._open_db(Path(persist_path))
+
+    # ------------------------------------------------------------------
+    # Clés
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _group(model: str, temperature: float, context: str | None) -> str:
+        return f"{model}|{temperature:.2f}|{context_digest(context)}"
+
+    @staticmethod
+    def _key(group: str, normalized: str) -> str:
+        return hashlib.sha256(f"{group}\0{normalized}".encode()).hexdigest()
+
+    # ------------------------------------------------------------------
+    # Lecture / écriture
+    # ------------------------------------------------------------------
+
+    def get(
+        self, model: str, temperature: float, prompt: str, context: str | None = None
+    ) -> CacheHit | None:
+        group = self._group(model, temperature, context)
+        normalized = normalize_prompt(prompt)
+        key = self._key(group, normalized)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now - entry.created_at < self.ttl:
+                self._entries.move_to_end(key)
+                self.stats["hits_exact"] += 1
+                return CacheHit(entry.response, "exact")
+            if entry is not None:
+                self._forget(key)
+
+            hit = self._similar(group, normalized, now)
+            if hit is None:
+                self.stats["misses"] += 1
+            else:
+                self.stats["hits_similar"] += 1
+            return hit
+
+    def _similar(self, group: str, normalized: str, now: float) -> CacheHit | None:
+        if self.hasher is None or self.similarity_threshold is None:
+            return None
+        signature = self.hasher.signature(normalized)
+        candidates: set[str] = set()
+        for band in self.hasher.band_keys(signature):
+            candidates |= self._bands.get((group, band), set())
+
+        best_key, best_score = None, 0.0
+        for candidate in candidates:
+            entry = self._entries[candidate]
+            if now - entry.created_at >= self.ttl or entry.signature is None:
+                continue
+            score = self.hasher.similarity(signature, entry.signature)
+            if score > best_score:
+                best_key, best_score = candidate, score
+        if best_key is None or best_score < self.similarity_threshold:
+            return None
+        self._entries.move_to_end(best_key)
+        return CacheHit(self._entries[best_key].response, "similar", best_score)
+
+    def put(
+        self,
+        model: str,
+        temperature: float,
+        prompt: str,
+        response: str,
+        context: str | None = None,
+    ) -> None:
+        group = self._group(model, temperature, context)
+        normalized = normalize_prompt(prompt)
+        key = self._key(group, normalized)
+        signature = self.hasher.signature(normalized) if self.hasher is not None else None
+        entry = CacheEntry(response, time.time(), group, signature)
+        with self._lock:
+            self._insert(key, entry)
+            self._persist(key, entry)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bands.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM responses")
+                self._db.commit()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def info(self) -> dict[str, Any]:
+        return {
+            **self.stats,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl": self.ttl,
+            "similarity_threshold": self.similarity_threshold,
+        }
+
+    # ------------------------------------------------------------------
+    # Interne (sous verrou)
+    # ------------------------------------------------------------------
+
+    def _insert(self, key: str, entry: CacheEntry) -> None:
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = entry
+        if entry.signature is not None and self.hasher is not None:
+            for band in self.hasher.band_keys(entry.signature):
+                self._bands.setdefault((entry.group, band), set()).add(key)
+        while len(self._entries) > self.max_entries:
+            self._forget(next(iter(self._entries)))
+            self.stats["evictions"] += 1
+
+    def _forget(self, key: str) -> None:
+        """Retire ``key`` de la mémoire et de la base"""
+        self._remove(key)
+        if self._db is not None:
+            self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self._db.commit()
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key)
+        if entry.signature is not None and self.hasher is not None:
+            for band in self.hasher.band_keys(entry.signature):
+                bucket = self._bands.get((entry.group, band))
+                if bucket is not None:
+                    bucket.discard(key)
+                    if not bucket:
+                        del self._bands[(entry.group, band)]
+
+    # ------------------------------------------------------------------
+    # Persistance SQLite
+    # ------------------------------------------------------------------
+
+    def _open_db(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(path), check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY, grp TEXT NOT NULL, response TEXT NOT NULL,"
+            " created_at REAL NOT NULL, signature BLOB)"
+        )
+        horizon = time.time() - self.ttl
+        self._db.execute("DELETE FROM responses WHERE created_at < ?", (horizon,))
+        self._db.commit()
+        rows = self._db.execute(
+            "SELECT key, grp, response, created_at, signature FROM responses"
+            " ORDER BY created_at DESC LIMIT ?",
+            (self.max_entries,),
+        ).fetchall()
+        # Du plus ancien au plus récent : l'ordre LRU est restauré
+        for key, group, response, created_at, blob in reversed(rows):
+            signature = None
+            if blob is not None and self.hasher is not None:
+                signature = np.frombuffer(blob, dtype=np.int64)
+                if len(signature) != self.hasher.num_perm:
+                    signature = None
+            self._insert(key, CacheEntry(response, created_at, group, signature))
+
+    def _persist(self, key: str, entry: CacheEntry) -> None:
+        if self._db is None:
+            return
+        blob = entry.signature.tobytes() if entry.signature is not None else None
+        try:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)",
+                (key, entry.group, entry.response, entry.created_at, blob),
+            )
+            self._db.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"⚠️ Persistance du cache AssistantIA impossible: {e}")
+
+    def close(self) -> None:
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+
+_cache: ResponseCache | None = None
+_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> ResponseCache:
+    """Cache partagé du processus, configuré par les variables ``ASSISTANTIA_CACHE_*``"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ResponseCache(
+                persist_path=ASSISTANTIA_CACHE_DB or None,
+                similarity_threshold=(
+                    float(ASSISTANTIA_CACHE_SIMILARITY) if ASSISTANTIA_CACHE_SIMILARITY else None
+                ),
+            )
+        return _cache
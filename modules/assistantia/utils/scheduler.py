@@ -0,0 +1,314 @@
+# modules/assistantia/utils/scheduler.py
+"""
+Ordonnanceur des générations Ollama d'AssistantIA.
+
+Contrôle d'admission devant le serveur de modèles :
+- File d'attente bornée, par priorité puis tour de rôle entre clients
+- Limite de générations simultanées par modèle
+- Délestage (503 + Retry-After) si l'attente estimée dépasse le budget
+- Fusion des prompts identiques déjà en cours de génération
+- Métriques Prometheus de temps d'attente et de profondeur de file
+"""
+
+import asyncio
+import logging
+import math
+import os
+import time
+from collections import OrderedDict, deque
+from collections.abc import AsyncIterator, Awaitable, Callable, Hashable
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, TypeVar
+
+from prometheus_client import Counter, Gauge, Histogram
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 1
+PRIORITY_LOW = 2
+PRIORITIES = {"high": PRIORITY_HIGH, "normal": PRIORITY_NORMAL, "low": PRIORITY_LOW}
+
+# Identité (client, priorité) de la requête API en cours, lue par défaut par le client Ollama
+request_identity: ContextVar[tuple[str, int]] = ContextVar(
+    "assistantia_request_identity", default=("anonymous", PRIORITY_NORMAL)
+)
+
+ASSISTANTIA_MAX_QUEUE = int(os.getenv("ASSISTANTIA_MAX_QUEUE", "64"))
+# Attente maximale acceptable avant délestage (secondes)
+ASSISTANTIA_QUEUE_BUDGET = float(os.getenv("ASSISTANTIA_QUEUE_BUDGET", "20"))
+
+assistantia_queue_wait = Histogram(
+    "assistantia_queue_wait_seconds",
+    "Temps d'attente des générations avant envoi à Ollama",
+    ["model"],
+    buckets=[0.01, 0.05, 0.1, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0],
+)
+assistantia_queue_depth = Gauge(
+    "assistantia_queue_depth", "Générations en attente par modèle", ["model"]
+)
+assistantia_generations_shed = Counter(
+    "assistantia_generations_shed_total", "Générations refusées par délestage", ["model"]
+)
+assistantia_generations_coalesced = Counter(
+    "assistantia_generations_coalesced_total",
+    "Requêtes servies par une génération identique déjà en cours",
+    ["model"],
+)
+
+
+class SchedulerOverloaded(Exception):
+    """File pleine ou attente estimée hors budget"""
+
+    def __init__(self, model: str, retry_after: int, reason: str) -> None:
+        super().__init__(f"Générations {model} saturées ({reason})")
+        self.model = model
+        self.retry_after = retry_after
+        self.reason = reason
+
+
+@dataclass
+class _Waiter:
+    future: asyncio.Future
+    enqueued_at: float
+
+
+@dataclass
+class _ModelQueue:
+    running: int = 0
+    queued: int = 0
+    # priorité -> client -> attentes (l'ordre des clients donne le tour de rôle)
+    levels: dict[int, OrderedDict[str, deque[_Waiter]]] = field(default_factory=dict)
+
+    def push(self, priority: int, client_id: str, waiter: _Waiter) -> None:
+        clients = self.levels.setdefault(priority, OrderedDict())
+        clients.setdefault(client_id, deque()).append(waiter)
+        self.queued += 1
+
+    def pop(self) -> _Waiter | None:
+        for priority in sorted(self.levels):
+            clients = self.levels[priority]
+            if not clients:
+                continue
+            client_id, waiters = next(iter(clients.items()))
+            waiter = waiters.popleft()
+            # Le client passe en fin de tour s'il a encore des requêtes
+            del clients[client_id]
+            if waiters:
+                clients[client_id] = waiters
+            self.queued -= 1
+            return waiter
+        return None
+
+    def discard(self, waiter: _Waiter) -> None:
+        for clients in self.levels.values():
+            for client_id, waiters in clients.items():
+                if waiter in waiters:
+                    waiters.remove(waiter)
+                    if not waiters:
+                        del clients[client_id]
+                    self.queued -= 1
+                    return
+
+
+@dataclass
+class _InFlight:
+    task: asyncio.Task
+    waiters: int = 0
+
+
+class GenerationScheduler:
+    """
+    Admission des générations par modèle.
+
+    Args:
+        max_concurrency_per_model: générations simultanées par modèle
+        max_queue: nombre total de générations en attente (tous modèles)
+        latency_budget: attente estimée au-delà de laquelle on déleste
+    """
+
+    def __init__(
+        self,
+        max_concurrency_per_model: int = 2,
+        max_queue: int = ASSISTANTIA_MAX_QUEUE,
+        latency_budget: float = ASSISTANTIA_QUEUE_BUDGET,
+    ) -> None:
+        self.max_concurrency_per_model = max(1, max_concurrency_per_model)
+        self.max_queue = max_queue
+        self.latency_budget = latency_budget
+        self._models: dict[str, _ModelQueue] = {}
+        self._inflight: dict[Hashable, _InFlight] = {}
+        # Durée moyenne (EWMA) d'une génération, par modèle
+        self._service_time: dict[str, float] = {}
+        self.shed = 0
+        self.coalesced = 0
+
+    # ------------------------------------------------------------------
+    # Lecture
+    # ------------------------------------------------------------------
+
+    def in_flight(self, model: str) -> int:
+        queue = self._models.get(model)
+        return 0 if queue is None else queue.running
+
+    def queued(self, model: str | None = None) -> int:
+        if model is not None:
+            queue = self._models.get(model)
+            return 0 if queue is None else queue.queued
+        return sum(q.queued for q in self._models.values())
+
+    def estimated_wait(self, model: str) -> float | None:
+        """Attente estimée d'une nouvelle requête (None tant qu'aucune durée n'est connue)"""
+        service_time = self._service_time.get(model)
+        if service_time is None:
+            return None
+        queue = self._models.get(model) or _ModelQueue()
+        rounds = (queue.queued + 1) / self.max_concurrency_per_model
+        return rounds * service_time
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "models": {
+                model: {
+                    "running": queue.running,
+                    "queued": queue.queued,
+                    "service_time": self._service_time.get(model),
+                }
+                for model, queue in self._models.items()
+            },
+            "shed": self.shed,
+            "coalesced": self.coalesced,
+        }
+
+    # ------------------------------------------------------------------
+    # Admission
+    # ------------------------------------------------------------------
+
+    def _reject(self, model: str, retry_after: float, reason: str) -> SchedulerOverloaded:
+        self.shed += 1
+        assistantia_generations_shed.labels(model=model).inc()
+        logger.warning(f"⚠️ Délestage AssistantIA {model}: {reason}")
+        return SchedulerOverloaded(model, max(1, math.ceil(retry_after)), reason)
+
+    async def acquire(
+        self, model: str, client_id: str = "anonymous", priority: int = PRIORITY_NORMAL
+    ) -> None:
+        """Attend un créneau de génération pour ``model``"""
+        queue = self._models.setdefault(model, _ModelQueue())
+        if queue.running < self.max_concurrency_per_model and queue.queued == 0:
+            queue.running += 1
+            assistantia_queue_wait.labels(model=model).observe(0.0)
+            return
+
+        estimate = self.estimated_wait(model)
+        if self.queued() >= self.max_queue:
+            raise self._reject(model, estimate or self.latency_budget, "file pleine")
+        if estimate is not None and estimate > self.latency_budget:
+            raise self._reject(model, estimate, f"attente estimée {estimate:.1f}s")
+
+        waiter = _Waiter(asyncio.get_running_loop().create_future(), time.monotonic())
+        queue.push(priority, client_id, waiter)
+        assistantia_queue_depth.labels(model=model).set(queue.queued)
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled():
+                # Créneau accordé au moment de l'annulation : on le rend
+                self.release(model)
+            else:
+                queue.discard(waiter)
+                assistantia_queue_depth.labels(model=model).set(queue.queued)
+            raise
+
+    def release(self, model: str, service_time: float | None = None) -> None:
+        queue = self._models[model]
+        queue.running -= 1
+        if service_time is not None:
+            previous = self._service_time.get(model)
+            self._service_time[model] = (
+                service_time if previous is None else 0.8 * previous + 0.2 * service_time
+            )
+        self._dispatch(model, queue)
+
+    def _dispatch(self, model: str, queue: _ModelQueue) -> None:
+        while queue.running < self.max_concurrency_per_model:
+            waiter = queue.pop()
+            if waiter is None:
+                break
+            if waiter.future.done():
+                continue
+            queue.running += 1
+            waiter.future.set_result(None)
+            assistantia_queue_wait.labels(model=model).observe(
+                time.monotonic() - waiter.enqueued_at
+            )
+        assistantia_queue_depth.labels(model=model).set(queue.queued)
+
+    @asynccontextmanager
+    async def slot(
+        self, model: str, client_id: str = "anonymous", priority: int = PRIORITY_NORMAL
+    ) -> AsyncIterator[None]:
+        """Créneau de génération tenu pendant le bloc ``async with``"""
+        await self.acquire(model, client_id, priority)
+        started = time.monotonic()
+        completed = False
+        try:
+            yield
+            completed = True
+        finally:
+            # Seules les générations menées à terme alimentent l'estimation
+            self.release(model, time.monotonic() - started if completed else None)
+
+    # ------------------------------------------------------------------
+    # Exécution avec fusion
+    # ------------------------------------------------------------------
+
+    async def _run_in_slot(
+        self, model: str, client_id: str, priority: int, fn: Callable[[], Awaitable[T]]
+    ) -> T:
+        async with self.slot(model, client_id, priority):
+            return await fn()
+
+    async def run(
+        self,
+        model: str,
+        fn: Callable[[], Awaitable[T]],
+        client_id: str = "anonymous",
+        priority: int = PRIORITY_NORMAL,
+        coalesce_key: Hashable | None = None,
+    ) -> T:
+        """
+        Exécute ``fn`` dans un créneau de ``model``.
+
+        Les appels de même ``coalesce_key`` arrivant pendant une génération
+        en cours partagent son résultat. La génération n'est annulée que si
+        tous ses demandeurs sont partis.
+        """
+        entry = self._inflight.get(coalesce_key) if coalesce_key is not None else None
+        if entry is None:
+            task = asyncio.ensure_future(self._run_in_slot(model, client_id, priority, fn))
+            entry = _InFlight(task)
+            if coalesce_key is not None:
+                self._inflight[coalesce_key] = entry
+                task.add_done_callback(lambda _, e=entry: self._forget(coalesce_key, e))
+        else:
+            self.coalesced += 1
+            assistantia_generations_coalesced.labels(model=model).inc()
+
+        entry.waiters += 1
+        try:
+            return await asyncio.shield(entry.task)
+        except asyncio.CancelledError:
+            if entry.waiters == 1 and not entry.task.done():
+                entry.task.cancel()
+            raise
+        finally:
+            entry.waiters -= 1
+
+    def _forget(self, key: Hashable, entry: _InFlight) -> None:
+        if self._inflight.get(key) is entry:
+            del self._inflight[key]
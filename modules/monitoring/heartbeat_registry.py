@@ -0,0 +1,171 @@
+# 💓 modules/monitoring/heartbeat_registry.py
+"""Registre de heartbeats des modules Arkalia
+
+Les modules publient leur état dans une petite table SQLite ; Reflexia lit
+la santé de tous les modules en une requête au lieu de scanner les fichiers
+d'état à chaque cycle.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections.abc import Callable
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REGISTRY_PATH = Path("state/module_health.db")
+
+
+class HeartbeatRegistry:
+    """
+    Table SQLite ``heartbeats`` (une ligne par module)
+
+    Chaque module publie son état via :meth:`heartbeat` (upsert d'une ligne) ;
+    les lecteurs récupèrent toutes les lignes en une requête. Le mode WAL
+    permet des lectures concurrentes pendant les écritures d'autres processus.
+    """
+
+    def __init__(self, db_path: str | Path = DEFAULT_REGISTRY_PATH, stale_after: float = 300.0):
+        self.db_path = Path(db_path)
+        self.stale_after = stale_after
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._init_db()
+
+    def _init_db(self) -> None:
+        with self._get_connection() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS heartbeats (
+                    module TEXT PRIMARY KEY,
+                    status TEXT NOT NULL,
+                    updated_at REAL NOT NULL,
+                    details TEXT
+                )
+            """)
+            conn.commit()
+
+    @contextmanager
+    def _get_connection(self):
+        conn = sqlite3.connect(self.db_path, timeout=1.0)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def heartbeat(self, module: str, status: str = "active", details: dict | None = None) -> bool:
+        """Publie l'état courant d'un module"""
+        try:
+            with self._get_connection() as conn:
+                conn.execute(
+                    """
+                    INSERT INTO heartbeats (module, status, updated_at, details)
+                    VALUES (?, ?, ?, ?)
+                    ON CONFLICT(module) DO UPDATE SET
+                        status = excluded.status,
+                        updated_at = excluded.updated_at,
+                        details = excluded.details
+                """,
+                    (module, status, time.time(), json.dumps(details or {}, default=str)),
+                )
+                conn.commit()
+                return True
+        except sqlite3.Error as e:
+            logger.error(f"Erreur heartbeat {module}: {e}")
+            return False
+
+    def read_all(self, now: float | None = None) -> dict[str, dict[str, Any]]:
+        """Dernier heartbeat de chaque module, avec âge et indicateur ``stale``"""
+        now = time.time() if now is None else now
+        try:
+            with self._get_connection() as conn:
+                rows = conn.execute(
+                    "SELECT module, status, updated_at, details FROM heartbeats"
+                ).fetchall()
+        except sqlite3.Error as e:
+            logger.error(f"Erreur lecture heartbeats: {e}")
+            return {}
+
+        return {
+            module: {
+                "status": status,
+                "updated_at": updated_at,
+                "age_seconds": round(now - updated_at, 3),
+                "stale": now - updated_at > self.stale_after,
+                "details": json.loads(details) if details else {},
+            }
+            for module, status, updated_at, details in rows
+        }
+
+
+class StatCachedProbe:
+    """
+    Sonde de repli basée sur ``stat`` pour les modules sans heartbeat
+
+    ``loader`` n'est rappelé que lorsque la signature (mtime, taille, inode)
+    du chemin change ; sinon le dernier résultat est resservi. Pour un
+    répertoire, la mtime change à chaque création/suppression d'entrée.
+    """
+
+    def __init__(self, path: str | Path, loader: Callable[[Path], dict[str, Any]]):
+        self.path = Path(path)
+        self.loader = loader
+        self._signature: tuple[int, int, int] | None = None
+        self._result: dict[str, Any] | None = None
+        self._lock = threading.Lock()
+        self.loads = 0
+
+    def read(self) -> dict[str, Any] | None:
+        """Résultat du loader, ou None si le chemin n'existe pas"""
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+
+        signature = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+        with self._lock:
+            if signature != self._signature or self._result is None:
+                self._result = self.loader(self.path)
+                self._signature = signature
+                self.loads += 1
+            return self._result
+
+
+_registry: HeartbeatRegistry | None = None
+# Registres ouverts sur un autre fichier que DEFAULT_REGISTRY_PATH
+_registries: dict[Path, HeartbeatRegistry] = {}
+_registry_lock = threading.Lock()
+
+
+def get_heartbeat_registry(db_path: str | Path | None = None) -> HeartbeatRegistry:
+    """Registre partagé du processus (un par fichier lorsque ``db_path`` est fourni)"""
+    global _registry
+    with _registry_lock:
+        if db_path is None:
+            if _registry is None:
+                _registry = HeartbeatRegistry()
+            return _registry
+        key = Path(db_path).resolve()
+        registry = _registries.get(key)
+        if registry is None:
+            registry = _registries[key] = HeartbeatRegistry(key)
+        return registry
+
+
+def publish_heartbeat(
+    module: str,
+    status: str = "active",
+    details: dict | None = None,
+    db_path: str | Path | None = None,
+) -> bool:
+    """Publication tolérante aux pannes : la santé ne doit jamais casser un module"""
+    try:
+        return get_heartbeat_registry(db_path).heartbeat(module, status, details)
+    except Exception as e:
+        logger.warning(f"⚠️ Heartbeat {module} non publié: {e}")
+        return False
@@ -9,7 +9,7 @@ Module principal pour lancer la logique réflexive :
 
 from core.ark_logger import ark_logger
 from modules.reflexia.logic.decision import monitor_status
-from modules.reflexia.logic.metrics_enhanced import read_metrics, read_metrics_enhanced
+from modules.reflexia.logic.metrics_enhanced import get_metrics_sampler, read_metrics
 from modules.reflexia.logic.snapshot import save_snapshot
 
 
@@ -35,8 +35,10 @@ def launch_reflexia_check_enhanced() -> dict:
     """
     📍 Version Enhanced avec métriques complètes système + containers
     """
-    metrics_enhanced = read_metrics_enhanced()
-    metrics_simple = read_metrics()
+    # Un seul snapshot pour les deux vues : cohérentes et sans double collecte
+    snapshot = get_metrics_sampler().latest()
+    metrics_enhanced = snapshot.to_enhanced()
+    metrics_simple = snapshot.to_simple()
     status = monitor_status(metrics_simple)
 
     save_snapshot(metrics_simple, status)
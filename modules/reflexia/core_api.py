@@ -7,17 +7,31 @@ Ce module fait partie du système Arkalia Luna Pro.
 # 📁 modules/reflexia/core_api.py
 
 from fastapi import APIRouter
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import JSONResponse, PlainTextResponse
-from prometheus_client import CONTENT_TYPE_LATEST, Gauge, generate_latest
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, generate_latest
 
-from .core import launch_reflexia_check
+from modules.monitoring.prometheus_metrics import CachedGaugeCollector
 
-# Métriques Prometheus locales pour Reflexia
-reflexia_cpu_usage = Gauge("reflexia_cpu_usage_percent", "Utilisation CPU reportée par ReflexIA")
+from .logic.metrics_enhanced import MetricsSnapshot, get_metrics_sampler
 
-reflexia_ram_usage = Gauge("reflexia_ram_usage_percent", "Utilisation RAM reportée par ReflexIA")
 
-reflexia_latency = Gauge("reflexia_latency_ms", "Latence système reportée par ReflexIA")
+def _latest_simple_metrics() -> dict | None:
+    # Lecture seule : un scrape ne démarre pas le sampler (démarré par l'application)
+    snapshot = get_metrics_sampler(start=False).peek()
+    return snapshot.to_simple() if snapshot is not None else None
+
+
+# Métriques Prometheus locales pour Reflexia, lues depuis le cache du sampler
+reflexia_collector = CachedGaugeCollector(
+    _latest_simple_metrics,
+    [
+        ("reflexia_cpu_usage_percent", "Utilisation CPU reportée par ReflexIA", "cpu"),
+        ("reflexia_ram_usage_percent", "Utilisation RAM reportée par ReflexIA", "ram"),
+        ("reflexia_latency_ms", "Latence système reportée par ReflexIA", "latency"),
+    ],
+)
+REGISTRY.register(reflexia_collector)
 
 # 🧩 Router Reflexia
 router = APIRouter(
@@ -31,8 +45,21 @@ def get_reflexia_status() -> dict:
     Fonction testable indépendamment de l'API FastAPI.
     Retourne un dictionnaire avec les métriques du système.
     """
-    result = launch_reflexia_check()
-    return {"status": "ok", "metrics": result["metrics"]}
+    return {"status": "ok", "metrics": get_metrics_sampler().latest().to_simple()}
+
+
+async def _current_snapshot() -> MetricsSnapshot:
+    """
+    Snapshot du sampler ; la toute première collecte part dans le threadpool
+
+    Le thread du sampler est démarré par l'application (lifespan), pas par
+    les requêtes.
+    """
+    sampler = get_metrics_sampler(start=False)
+    snapshot = sampler.peek()
+    if snapshot is None:
+        snapshot = await run_in_threadpool(sampler.latest)
+    return snapshot
 
 
 @router.get("/check")
@@ -42,7 +69,8 @@ async def check_reflexia_status():
     Retourne l'état des métriques système (CPU, RAM, etc.)
     """
     try:
-        return JSONResponse(content=get_reflexia_status())
+        snapshot = await _current_snapshot()
+        return JSONResponse(content={"status": "ok", "metrics": snapshot.to_simple()})
     except Exception as e:
         return JSONResponse(
             status_code=500,
@@ -56,18 +84,8 @@ async def get_metrics():
     📊 Endpoint métriques Prometheus pour Reflexia
     """
     try:
-        # Collecter les métriques actuelles
-        status_data = get_reflexia_status()
-        metrics_data = status_data.get("metrics", {})
-
-        # Mettre à jour les métriques Prometheus
-        cpu = metrics_data.get("cpu", 0.0)
-        ram = metrics_data.get("ram", 0.0)
-        latency = metrics_data.get("latency", 0.0)
-
-        reflexia_cpu_usage.set(cpu)
-        reflexia_ram_usage.set(ram)
-        reflexia_latency.set(latency)
+        # Garantit une première collecte sans bloquer la boucle d'événements
+        await _current_snapshot()
 
         # Générer le format Prometheus
         prometheus_data = generate_latest()
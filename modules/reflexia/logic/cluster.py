@@ -0,0 +1,525 @@
+#!/usr/bin/env python3
+# 🌐 modules/reflexia/logic/cluster.py
+"""
+Reflexia Cluster - Agrégation multi-nœuds
+
+Mode agrégation de Reflexia :
+- Agents par nœud poussant des trames binaires compactes (struct, en-tête
+  de 35 octets suivi du node_id)
+- Transport socket (Unix ou TCP, trames préfixées par leur longueur) ou
+  spool de fichiers (tests, nœuds sans réseau)
+- Agrégateur fusionnant les nœuds en vue cluster avec suivi de fraîcheur
+- Percentiles CPU/RAM cluster pour ``monitor_status`` et ZeroIA
+
+Lancement : ``python -m modules.reflexia.logic.cluster aggregate --listen 0.0.0.0:9105``
+sur l'agrégateur, ``python -m modules.reflexia.logic.cluster agent --to hôte:9105``
+sur chaque nœud.
+"""
+
+import argparse
+import logging
+import math
+import os
+import socket
+import socketserver
+import struct
+import threading
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+import toml
+
+from modules.utils.helpers.io_safe import atomic_write
+
+from .decision import monitor_status
+from .snapshot import get_snapshot_writer
+
+logger = logging.getLogger(__name__)
+
+FRAME_MAGIC = b"RFX1"
+# magic, timestamp, cpu, ram, disk, latency_ms, containers, errors, len(node_id)
+_FRAME_HEADER = struct.Struct("!4sd4fHIB")
+_LENGTH_PREFIX = struct.Struct("!I")
+# Trame la plus longue possible : en-tête + node_id de 255 octets
+MAX_FRAME_SIZE = _FRAME_HEADER.size + 255
+
+CLUSTER_SNAPSHOT_FILE = Path("modules/reflexia/state/reflexia_cluster_state.toml")
+# État Reflexia lu par ZeroIA (``load_reflexia_state``) et le contexte AssistantIA
+ZEROIA_REFLEXIA_STATE = Path("state/reflexia_state.toml")
+
+# Statut ``monitor_status`` -> décision dans le vocabulaire ZeroIA (détection de contradictions)
+ZEROIA_DECISIONS = {
+    "ok": "normal",
+    "degraded": "monitor",
+    "⚠️ haute mémoire": "monitor",
+    "🛑 surcharge CPU": "reduce_load",
+}
+
+
+@dataclass(frozen=True)
+class NodeMetrics:
+    """Métriques d'un nœud telles que transportées dans une trame"""
+
+    node_id: str
+    timestamp: float
+    cpu: float
+    ram: float
+    disk: float = 0.0
+    latency: float = 0.0
+    containers: int = 0
+    errors: int = 0
+
+    @classmethod
+    def from_metrics(cls, node_id: str, metrics: dict, disk: float = 0.0) -> "NodeMetrics":
+        """Construit une trame depuis le format de :func:`read_metrics`"""
+        return cls(
+            node_id=node_id,
+            timestamp=time.time(),
+            cpu=float(metrics.get("cpu", 0.0)),
+            ram=float(metrics.get("ram", 0.0)),
+            disk=float(disk),
+            latency=float(metrics.get("latency", 0.0)),
+            containers=int(metrics.get("containers", 0)),
+            errors=int(metrics.get("errors", 0)),
+        )
+
+
+def encode_frame(node: NodeMetrics) -> bytes:
+    node_id = node.node_id.encode("utf-8")
+    if len(node_id) > 255:
+        raise ValueError("node_id too long for frame (max 255 bytes)")
+    header = _FRAME_HEADER.pack(
+        FRAME_MAGIC,
+        node.timestamp,
+        node.cpu,
+        node.ram,
+        node.disk,
+        node.latency,
+        min(node.containers, 0xFFFF),
+        min(node.errors, 0xFFFFFFFF),
+        len(node_id),
+    )
+    return header + node_id
+
+
+def decode_frame(frame: bytes) -> NodeMetrics:
+    if len(frame) < _FRAME_HEADER.size:
+        raise ValueError("Truncated Reflexia frame")
+    magic, timestamp, cpu, ram, disk, latency, containers, errors, id_len = (
+        _FRAME_HEADER.unpack_from(frame)
+    )
+    if magic != FRAME_MAGIC:
+        raise ValueError(f"Invalid Reflexia frame magic: {magic!r}")
+    node_id = frame[_FRAME_HEADER.size : _FRAME_HEADER.size + id_len]
+    if len(node_id) != id_len:
+        raise ValueError("Truncated Reflexia frame node_id")
+    return NodeMetrics(
+        node_id=node_id.decode("utf-8"),
+        timestamp=timestamp,
+        cpu=round(cpu, 2),
+        ram=round(ram, 2),
+        disk=round(disk, 2),
+        latency=round(latency, 2),
+        containers=containers,
+        errors=errors,
+    )
+
+
+def _percentile(values: list[float], q: float) -> float:
+    """Percentile par rang le plus proche (``values`` triées)"""
+    if not values:
+        return 0.0
+    rank = math.ceil(q / 100 * len(values))
+    return values[max(0, min(len(values), rank) - 1)]
+
+
+# ----------------------------------------------------------------------
+# Transports agent
+# ----------------------------------------------------------------------
+
+
+class SocketTransport:
+    """Envoi de trames préfixées par leur longueur sur socket Unix ou TCP"""
+
+    def __init__(self, address: str | tuple[str, int], timeout: float = 2.0) -> None:
+        self.address = address
+        self.timeout = timeout
+        self._sock: socket.socket | None = None
+
+    def _connect(self) -> socket.socket:
+        if isinstance(self.address, str):
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        else:
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        sock.connect(self.address)
+        return sock
+
+    def send(self, frame: bytes) -> None:
+        payload = _LENGTH_PREFIX.pack(len(frame)) + frame
+        for attempt in range(2):
+            if self._sock is None:
+                self._sock = self._connect()
+            try:
+                self._sock.sendall(payload)
+                return
+            except OSError:
+                # Connexion persistante coupée par l'agrégateur : une reconnexion
+                self.close()
+                if attempt:
+                    raise
+
+    def close(self) -> None:
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+
+
+class SpoolTransport:
+    """Dépôt de trames dans un répertoire partagé (une trame par fichier)"""
+
+    def __init__(self, directory: str | Path) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def send(self, frame: bytes) -> None:
+        name = f"{time.time_ns()}_{os.getpid()}.frame"
+        tmp_path = self.directory / f".{name}.tmp"
+        tmp_path.write_bytes(frame)
+        # Renommage atomique : l'agrégateur ne voit jamais de trame partielle
+        os.replace(tmp_path, self.directory / name)
+
+    def close(self) -> None:
+        pass
+
+
+class ReflexiaAgent:
+    """Agent de nœud : pousse les métriques locales vers l'agrégateur"""
+
+    def __init__(self, node_id: str, transport: SocketTransport | SpoolTransport) -> None:
+        self.node_id = node_id
+        self.transport = transport
+
+    def push(self, metrics: dict | None = None) -> NodeMetrics:
+        if metrics is None:
+            from .metrics_enhanced import get_metrics_sampler
+
+            snapshot = get_metrics_sampler().latest()
+            node = NodeMetrics.from_metrics(
+                self.node_id, snapshot.to_simple(), snapshot.system.get("disk_usage", 0.0)
+            )
+        else:
+            node = NodeMetrics.from_metrics(self.node_id, metrics)
+        self.transport.send(encode_frame(node))
+        return node
+
+
+# ----------------------------------------------------------------------
+# Agrégateur
+# ----------------------------------------------------------------------
+
+
+class ReflexiaAggregator:
+    """
+    Vue cluster fusionnée à partir des trames des agents
+
+    Chaque nœud conserve sa dernière trame ; un nœud dont la trame a plus de
+    ``stale_after`` secondes est signalé ``stale`` et exclu des percentiles.
+    """
+
+    def __init__(self, stale_after: float = 30.0) -> None:
+        self.stale_after = stale_after
+        self._nodes: dict[str, NodeMetrics] = {}
+        self._lock = threading.Lock()
+        self._server: socketserver.BaseServer | None = None
+        self._server_thread: threading.Thread | None = None
+        self.frames_received = 0
+        self.frames_rejected = 0
+
+    def ingest(self, frame: bytes) -> NodeMetrics | None:
+        try:
+            node = decode_frame(frame)
+        except (ValueError, struct.error, UnicodeDecodeError) as e:
+            self.frames_rejected += 1
+            logger.warning(f"⚠️ Trame Reflexia rejetée: {e}")
+            return None
+        with self._lock:
+            current = self._nodes.get(node.node_id)
+            # Les trames arrivées en retard ne remplacent pas une trame plus récente
+            if current is None or node.timestamp >= current.timestamp:
+                self._nodes[node.node_id] = node
+            self.frames_received += 1
+        return node
+
+    def ingest_spool(self, directory: str | Path) -> int:
+        """Consomme les trames déposées dans le spool (fichiers supprimés après lecture)"""
+        count = 0
+        for path in sorted(Path(directory).glob("*.frame")):
+            try:
+                frame = path.read_bytes()
+                path.unlink()
+            except OSError:
+                continue
+            if self.ingest(frame) is not None:
+                count += 1
+        return count
+
+    def serve(self, address: str | tuple[str, int]) -> str | tuple[str, int]:
+        """Démarre la réception socket en arrière-plan ; renvoie l'adresse effective"""
+        aggregator = self
+
+        class FrameHandler(socketserver.StreamRequestHandler):
+            def handle(self) -> None:
+                while True:
+                    prefix = self.rfile.read(_LENGTH_PREFIX.size)
+                    if len(prefix) < _LENGTH_PREFIX.size:
+                        return
+                    (length,) = _LENGTH_PREFIX.unpack(prefix)
+                    if length > MAX_FRAME_SIZE:
+                        # Longueur impossible : on ferme plutôt que d'allouer
+                        aggregator.frames_rejected += 1
+                        logger.warning(f"⚠️ Trame Reflexia de {length} octets refusée")
+                        return
+                    frame = self.rfile.read(length)
+                    if len(frame) < length:
+                        return
+                    aggregator.ingest(frame)
+
+        if isinstance(address, str):
+
+            class UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+                daemon_threads = True
+
+            server: socketserver.BaseServer = UnixServer(address, FrameHandler)
+        else:
+
+            class TCPServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+                daemon_threads = True
+                allow_reuse_address = True
+
+            server = TCPServer(address, FrameHandler)
+
+        self._server = server
+        self._server_thread = threading.Thread(
+            target=server.serve_forever, name="reflexia-aggregator", daemon=True
+        )
+        self._server_thread.start()
+        return server.server_address
+
+    def shutdown(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def cluster_view(self, now: float | None = None) -> dict[str, Any]:
+        """Nœuds avec âge/fraîcheur et percentiles CPU/RAM des nœuds frais"""
+        now = time.time() if now is None else now
+        with self._lock:
+            nodes = list(self._nodes.values())
+
+        view_nodes: dict[str, dict[str, Any]] = {}
+        fresh: list[NodeMetrics] = []
+        for node in nodes:
+            age = now - node.timestamp
+            stale = age > self.stale_after
+            view_nodes[node.node_id] = {
+                **asdict(node),
+                "age_seconds": round(age, 3),
+                "stale": stale,
+            }
+            if not stale:
+                fresh.append(node)
+
+        cpu = sorted(n.cpu for n in fresh)
+        ram = sorted(n.ram for n in fresh)
+        return {
+            "nodes": view_nodes,
+            "active_nodes": len(fresh),
+            "stale_nodes": len(nodes) - len(fresh),
+            "cpu": {f"p{q}": _percentile(cpu, q) for q in (50, 90, 99)},
+            "ram": {f"p{q}": _percentile(ram, q) for q in (50, 90, 99)},
+            "latency_max": max((n.latency for n in fresh), default=0.0),
+            "errors_total": sum(n.errors for n in fresh),
+        }
+
+    def cluster_metrics(self, now: float | None = None) -> dict[str, Any]:
+        """Métriques cluster au format de :func:`read_metrics` (p90 CPU/RAM)"""
+        view = self.cluster_view(now)
+        return {
+            "cpu": view["cpu"]["p90"],
+            "ram": view["ram"]["p90"],
+            "latency": view["latency_max"],
+            "errors": view["errors_total"],
+            "nodes_active": view["active_nodes"],
+            "nodes_stale": view["stale_nodes"],
+            "cpu_p50": view["cpu"]["p50"],
+            "cpu_p99": view["cpu"]["p99"],
+            "ram_p50": view["ram"]["p50"],
+            "ram_p99": view["ram"]["p99"],
+        }
+
+    def publish(
+        self, path: Path | None = None, zeroia_path: Path | None = ZEROIA_REFLEXIA_STATE
+    ) -> dict[str, Any]:
+        """
+        Évalue le cluster via ``monitor_status`` et écrit le snapshot cluster.
+
+        La décision cluster est aussi reportée dans l'état Reflexia lu par
+        ZeroIA (``zeroia_path``, ignoré si None). Sans aucun nœud frais, les
+        percentiles à 0.0 ne disent rien : le cluster est publié ``degraded``.
+        """
+        metrics = self.cluster_metrics()
+        if metrics["nodes_active"] == 0:
+            logger.warning(
+                f"⚠️ Aucun nœud Reflexia frais ({metrics['nodes_stale']} périmés) : cluster dégradé"
+            )
+            status = "degraded"
+        else:
+            status = monitor_status(metrics)
+        get_snapshot_writer(path or CLUSTER_SNAPSHOT_FILE).save(metrics, status)
+        if zeroia_path is not None:
+            write_zeroia_state(zeroia_path, status, metrics)
+        return {"status": status, "metrics": metrics}
+
+
+def write_zeroia_state(path: Path, status: str, metrics: dict[str, Any]) -> bool:
+    """
+    Met à jour l'état Reflexia au format lu par ZeroIA
+
+    Les clés existantes (``decision_metrics``...) sont conservées ; un fichier
+    illisible est remplacé.
+    """
+    path = Path(path)
+    try:
+        state = toml.load(path)
+    except (OSError, toml.TomlDecodeError):
+        state = {}
+    state.update(
+        {
+            "status": "active",
+            "last_execution": datetime.now().isoformat(),
+            "decision": {
+                "last_decision": ZEROIA_DECISIONS.get(status, "monitor"),
+                "reflexia_status": status,
+                "source": "cluster",
+            },
+            "cluster": metrics,
+        }
+    )
+    return atomic_write(path, toml.dumps(state))
+
+
+# ----------------------------------------------------------------------
+# Points d'entrée
+# ----------------------------------------------------------------------
+
+
+def _parse_address(value: str) -> str | tuple[str, int]:
+    """``hôte:port`` pour TCP, sinon chemin de socket Unix"""
+    host, sep, port = value.rpartition(":")
+    if sep and port.isdigit():
+        return host or "0.0.0.0", int(port)  # nosec B104
+    return value
+
+
+def run_aggregator(
+    listen: str | tuple[str, int] | None = None,
+    spool: Path | None = None,
+    interval: float = 10.0,
+    max_cycles: int | None = None,
+    stale_after: float = 30.0,
+    snapshot_path: Path | None = None,
+    zeroia_path: Path | None = ZEROIA_REFLEXIA_STATE,
+) -> ReflexiaAggregator:
+    """Mode agrégation : reçoit les trames et publie la vue cluster toutes les ``interval`` s"""
+    aggregator = ReflexiaAggregator(stale_after=stale_after)
+    if listen is not None:
+        address = aggregator.serve(listen)
+        logger.info(f"🌐 Reflexia aggregator listening on {address}")
+    cycles = 0
+    try:
+        while max_cycles is None or cycles < max_cycles:
+            if spool is not None:
+                aggregator.ingest_spool(spool)
+            result = aggregator.publish(snapshot_path, zeroia_path)
+            logger.info(
+                f"🌐 Cluster {result['metrics']['nodes_active']} nœuds actifs: {result['status']}"
+            )
+            cycles += 1
+            if max_cycles is None or cycles < max_cycles:
+                time.sleep(interval)
+    finally:
+        aggregator.shutdown()
+    return aggregator
+
+
+def run_agent(
+    node_id: str,
+    transport: SocketTransport | SpoolTransport,
+    interval: float = 10.0,
+    max_pushes: int | None = None,
+) -> int:
+    """Mode agent : pousse les métriques locales toutes les ``interval`` s"""
+    agent = ReflexiaAgent(node_id, transport)
+    pushes = 0
+    try:
+        while max_pushes is None or pushes < max_pushes:
+            try:
+                agent.push()
+                pushes += 1
+            except OSError as e:
+                logger.warning(f"⚠️ Agrégateur Reflexia injoignable: {e}")
+            if max_pushes is None or pushes < max_pushes:
+                time.sleep(interval)
+    finally:
+        transport.close()
+    return pushes
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Reflexia - mode agrégation multi-nœuds")
+    subparsers = parser.add_subparsers(dest="mode", required=True)
+
+    aggregate = subparsers.add_parser("aggregate", help="Agrégateur cluster")
+    aggregate.add_argument("--listen", help="hôte:port TCP ou chemin de socket Unix")
+    aggregate.add_argument("--spool", type=Path, help="Répertoire de spool des trames")
+    aggregate.add_argument("--interval", type=float, default=10.0)
+    aggregate.add_argument("--stale-after", type=float, default=30.0)
+    aggregate.add_argument("--zeroia-state", type=Path, default=ZEROIA_REFLEXIA_STATE)
+
+    agent = subparsers.add_parser("agent", help="Agent de nœud")
+    agent.add_argument("--node-id", default=socket.gethostname())
+    target = agent.add_mutually_exclusive_group(required=True)
+    target.add_argument("--to", help="hôte:port TCP ou chemin de socket Unix de l'agrégateur")
+    target.add_argument("--spool", type=Path, help="Répertoire de spool des trames")
+    agent.add_argument("--interval", type=float, default=10.0)
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+    try:
+        if args.mode == "aggregate":
+            if args.listen is None and args.spool is None:
+                parser.error("aggregate: --listen ou --spool requis")
+            run_aggregator(
+                listen=_parse_address(args.listen) if args.listen else None,
+                spool=args.spool,
+                interval=args.interval,
+                stale_after=args.stale_after,
+                zeroia_path=args.zeroia_state,
+            )
+        else:
+            transport: SocketTransport | SpoolTransport = (
+                SocketTransport(_parse_address(args.to)) if args.to else SpoolTransport(args.spool)
+            )
+            run_agent(args.node_id, transport, interval=args.interval)
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+# 🐳 modules/reflexia/logic/docker_engine.py
+"""
+Reflexia - Client Docker Engine via socket Unix
+
+Remplace le fork de ``docker ps`` à chaque lecture de métriques :
+- Connexion HTTP persistante sur ``/var/run/docker.sock``
+- Abonnement au flux ``/events`` pour maintenir une table d'état en mémoire
+- Repli sur un polling ``/containers/json`` si le flux d'événements tombe
+"""
+
+import http.client
+import json
+import logging
+import re
+import socket
+import threading
+import time
+from collections.abc import Iterator
+from typing import Any
+from urllib.parse import quote
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DOCKER_SOCKET = "/var/run/docker.sock"
+ARKALIA_CONTAINER_PATTERN = r"zeroia|sandozia|reflexia|assistantia"
+
+
+class UnixSocketHTTPConnection(http.client.HTTPConnection):
+    """Connexion HTTP/1.1 sur un socket Unix (API Docker Engine)"""
+
+    def __init__(self, socket_path: str, timeout: float | None = 5.0) -> None:
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self) -> None:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        sock.connect(self.socket_path)
+        self.sock = sock
+
+
+class DockerEngineClient:
+    """
+    Client minimal de l'API Docker Engine
+
+    La connexion des requêtes ponctuelles est gardée ouverte (keep-alive) et
+    rouverte une fois en cas d'échec ; le flux d'événements utilise sa propre
+    connexion, sans timeout de lecture.
+    """
+
+    def __init__(self, socket_path: str = DEFAULT_DOCKER_SOCKET, timeout: float = 5.0) -> None:
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self._conn: UnixSocketHTTPConnection | None = None
+        self._lock = threading.Lock()
+        self._events_conn: UnixSocketHTTPConnection | None = None
+
+    def get_json(self, path: str) -> Any:
+        """GET ``path`` et décode la réponse JSON"""
+        with self._lock:
+            for attempt in range(2):
+                if self._conn is None:
+                    self._conn = UnixSocketHTTPConnection(self.socket_path, timeout=self.timeout)
+                try:
+                    self._conn.request("GET", path)
+                    response = self._conn.getresponse()
+                    body = response.read()
+                except (OSError, http.client.HTTPException):
+                    # Connexion keep-alive fermée par le démon : une seule reconnexion
+                    self._conn.close()
+                    self._conn = None
+                    if attempt:
+                        raise
+                    continue
+                if response.status >= 400:
+                    raise http.client.HTTPException(
+                        f"Docker API {path} returned HTTP {response.status}"
+                    )
+                return json.loads(body)
+        return None
+
+    def list_containers(self) -> list[dict[str, Any]]:
+        """Containers en cours d'exécution (équivalent ``docker ps``)"""
+        return self.get_json("/containers/json")
+
+    def stream_events(self, since: float | None = None) -> Iterator[dict[str, Any]]:
+        """Itère sur les événements containers jusqu'à fermeture du flux"""
+        path = "/events?filters=" + quote(json.dumps({"type": ["container"]}))
+        if since is not None:
+            # Rejoue les événements survenus depuis la dernière synchronisation
+            path += f"&since={int(since)}"
+        conn = UnixSocketHTTPConnection(self.socket_path, timeout=None)
+        self._events_conn = conn
+        try:
+            conn.request("GET", path)
+            response = conn.getresponse()
+            if response.status >= 400:
+                raise http.client.HTTPException(f"Docker events returned HTTP {response.status}")
+            while True:
+                line = response.readline()
+                if not line:
+                    return
+                if line.strip():
+                    yield json.loads(line)
+        finally:
+            self._events_conn = None
+            conn.close()
+
+    def interrupt_events(self) -> None:
+        """Coupe le flux d'événements en cours (débloque ``stream_events``)"""
+        conn = self._events_conn
+        if conn is not None and conn.sock is not None:
+            try:
+                conn.sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    def close(self) -> None:
+        self.interrupt_events()
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+class DockerContainerMonitor:
+    """
+    Table d'état des containers Arkalia tenue à jour par le flux d'événements
+
+    Un thread de fond synchronise la table via ``/containers/json`` puis
+    applique les événements ``start``/``die``/``health_status`` au fil de
+    l'eau. Si le flux échoue, il repasse en polling toutes les
+    ``poll_interval`` secondes avant de retenter l'abonnement.
+    """
+
+    def __init__(
+        self,
+        client: DockerEngineClient | None = None,
+        name_pattern: str = ARKALIA_CONTAINER_PATTERN,
+        poll_interval: float = 30.0,
+    ) -> None:
+        self.client = client or DockerEngineClient()
+        self.name_pattern = re.compile(name_pattern)
+        self.poll_interval = poll_interval
+
+        self._states: dict[str, str] = {}
+        self._available = False
+        self._last_error: str | None = None
+        self._synced_at: float | None = None
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    # ------------------------------------------------------------------
+    # Cycle de vie
+    # ------------------------------------------------------------------
+
+    def start(self) -> None:
+        """Synchronise la table puis démarre le suivi des événements (idempotent)"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self.sync()
+        self._thread = threading.Thread(
+            target=self._run, name="reflexia-docker-events", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop_event.set()
+        self.client.interrupt_events()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+        self._thread = None
+        self.client.close()
+
+    # ------------------------------------------------------------------
+    # Lecture
+    # ------------------------------------------------------------------
+
+    def status(self) -> dict[str, Any]:
+        """État courant au format historique de ``get_arkalia_containers_status``"""
+        if not self._available:
+            return {"error": self._last_error or "Docker unavailable"}
+        return dict(self._states)
+
+    # ------------------------------------------------------------------
+    # Synchronisation
+    # ------------------------------------------------------------------
+
+    def sync(self) -> bool:
+        """Reconstruit la table depuis ``/containers/json``"""
+        synced_at = time.time()
+        try:
+            containers = self.client.list_containers()
+        except (OSError, http.client.HTTPException, ValueError) as e:
+            self._available = False
+            self._last_error = f"Container check failed: {e}"
+            return False
+
+        states: dict[str, str] = {}
+        for container in containers:
+            name = (container.get("Names") or ["/"])[0].lstrip("/")
+            if self.name_pattern.search(name):
+                status = container.get("Status", "")
+                states[name] = "healthy" if "(healthy)" in status else "running"
+        self._states = states
+        self._available = True
+        self._last_error = None
+        self._synced_at = synced_at
+        return True
+
+    def apply_event(self, event: dict[str, Any]) -> None:
+        """Applique un événement container du flux Docker à la table"""
+        if event.get("Type") != "container":
+            return
+        name = event.get("Actor", {}).get("Attributes", {}).get("name", "")
+        if not self.name_pattern.search(name):
+            return
+
+        action = event.get("Action", "")
+        states = dict(self._states)
+        if action in ("start", "unpause", "restart"):
+            states[name] = states.get(name, "running")
+        elif action in ("die", "stop", "kill", "destroy", "pause", "oom"):
+            states.pop(name, None)
+        elif action.startswith("health_status"):
+            states[name] = "healthy" if action.endswith(": healthy") else "running"
+        else:
+            return
+        # Remplacement de référence : les lecteurs ne voient jamais un état partiel
+        self._states = states
+
+    def _run(self) -> None:
+        while not self._stop_event.is_set():
+            try:
+                if not self._available and not self.sync():
+                    raise OSError(self._last_error)
+                for event in self.client.stream_events(since=self._synced_at):
+                    self.apply_event(event)
+                    if self._stop_event.is_set():
+                        return
+                # Flux fermé par le démon : resynchronisation complète
+                self.sync()
+            except (OSError, http.client.HTTPException, ValueError) as e:
+                if self._stop_event.is_set():
+                    return
+                logger.warning(f"⚠️ Docker events stream unavailable, polling: {e}")
+                self._stop_event.wait(self.poll_interval)
+                self.sync()
+
+
+_monitor: DockerContainerMonitor | None = None
+_monitor_lock = threading.Lock()
+
+
+def get_container_monitor() -> DockerContainerMonitor:
+    """Moniteur partagé du processus (démarré au premier accès)"""
+    global _monitor
+    with _monitor_lock:
+        if _monitor is None:
+            _monitor = DockerContainerMonitor()
+            _monitor.start()
+        return _monitor
+
+
+__all__ = [
+    "DockerContainerMonitor",
+    "DockerEngineClient",
+    "UnixSocketHTTPConnection",
+    "get_container_monitor",
+]
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+# 📜 modules/reflexia/logic/log_tailer.py
+"""
+Reflexia - Lecture incrémentale des logs d'erreurs
+
+Remplace la relecture complète de ``app_errors.log`` à chaque cycle :
+- Mémorise l'offset et l'inode du fichier suivi
+- Gère la rotation (nouvel inode) et la troncature (taille < offset)
+- Ne lit que les octets ajoutés depuis le dernier passage
+- Compteurs glissants d'erreurs/warnings sur plusieurs fenêtres de temps
+"""
+
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left
+from pathlib import Path
+from typing import Any, BinaryIO
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WINDOWS_SECONDS = (60, 300, 3600)
+
+
+class EventTimes:
+    """
+    Horodatages croissants d'événements (erreurs, warnings)
+
+    Liste avec un indice de début mobile : l'expiration avance l'indice et la
+    liste n'est compactée que lorsque la moitié des événements a expiré (O(1)
+    amorti). Les comptages par fenêtre sont des recherches binaires, en O(log n).
+    """
+
+    __slots__ = ("_times", "_start")
+
+    def __init__(self) -> None:
+        self._times: list[float] = []
+        self._start = 0
+
+    def append(self, timestamp: float) -> None:
+        self._times.append(timestamp)
+
+    def expire(self, horizon: float) -> None:
+        """Oublie les événements antérieurs à ``horizon``"""
+        self._start = bisect_left(self._times, horizon, lo=self._start)
+        if self._start * 2 >= len(self._times):
+            del self._times[: self._start]
+            self._start = 0
+
+    def count_since(self, cutoff: float) -> int:
+        """Nombre d'événements à partir de ``cutoff`` (inclus)"""
+        return len(self._times) - bisect_left(self._times, cutoff, lo=self._start)
+
+    def __len__(self) -> int:
+        return len(self._times) - self._start
+
+
+class LogTailer:
+    """
+    Suiveur incrémental d'un fichier de log
+
+    Le fichier reste ouvert entre deux :meth:`poll` : lors d'une rotation, la
+    fin de l'ancien fichier est lue avant de basculer sur le nouveau, de sorte
+    qu'aucune ligne n'est perdue. À la première ouverture, seuls les
+    ``backfill_bytes`` derniers octets sont analysés.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        windows: tuple[int, ...] = DEFAULT_WINDOWS_SECONDS,
+        backfill_bytes: int = 64 * 1024,
+    ) -> None:
+        self.path = Path(path)
+        self.windows = tuple(sorted(windows))
+        self.backfill_bytes = backfill_bytes
+
+        self._file: BinaryIO | None = None
+        self._inode: tuple[int, int] | None = None
+        self._offset = 0
+        self._partial = b""
+        self._errors = EventTimes()
+        self._warnings = EventTimes()
+        self._lock = threading.Lock()
+
+        self.bytes_read = 0
+        self.rotations = 0
+
+    # ------------------------------------------------------------------
+    # Lecture
+    # ------------------------------------------------------------------
+
+    def poll(self, now: float | None = None) -> int:
+        """
+        Lit les nouvelles lignes et met à jour les compteurs.
+
+        Returns:
+            int: Nombre de lignes complètes traitées
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            lines = 0
+            try:
+                stat = self.path.stat()
+            except FileNotFoundError:
+                stat = None
+
+            if self._file is not None:
+                # Fin de l'ancien fichier avant rotation / troncature
+                lines += self._read_available(now)
+                same_file = stat is not None and (stat.st_dev, stat.st_ino) == self._inode
+                if not same_file:
+                    self._close()
+                    self.rotations += 1
+                elif stat.st_size < self._offset:
+                    logger.info(f"📜 Log {self.path} truncated, restarting from offset 0")
+                    self._file.seek(0)
+                    self._offset = 0
+                    self._partial = b""
+                    self.rotations += 1
+
+            if self._file is None and stat is not None:
+                self._open(stat, initial=self.rotations == 0 and self.bytes_read == 0)
+
+            if self._file is not None:
+                lines += self._read_available(now)
+
+            self._prune(now)
+            return lines
+
+    def counts(self, now: float | None = None) -> dict[str, Any]:
+        """Compteurs glissants par fenêtre (clés ``"60s"``, ``"300s"``...)"""
+        now = time.time() if now is None else now
+        with self._lock:
+            self._prune(now)
+            return {
+                f"{window}s": {
+                    "errors": self._errors.count_since(now - window),
+                    "warnings": self._warnings.count_since(now - window),
+                }
+                for window in self.windows
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            self._close()
+
+    # ------------------------------------------------------------------
+    # Interne
+    # ------------------------------------------------------------------
+
+    def _open(self, stat: os.stat_result, initial: bool) -> None:
+        try:
+            self._file = open(self.path, "rb")
+        except OSError as e:
+            logger.warning(f"⚠️ Cannot open log {self.path}: {e}")
+            return
+        self._inode = (stat.st_dev, stat.st_ino)
+        self._offset = 0
+        self._partial = b""
+
+        if initial and stat.st_size > self.backfill_bytes:
+            # Premier passage : seule la fin du fichier est analysée
+            self._file.seek(stat.st_size - self.backfill_bytes)
+            self._file.readline()  # Ligne probablement coupée
+            self._offset = self._file.tell()
+
+    def _close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+        self._file = None
+        self._inode = None
+        self._partial = b""
+
+    def _read_available(self, now: float) -> int:
+        assert self._file is not None
+        chunk = self._file.read()
+        if not chunk:
+            return 0
+        self._offset += len(chunk)
+        self.bytes_read += len(chunk)
+
+        data = self._partial + chunk
+        *complete, self._partial = data.split(b"\n")
+        for raw in complete:
+            line = raw.upper()
+            if b"ERROR" in line:
+                self._errors.append(now)
+            elif b"WARNING" in line:
+                self._warnings.append(now)
+        return len(complete)
+
+    def _prune(self, now: float) -> None:
+        horizon = now - self.windows[-1]
+        self._errors.expire(horizon)
+        self._warnings.expire(horizon)
@@ -10,19 +10,38 @@ Boucle principale améliorée avec :
 - Logs structurés
 """
 
-from core.ark_logger import ark_logger
+import asyncio
 import logging
 import time
 from datetime import datetime
-from typing import Any, Optional
+from pathlib import Path
+from typing import Any
+
+import toml
+
+from core.ark_logger import ark_logger
+from modules.monitoring.heartbeat_registry import StatCachedProbe
 
 from .decision import monitor_status
-from .metrics_enhanced import read_metrics, read_metrics_enhanced
+from .metrics_enhanced import MetricsSnapshot
+from .scheduler import ReflexiaScheduler, TickResult
 from .snapshot import save_snapshot
 
 logger = logging.getLogger(__name__)
 
 
+def _load_zeroia_decision(path: Path) -> dict[str, Any]:
+    try:
+        return {"last_decision": toml.load(path).get("decision", {}).get("last_decision")}
+    except Exception:
+        return {"last_decision": None}
+
+
+_zeroia_state_probe = StatCachedProbe(
+    "modules/zeroia/state/zeroia_state.toml", _load_zeroia_decision
+)
+
+
 def analyze_system_health(metrics: dict[str, Any]) -> dict[str, str]:
     """
     Analyse avancée de la santé du système
@@ -89,27 +108,26 @@ def analyze_system_health(metrics: dict[str, Any]) -> dict[str, str]:
         "taskia": "modules/taskia",
     }
 
+    modules_health = metrics.get("modules", {})
+
     for module_name, module_path in arkalia_modules.items():
         try:
-            from pathlib import Path
-
             path = Path(module_path)
 
-            if path.exists():
-                if module_name == "zeroia":
-                    # Vérifier l'état ZeroIA spécifiquement
-                    try:
-                        import toml
-
-                        zeroia_state = toml.load(path)
-                        if zeroia_state.get("decision", {}).get("last_decision"):
-                            analysis["arkalia_modules"][module_name] = "ok"
-                        else:
-                            analysis["arkalia_modules"][module_name] = "warning"
-                    except Exception:
-                        analysis["arkalia_modules"][module_name] = "warning"
+            if module_name == "zeroia":
+                # Heartbeat publié par ZeroIA, sinon état TOML relu seulement s'il a changé
+                heartbeat = modules_health.get("zeroia", {})
+                if heartbeat.get("source") == "heartbeat":
+                    last_decision = heartbeat.get("last_decision")
                 else:
-                    analysis["arkalia_modules"][module_name] = "ok"
+                    zeroia_state = _zeroia_state_probe.read()
+                    if zeroia_state is None:
+                        analysis["arkalia_modules"][module_name] = "missing"
+                        continue
+                    last_decision = zeroia_state.get("last_decision")
+                analysis["arkalia_modules"][module_name] = "ok" if last_decision else "warning"
+            elif path.exists():
+                analysis["arkalia_modules"][module_name] = "ok"
             else:
                 analysis["arkalia_modules"][module_name] = "missing"
         except Exception:
@@ -176,7 +194,7 @@ def reflexia_loop_enhanced(
     max_iterations: int | None = None,
     sleep_seconds: float = 10.0,
     verbose: bool = True,
-) -> None:
+) -> dict[str, Any]:
     """
     🔁 Boucle réflexive enhanced de ReflexIA v2.6.0
 
@@ -185,79 +203,89 @@ def reflexia_loop_enhanced(
     - État containers Docker Arkalia
     - Analyse intelligente et recommandations
     - Logs structurés avec timestamps
+    - Cadence fixe sans dérive (``ReflexiaScheduler``), persistance en parallèle
 
     Args:
         max_iterations: Nombre max d'itérations (None = infini)
-        sleep_seconds: Délai entre chaque cycle
+        sleep_seconds: Période entre deux cycles (cadence fixe)
         verbose: Affichage détaillé des logs
+
+    Returns:
+        Statistiques du planificateur (ticks, ticks manqués, collecteurs)
     """
-    iteration = 0
     start_time = datetime.now()
 
     if verbose:
         logger.info("🧠 Reflexia Enhanced Loop v2.6.0 started")
         ark_logger.info("🧠 Reflexia Enhanced Loop v2.6.0 started", extra={"module": "logic"})
 
-    while True:
-        cycle_start = datetime.now()
+    def analyze_tick(tick: int, snapshot: MetricsSnapshot) -> TickResult:
+        cycle_start = time.perf_counter()
+        metrics_enhanced = snapshot.to_enhanced()
+        metrics_simple = snapshot.to_simple()  # Pour compatibilité
+
+        # Analyse système
+        health_analysis = analyze_system_health(metrics_enhanced)
+        recommendations = generate_recommendations(health_analysis, metrics_enhanced)
+
+        # Décision via logique existante
+        status = monitor_status(metrics_simple)
+
+        if verbose:
+            cycle_time = time.perf_counter() - cycle_start
+            system = metrics_enhanced.get("system", {})
+            ark_logger.info(
+                f"🔄 [{datetime.now().strftime('%H:%M:%S')}] Reflexia Cycle #{tick + 1}",
+                extra={"module": "logic"},
+            )
+            ark_logger.info(
+                f"   💻 CPU: {system.get('cpu_percent', '?')}% | "
+                f"RAM: {system.get('memory_percent', '?')}% | "
+                f"Status: {status}",
+                extra={"module": "logic"},
+            )
+
+            containers = metrics_enhanced.get("containers", {})
+            if isinstance(containers, dict) and "error" not in containers:
+                ark_logger.info(
+                    f"   🐳 Containers: {len(containers)} actifs", extra={"module": "logic"}
+                )
+                for name, state in containers.items():
+                    ark_logger.info(f"      • {name}: {state}", extra={"module": "logic"})
 
-        try:
-            # Collecte métriques enhanced
-            metrics_enhanced = read_metrics_enhanced()
-            metrics_simple = read_metrics()  # Pour compatibilité
+            ark_logger.info("   🎯 Recommandations:", extra={"module": "logic"})
+            for rec in recommendations[:2]:  # Max 2 recommendations
+                ark_logger.info(f"      • {rec}", extra={"module": "logic"})
 
-            # Analyse système
-            health_analysis = analyze_system_health(metrics_enhanced)
-            recommendations = generate_recommendations(health_analysis, metrics_enhanced)
+            ark_logger.info(f"   ⏱️ Cycle time: {cycle_time:.3f}s", extra={"module": "logic"})
+            ark_logger.info("", extra={"module": "logic"})
 
-            # Décision via logique existante
-            status = monitor_status(metrics_simple)
+        logger.info(f"Reflexia cycle #{tick + 1} completed - Status: {status}")
+        return TickResult(tick=tick, snapshot=snapshot, metrics=metrics_simple, status=status)
 
-            # Sauvegarde snapshot
-            save_snapshot(metrics_simple, status)
+    def persist_tick(result: TickResult) -> None:
+        # Sauvegarde snapshot (thread dédié, chevauche la collecte suivante)
+        save_snapshot(result.metrics, result.status)
 
-            # Logs détaillés
-            cycle_time = (datetime.now() - cycle_start).total_seconds()
+    scheduler = ReflexiaScheduler(
+        on_tick=analyze_tick, persist=persist_tick, tick_seconds=sleep_seconds
+    )
+    try:
+        stats = asyncio.run(scheduler.run(max_ticks=max_iterations))
+    except KeyboardInterrupt:
+        stats = scheduler.stats()
 
-            if verbose:
-                ark_logger.info(f"🔄 [{datetime.now(, extra={"module": "logic"}).strftime('%H:%M:%S')}] Reflexia Cycle #{iteration + 1}")
-                ark_logger.info(
-                    f"   💻 CPU: {metrics_enhanced['system']['cpu_percent']}% | "
-                    f"RAM: {metrics_enhanced['system']['memory_percent']}% | "
-                    f"Status: {status}"
-                , extra={"module": "logic"})
-
-                containers = metrics_enhanced.get("containers", {})
-                if isinstance(containers, dict) and "error" not in containers:
-                    ark_logger.info(f"   🐳 Containers: {len(containers, extra={"module": "logic"})} actifs")
-                    for name, state in containers.items():
-                        ark_logger.info(f"      • {name}: {state}", extra={"module": "logic"})
-
-                ark_logger.info("   🎯 Recommandations:", extra={"module": "logic"})
-                for rec in recommendations[:2]:  # Max 2 recommendations
-                    ark_logger.info(f"      • {rec}", extra={"module": "logic"})
-
-                ark_logger.info(f"   ⏱️ Cycle time: {cycle_time:.2f}s", extra={"module": "logic"})
-                ark_logger.info("")
-
-            logger.info(f"Reflexia cycle #{iteration + 1} completed - Status: {status}")
-
-        except Exception as e:
-            logger.error(f"Reflexia enhanced cycle error: {e}")
-            if verbose:
-                ark_logger.info(f"❌ Erreur cycle Reflexia: {e}", extra={"module": "logic"})
-
-        time.sleep(sleep_seconds)
-        iteration += 1
-
-        if max_iterations is not None and iteration >= max_iterations:
-            total_time = (datetime.now() - start_time).total_seconds()
-            if verbose:
-                logger.info(
-                    f"Reflexia Enhanced completed - {iteration} cycles in {total_time:.1f}s"
-                )
-                ark_logger.info(f"🛑 Reflexia Enhanced terminé - {iteration} cycles en {total_time:.1f}s", extra={"module": "logic"})
-            break
+    total_time = (datetime.now() - start_time).total_seconds()
+    if verbose:
+        logger.info(
+            f"Reflexia Enhanced completed - {stats['ticks']['runs']} cycles in {total_time:.1f}s "
+            f"({stats['ticks']['missed']} ticks manqués)"
+        )
+        ark_logger.info(
+            f"🛑 Reflexia Enhanced terminé - {stats['ticks']['runs']} cycles en {total_time:.1f}s",
+            extra={"module": "logic"},
+        )
+    return stats
 
 
 # Alias pour compatibilité
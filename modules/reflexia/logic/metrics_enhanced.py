@@ -8,15 +8,31 @@ Collecte de vraies métriques système :
 - Métriques containers Docker
 - État des modules Arkalia
 - Analyse des logs d'erreurs
+
+Les métriques sont collectées en continu par un thread d'échantillonnage
+(:class:`MetricsSampler`) qui publie un snapshot immuable : les consommateurs
+(``read_metrics``, endpoints API, boucles) lisent le dernier snapshot sans
+jamais bloquer sur psutil ou Docker.
 """
 
-from core.ark_logger import ark_logger
 import json
+import logging
 import os
-import subprocess
+import threading
+import time
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Optional
+from types import MappingProxyType
+from typing import Any
+
+from core.ark_logger import ark_logger
+from modules.monitoring.heartbeat_registry import StatCachedProbe, get_heartbeat_registry
+
+from .log_tailer import LogTailer
+
+logger = logging.getLogger(__name__)
 
 try:
     import psutil
@@ -27,9 +43,12 @@ except ImportError:
 def get_system_metrics() -> dict:
     """Collecte les vraies métriques système"""
     if psutil:
+        memory = psutil.virtual_memory()
         return {
-            "cpu_percent": round(psutil.cpu_percent(interval=1), 1),
-            "memory_percent": round(psutil.virtual_memory().percent, 1),
+            # interval=None : delta depuis l'appel précédent, non bloquant
+            "cpu_percent": round(psutil.cpu_percent(interval=None), 1),
+            "memory_percent": round(memory.percent, 1),
+            "memory_used_bytes": memory.used,
             "disk_usage": round(psutil.disk_usage("/").percent, 1),
             "load_avg": (list(os.getloadavg()) if hasattr(os, "getloadavg") else [0, 0, 0]),
         }
@@ -44,73 +63,77 @@ def get_system_metrics() -> dict:
 
 
 def get_arkalia_containers_status() -> dict:
-    """Vérifie l'état des containers Arkalia"""
+    """Vérifie l'état des containers Arkalia (table tenue par les événements Docker)"""
+    from .docker_engine import get_container_monitor
+
+    return get_container_monitor().status()
+
+
+def _load_zeroia_dashboard(path: Path) -> dict[str, Any]:
     try:
-        result = subprocess.run(
-            [
-                "docker",
-                "ps",
-                "--filter",
-                "name=zeroia\\|sandozia\\|reflexia\\|assistantia",
-                "--format",
-                "{{.Names}} {{.Status}}",
-            ],
-            capture_output=True,
-            text=True,
-            timeout=5,
-        )
+        with open(path) as f:
+            data = json.load(f)
+        return {
+            "active": data.get("status") == "active",
+            "last_update": data.get("last_update", "unknown"),
+        }
+    except Exception:
+        return {"active": False, "error": "State file corrupted"}
 
-        if result.returncode == 0:
-            lines = result.stdout.strip().split("\n")
-            containers: dict[str, Any] = {}
-            for line in lines:
-                if line.strip():
-                    parts = line.split(" ", 1)
-                    if len(parts) >= 2:
-                        name = parts[0].strip()
-                        status = parts[1].strip()
-                        containers[name] = "healthy" if "healthy" in status else "running"
-            return containers
-        else:
-            return {"error": "Docker unavailable"}
 
-    except Exception as e:
-        return {"error": f"Container check failed: {str(e)}"}
+def _load_sandozia_journal(path: Path) -> dict[str, Any]:
+    # Les noms de segments sont horodatés : le plus récent est le dernier trié
+    segments = sorted(p.name for p in path.glob("segment_*"))
+    if not segments:
+        return {"active": False, "error": "No snapshots"}
+    return {"active": True, "journal_segments": len(segments), "last_snapshot": segments[-1]}
+
+
+def _load_sandozia_legacy_snapshots(path: Path) -> dict[str, Any]:
+    snapshots = list(path.glob("intelligence_snapshot_*.json"))
+    if not snapshots:
+        return {"active": False, "error": "No snapshots"}
+    return {
+        "active": True,
+        "snapshots_count": len(snapshots),
+        "last_snapshot": max(snapshots, key=os.path.getmtime).name,
+    }
+
+
+# Sondes de repli : relues uniquement quand le fichier / répertoire change
+_module_probes: dict[str, list[StatCachedProbe]] = {
+    "zeroia": [StatCachedProbe("state/zeroia_dashboard.json", _load_zeroia_dashboard)],
+    "sandozia": [
+        StatCachedProbe("state/sandozia/snapshot_journal", _load_sandozia_journal),
+        StatCachedProbe("state/sandozia", _load_sandozia_legacy_snapshots),
+    ],
+}
+_missing_module_state = {"zeroia": "No state file", "sandozia": "No sandozia state"}
 
 
 def get_arkalia_modules_health() -> dict:
-    """Vérifie la santé des modules Arkalia"""
+    """Vérifie la santé des modules Arkalia (heartbeats, puis sondes stat)"""
     health: dict[str, Any] = {}
-
-    # Check ZeroIA
-    zeroia_state = Path("state/zeroia_dashboard.json")
-    if zeroia_state.exists():
-        try:
-            with open(zeroia_state) as f:
-                data = json.load(f)
-                health["zeroia"] = {
-                    "active": data.get("status") == "active",
-                    "last_update": data.get("last_update", "unknown"),
-                }
-        except Exception:
-            health["zeroia"] = {"active": False, "error": "State file corrupted"}
-    else:
-        health["zeroia"] = {"active": False, "error": "No state file"}
-
-    # Check Sandozia
-    sandozia_dir = Path("state/sandozia")
-    if sandozia_dir.exists():
-        snapshots = list(sandozia_dir.glob("intelligence_snapshot_*.json"))
-        if snapshots:
-            health["sandozia"] = {
-                "active": True,
-                "snapshots_count": len(snapshots),
-                "last_snapshot": max(snapshots, key=os.path.getctime).name,
+    heartbeats = get_heartbeat_registry().read_all()
+
+    for module, probes in _module_probes.items():
+        beat = heartbeats.get(module)
+        if beat is not None and not beat["stale"]:
+            health[module] = {
+                **beat["details"],
+                "active": beat["status"] == "active",
+                "last_update": datetime.fromtimestamp(beat["updated_at"]).isoformat(),
+                "source": "heartbeat",
             }
-        else:
-            health["sandozia"] = {"active": False, "error": "No snapshots"}
-    else:
-        health["sandozia"] = {"active": False, "error": "No sandozia state"}
+            continue
+
+        health[module] = {"active": False, "error": _missing_module_state[module]}
+        for probe in probes:
+            result = probe.read()
+            if result is not None:
+                health[module] = result
+                if result.get("active"):
+                    break
 
     # Check Reflexia (self)
     reflexia_state = Path("state/reflexia_state.toml")
@@ -123,35 +146,256 @@ def get_arkalia_modules_health() -> dict:
     return health
 
 
-def analyze_error_logs() -> dict:
-    """Analyse les logs d'erreur récents"""
-    error_count = 0
-    warning_count = 0
+_log_tailer: LogTailer | None = None
 
-    # Check app_errors.log
-    error_log = Path("app_errors.log")
-    if error_log.exists():
-        try:
-            # Lire les 100 dernières lignes
-            with open(error_log) as f:
-                lines = f.readlines()[-100:]
+# Fenêtre utilisée pour les compteurs historiques recent_errors / recent_warnings
+RECENT_LOG_WINDOW = "300s"
 
-            for line in lines:
-                if "ERROR" in line.upper():
-                    error_count += 1
-                elif "WARNING" in line.upper():
-                    warning_count += 1
 
-        except Exception:
-            pass
+def analyze_error_logs() -> dict:
+    """Analyse les logs d'erreur récents (lecture incrémentale)"""
+    global _log_tailer
+    error_log = Path("app_errors.log")
+    if _log_tailer is None:
+        _log_tailer = LogTailer(error_log)
+
+    _log_tailer.poll()
+    windows = _log_tailer.counts()
 
     return {
-        "recent_errors": error_count,
-        "recent_warnings": warning_count,
+        "recent_errors": windows[RECENT_LOG_WINDOW]["errors"],
+        "recent_warnings": windows[RECENT_LOG_WINDOW]["warnings"],
+        "windows": windows,
         "log_file_exists": error_log.exists(),
     }
 
 
+def _freeze(value: Any) -> Any:
+    """Copie profonde en lecture seule (dict -> mappingproxy, list -> tuple)"""
+    if isinstance(value, Mapping):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, list | tuple):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def _thaw(value: Any) -> Any:
+    """Inverse de :func:`_freeze` : reconstruit des dicts/listes modifiables"""
+    if isinstance(value, Mapping):
+        return {k: _thaw(v) for k, v in value.items()}
+    if isinstance(value, tuple):
+        return [_thaw(v) for v in value]
+    return value
+
+
+@dataclass(frozen=True)
+class MetricsSnapshot:
+    """Dernier état publié par le sampler (immuable, partageable entre threads)"""
+
+    timestamp: datetime
+    system: Mapping[str, Any]
+    containers: Mapping[str, Any]
+    modules: Mapping[str, Any]
+    logs: Mapping[str, Any]
+    collection_time_ms: float
+
+    def to_enhanced(self) -> dict:
+        """Format historique de :func:`read_metrics_enhanced`"""
+        return {
+            "timestamp": self.timestamp.isoformat(),
+            "system": _thaw(self.system),
+            "containers": _thaw(self.containers),
+            "modules": _thaw(self.modules),
+            "logs": _thaw(self.logs),
+            "performance": {
+                "collection_time_ms": self.collection_time_ms,
+                "metrics_version": "enhanced_v2.6.0",
+            },
+        }
+
+    def to_simple(self) -> dict:
+        """
+        Format compact historique de :func:`read_metrics`
+
+        Une section dont la collecte a échoué ne contient que ``{"error": ...}`` :
+        ses champs prennent alors leur valeur neutre (0).
+        """
+        return {
+            "cpu": self.system.get("cpu_percent", 0),
+            "ram": self.system.get("memory_percent", 0),
+            "latency": self.collection_time_ms,
+            "containers": len(
+                [
+                    c
+                    for c in self.containers.values()
+                    if isinstance(c, str) and c in ["healthy", "running"]
+                ]
+            ),
+            "modules_active": len(
+                [
+                    m
+                    for m in self.modules.values()
+                    if isinstance(m, Mapping) and m.get("active", False)
+                ]
+            ),
+            "errors": self.logs.get("recent_errors", 0),
+        }
+
+
+class MetricsSampler:
+    """
+    Thread d'échantillonnage des métriques Reflexia
+
+    Chaque section est rafraîchie selon son propre intervalle (système
+    rapide, containers/modules/logs plus lents) ; après chaque passe, un
+    nouveau :class:`MetricsSnapshot` est publié par simple remplacement de
+    référence, de sorte que :meth:`latest` ne prend aucun verrou.
+    """
+
+    DEFAULT_INTERVALS: dict[str, float] = {
+        "system": 2.0,
+        "containers": 30.0,
+        "modules": 15.0,
+        "logs": 15.0,
+    }
+
+    def __init__(
+        self,
+        intervals: dict[str, float] | None = None,
+        collectors: dict[str, Callable[[], dict]] | None = None,
+    ) -> None:
+        self.intervals = {**self.DEFAULT_INTERVALS, **(intervals or {})}
+        self.collectors: dict[str, Callable[[], dict]] = {
+            "system": get_system_metrics,
+            "containers": get_arkalia_containers_status,
+            "modules": get_arkalia_modules_health,
+            "logs": analyze_error_logs,
+            **(collectors or {}),
+        }
+
+        self._sections: dict[str, Mapping[str, Any]] = {}
+        self._durations_ms: dict[str, float] = {}
+        self._next_due: dict[str, float] = dict.fromkeys(self.collectors, 0.0)
+        self._snapshot: MetricsSnapshot | None = None
+        # Réentrant : refresh() tient le verrou et appelle refresh_section/publish
+        self._refresh_lock = threading.RLock()
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+
+        if psutil:
+            # Amorce la mesure CPU : le premier appel interval=None renvoie 0.0
+            psutil.cpu_percent(interval=None)
+
+    # ------------------------------------------------------------------
+    # Cycle de vie
+    # ------------------------------------------------------------------
+
+    def start(self) -> None:
+        """Démarre le thread d'échantillonnage (idempotent)"""
+        if self.is_running():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="reflexia-metrics-sampler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Arrête le thread et attend sa terminaison"""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+        self._thread = None
+
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    # ------------------------------------------------------------------
+    # Collecte
+    # ------------------------------------------------------------------
+
+    def refresh(self, force: bool = False) -> MetricsSnapshot:
+        """
+        Rafraîchit les sections échues (toutes si ``force``) et publie un snapshot.
+
+        Returns:
+            MetricsSnapshot: Le snapshot publié
+        """
+        with self._refresh_lock:
+            now = time.monotonic()
+            for name in self.collectors:
+                if not force and name in self._sections and now < self._next_due[name]:
+                    continue
+                self.refresh_section(name)
+            return self.publish()
+
+    def refresh_section(self, name: str) -> None:
+        """Collecte une seule section (les planificateurs externes l'appellent à leur rythme)"""
+        started = time.perf_counter()
+        try:
+            section = self.collectors[name]()
+        except Exception as e:
+            logger.warning(f"⚠️ Reflexia collector '{name}' failed: {e}")
+            section = {"error": f"{name} collection failed: {e}"}
+        duration_ms = (time.perf_counter() - started) * 1000
+        # Collecte hors verrou (sections indépendantes), publication sous verrou
+        with self._refresh_lock:
+            self._durations_ms[name] = duration_ms
+            self._sections[name] = _freeze(section)
+            self._next_due[name] = time.monotonic() + self.intervals.get(name, 15.0)
+
+    def publish(self) -> MetricsSnapshot:
+        """Publie un snapshot à partir des dernières sections collectées"""
+        with self._refresh_lock:
+            for name in self.collectors:
+                if name not in self._sections:
+                    self.refresh_section(name)
+            self._snapshot = MetricsSnapshot(
+                timestamp=datetime.now(),
+                system=self._sections["system"],
+                containers=self._sections["containers"],
+                modules=self._sections["modules"],
+                logs=self._sections["logs"],
+                collection_time_ms=round(sum(self._durations_ms.values()), 2),
+            )
+            return self._snapshot
+
+    def peek(self) -> MetricsSnapshot | None:
+        """Dernier snapshot publié, sans jamais déclencher de collecte"""
+        return self._snapshot
+
+    def latest(self) -> MetricsSnapshot:
+        """Dernier snapshot publié (collecte synchrone unique si aucun n'existe)"""
+        snapshot = self._snapshot
+        if snapshot is None:
+            snapshot = self.refresh()
+        return snapshot
+
+    def _run(self) -> None:
+        tick = min(self.intervals.values())
+        while not self._stop_event.is_set():
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.error(f"❌ Reflexia sampler error: {e}")
+            self._stop_event.wait(tick)
+
+
+_sampler: MetricsSampler | None = None
+_sampler_lock = threading.Lock()
+
+
+def get_metrics_sampler(start: bool = True) -> MetricsSampler:
+    """Sampler partagé du processus (démarré au premier accès)"""
+    global _sampler
+    with _sampler_lock:
+        if _sampler is None:
+            _sampler = MetricsSampler()
+        if start:
+            _sampler.start()
+        return _sampler
+
+
 def read_metrics_enhanced() -> dict:
     """
     Collecte complète des métriques Reflexia Enhanced
@@ -159,58 +403,17 @@ def read_metrics_enhanced() -> dict:
     Returns:
         Dict avec toutes les métriques système et Arkalia
     """
-    timestamp = datetime.now()
-
-    metrics = {
-        "timestamp": timestamp.isoformat(),
-        "system": get_system_metrics(),
-        "containers": get_arkalia_containers_status(),
-        "modules": get_arkalia_modules_health(),
-        "logs": analyze_error_logs(),
-        "performance": {
-            "collection_time_ms": 0,  # Will be updated
-            "metrics_version": "enhanced_v2.6.0",
-        },
-    }
-
-    # Calculate collection time
-    end_time = datetime.now()
-    collection_time = (end_time - timestamp).total_seconds() * 1000
-    metrics["performance"]["collection_time_ms"] = round(collection_time, 2)
-
-    return metrics
+    return get_metrics_sampler().latest().to_enhanced()
 
 
 # Alias pour compatibilité avec l'ancien code
 def read_metrics() -> dict:
     """Interface compatible avec l'ancienne version"""
-    enhanced = read_metrics_enhanced()
-
-    # Retourner format simple pour compatibilité
-    return {
-        "cpu": enhanced["system"]["cpu_percent"],
-        "ram": enhanced["system"]["memory_percent"],
-        "latency": enhanced["performance"]["collection_time_ms"],
-        "containers": len(
-            [
-                c
-                for c in enhanced["containers"].values()
-                if isinstance(c, str) and c in ["healthy", "running"]
-            ]
-        ),
-        "modules_active": len(
-            [
-                m
-                for m in enhanced["modules"].values()
-                if isinstance(m, dict) and m.get("active", False)
-            ]
-        ),
-        "errors": enhanced["logs"]["recent_errors"],
-    }
+    return get_metrics_sampler().latest().to_simple()
 
 
 if __name__ == "__main__":
     # Test du module
     ark_logger.info("🧠 Reflexia Enhanced Metrics Test", extra={"module": "logic"})
     metrics = read_metrics_enhanced()
-    ark_logger.info(json.dumps(metrics, indent=2, extra={"module": "logic"}))
+    ark_logger.info(json.dumps(metrics, indent=2), extra={"module": "logic"})
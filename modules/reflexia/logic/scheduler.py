@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+# ⏱️ modules/reflexia/logic/scheduler.py
+"""
+Reflexia Scheduler - Boucle asyncio à cadence fixe
+
+Remplace le schéma collecte → analyse → sauvegarde → ``sleep`` dont la
+période réelle dérive de la durée de collecte :
+- Échéances calculées depuis l'instant de départ (pas de dérive cumulée)
+- Chaque collecteur tourne à sa propre cadence, dans un thread (I/O parallèles)
+- La persistance du tick précédent se chevauche avec la collecte suivante
+- Les ticks manqués (dépassement d'échéance) sont comptés puis sautés
+"""
+
+import asyncio
+import logging
+import time
+from collections.abc import AsyncIterator, Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import toml
+
+from .metrics_enhanced import MetricsSampler, MetricsSnapshot, get_metrics_sampler
+
+logger = logging.getLogger(__name__)
+
+SCHEDULER_CONFIG_PATH = Path("modules/reflexia/config/monitoring_config.toml")
+DEFAULT_TICK_SECONDS = 1.0
+DEFAULT_COLLECTOR_RATES: dict[str, float] = {
+    "system": 1.0,
+    "containers": 15.0,
+    "logs": 5.0,
+    "modules": 15.0,
+}
+
+
+def load_scheduler_config(path: Path = SCHEDULER_CONFIG_PATH) -> dict[str, Any]:
+    """Section ``[scheduler]`` de la config monitoring (valeurs par défaut sinon)"""
+    try:
+        section = toml.load(path).get("scheduler", {})
+    except (OSError, toml.TomlDecodeError):
+        section = {}
+    return {
+        "tick_seconds": float(section.get("tick_seconds", DEFAULT_TICK_SECONDS)),
+        "rates": {**DEFAULT_COLLECTOR_RATES, **section.get("rates", {})},
+    }
+
+
+@dataclass
+class ScheduleStats:
+    """Compteurs d'exécution d'une tâche planifiée"""
+
+    runs: int = 0
+    missed: int = 0
+    failed: int = 0
+    last_duration_ms: float = 0.0
+    max_lateness_ms: float = 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "runs": self.runs,
+            "missed": self.missed,
+            "failed": self.failed,
+            "last_duration_ms": round(self.last_duration_ms, 2),
+            "max_lateness_ms": round(self.max_lateness_ms, 2),
+        }
+
+
+async def fixed_rate(
+    interval: float, stats: ScheduleStats, stop: asyncio.Event
+) -> AsyncIterator[int]:
+    """
+    Produit un numéro de tick à chaque échéance ``start + n * interval``.
+
+    Si le traitement d'un tick dépasse une ou plusieurs échéances, celles-ci
+    sont comptées dans ``stats.missed`` et le rythme reprend sur la grille.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time()
+    tick = 0
+    while not stop.is_set():
+        stats.max_lateness_ms = max(stats.max_lateness_ms, (loop.time() - deadline) * 1000)
+        yield tick
+        tick += 1
+        deadline += interval
+        now = loop.time()
+        if now > deadline:
+            skipped = int((now - deadline) // interval) + 1
+            stats.missed += skipped
+            deadline += skipped * interval
+            tick += skipped
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=max(0.0, deadline - now))
+        except asyncio.TimeoutError:
+            pass
+
+
+@dataclass
+class TickResult:
+    """Résultat d'un tick d'analyse transmis au callback de persistance"""
+
+    tick: int
+    snapshot: MetricsSnapshot
+    metrics: dict[str, Any] = field(default_factory=dict)
+    status: str = "ok"
+
+
+class ReflexiaScheduler:
+    """
+    Planificateur asyncio de Reflexia
+
+    Args:
+        on_tick: analyse synchrone et rapide d'un snapshot → ``TickResult``
+        persist: sauvegarde (I/O) d'un ``TickResult``, exécutée dans un thread
+        tick_seconds: cadence des ticks d'analyse
+        collector_rates: cadence de chaque collecteur du sampler
+    """
+
+    def __init__(
+        self,
+        on_tick: Callable[[int, MetricsSnapshot], TickResult],
+        persist: Callable[[TickResult], Any] | None = None,
+        tick_seconds: float | None = None,
+        collector_rates: dict[str, float] | None = None,
+        sampler: MetricsSampler | None = None,
+    ) -> None:
+        config = load_scheduler_config()
+        self.tick_seconds = tick_seconds or config["tick_seconds"]
+        self.collector_rates = {**config["rates"], **(collector_rates or {})}
+        self.sampler = sampler or get_metrics_sampler(start=False)
+        self.on_tick = on_tick
+        self.persist = persist
+
+        self.tick_stats = ScheduleStats()
+        self.collector_stats = {name: ScheduleStats() for name in self.sampler.collectors}
+        self.persist_stats = ScheduleStats()
+        self._stop = asyncio.Event()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "ticks": self.tick_stats.to_dict(),
+            "persist": self.persist_stats.to_dict(),
+            "collectors": {name: s.to_dict() for name, s in self.collector_stats.items()},
+        }
+
+    async def _run_collector(self, name: str) -> None:
+        stats = self.collector_stats[name]
+        interval = self.collector_rates.get(name, self.tick_seconds)
+        async for _ in fixed_rate(interval, stats, self._stop):
+            started = time.perf_counter()
+            await asyncio.to_thread(self.sampler.refresh_section, name)
+            stats.runs += 1
+            stats.last_duration_ms = (time.perf_counter() - started) * 1000
+
+    async def _persist(self, result: TickResult) -> None:
+        started = time.perf_counter()
+        try:
+            await asyncio.to_thread(self.persist, result)
+        except Exception as e:
+            logger.error(f"❌ Reflexia persistence error (tick {result.tick}): {e}")
+        self.persist_stats.runs += 1
+        self.persist_stats.last_duration_ms = (time.perf_counter() - started) * 1000
+
+    async def run(self, max_ticks: int | None = None) -> dict[str, Any]:
+        """Exécute la boucle jusqu'à ``stop()`` ou ``max_ticks`` ticks traités"""
+        self._stop.clear()
+        # Première collecte complète, toutes sections en parallèle
+        await asyncio.gather(
+            *(asyncio.to_thread(self.sampler.refresh_section, n) for n in self.sampler.collectors)
+        )
+        collectors = [
+            asyncio.create_task(self._run_collector(name), name=f"reflexia-{name}")
+            for name in self.sampler.collectors
+        ]
+
+        pending_persist: asyncio.Task | None = None
+        try:
+            async for tick in fixed_rate(self.tick_seconds, self.tick_stats, self._stop):
+                started = time.perf_counter()
+                try:
+                    result = self.on_tick(tick, self.sampler.publish())
+                except Exception as e:
+                    # Un tick en échec ne doit pas arrêter la boucle
+                    logger.error(f"❌ Reflexia tick #{tick + 1} error: {e}")
+                    result = None
+                    self.tick_stats.failed += 1
+                self.tick_stats.runs += 1
+                self.tick_stats.last_duration_ms = (time.perf_counter() - started) * 1000
+
+                if self.persist is not None and result is not None:
+                    # Une seule persistance en vol : la suivante attend la précédente
+                    if pending_persist is not None and not pending_persist.done():
+                        self.persist_stats.missed += 1
+                        await pending_persist
+                    pending_persist = asyncio.create_task(self._persist(result))
+
+                if max_ticks is not None and self.tick_stats.runs >= max_ticks:
+                    break
+        finally:
+            self._stop.set()
+            if pending_persist is not None:
+                await pending_persist
+            for task in collectors:
+                task.cancel()
+            await asyncio.gather(*collectors, return_exceptions=True)
+
+        return self.stats()
@@ -1,22 +1,94 @@
 import json
-import os
+import threading
+from collections import deque
 from datetime import datetime
 from pathlib import Path
+from typing import Any
+
+import toml
+
+from modules.utils.helpers.io_safe import atomic_write
 
 SNAPSHOT_FILE = Path("modules/reflexia/state/reflexia_state.toml")
 
-# ✅ Crée le dossier si manquant
-os.makedirs(SNAPSHOT_FILE.parent, exist_ok=True)
+# Nombre de snapshots conservés dans l'anneau [[history]] du fichier
+HISTORY_SIZE = 20
 
 
-def save_snapshot(metrics: dict, status: str):
+class SnapshotWriter:
     """
-    Sauvegarde l'état réflexif dans un fichier .toml (contenu simulé en JSON).
+    Écrit l'état réflexif en TOML valide, de façon atomique et seulement s'il change.
+
+    Le fichier contient le dernier état (``timestamp``, ``status``,
+    ``[metrics]``) suivi d'un anneau borné ``[[history]]`` des derniers
+    snapshots, gardé en mémoire pour l'analyse de tendance sans relecture.
     """
-    snapshot = {
-        "timestamp": datetime.utcnow().isoformat(),
-        "metrics": metrics,
-        "status": status,
-    }
-    with open(SNAPSHOT_FILE, "w", encoding="utf-8") as f:
-        json.dump(snapshot, f, indent=2)
+
+    def __init__(self, path: Path, history_size: int = HISTORY_SIZE) -> None:
+        self.path = Path(path)
+        self.history: deque[dict[str, Any]] = deque(maxlen=max(1, history_size))
+        self._last_content: str | None = None
+        self._lock = threading.Lock()
+        self._restore()
+
+    def _restore(self) -> None:
+        # Reprise de l'anneau existant ; un ancien fichier JSON ou corrompu est ignoré
+        try:
+            data = toml.load(self.path)
+        except (OSError, toml.TomlDecodeError, TypeError):
+            return
+        self.history.extend(data.get("history", []))
+        if "metrics" in data and "status" in data:
+            self._last_content = self._content_key(data["metrics"], data["status"])
+
+    @staticmethod
+    def _content_key(metrics: dict, status: str) -> str:
+        return json.dumps({"metrics": metrics, "status": status}, sort_keys=True, default=str)
+
+    def save(self, metrics: dict, status: str) -> bool:
+        """
+        Sauvegarde le snapshot s'il diffère du précédent.
+
+        Returns:
+            bool: True si le fichier a été réécrit, False si contenu inchangé
+        """
+        with self._lock:
+            content = self._content_key(metrics, status)
+            if content == self._last_content:
+                return False
+
+            snapshot = {
+                "timestamp": datetime.utcnow().isoformat(),
+                "status": status,
+                "metrics": metrics,
+            }
+            self.history.append(snapshot)
+            document = {**snapshot, "history": list(self.history)}
+            atomic_write(self.path, toml.dumps(document))
+            self._last_content = content
+            return True
+
+
+_writers: dict[Path, SnapshotWriter] = {}
+_writers_lock = threading.Lock()
+
+
+def get_snapshot_writer(path: Path | None = None) -> SnapshotWriter:
+    """Writer partagé pour ``path`` (``SNAPSHOT_FILE`` par défaut)"""
+    path = Path(path or SNAPSHOT_FILE)
+    with _writers_lock:
+        if path not in _writers:
+            _writers[path] = SnapshotWriter(path)
+        return _writers[path]
+
+
+def save_snapshot(metrics: dict, status: str) -> bool:
+    """
+    Sauvegarde l'état réflexif dans un fichier .toml (écriture atomique, si changé).
+    """
+    return get_snapshot_writer().save(metrics, status)
+
+
+def get_snapshot_history(path: Path | None = None) -> list[dict[str, Any]]:
+    """Derniers snapshots écrits, du plus ancien au plus récent (lecture mémoire)"""
+    return list(get_snapshot_writer(path).history)
@@ -1,6 +1,6 @@
 # 🧠 modules/sandozia/analyzer/__init__.py
 # Analyzer pour Sandozia Intelligence Croisée
 
-from .behavior import BehaviorAnalyzer
+from .behavior import BehaviorAnalyzer, MetricRingBuffer
 
-__all__ = ["BehaviorAnalyzer"]
+__all__ = ["BehaviorAnalyzer", "MetricRingBuffer"]
@@ -23,12 +23,18 @@ import json
 import logging
 import statistics
 from collections import defaultdict, deque
+from collections.abc import Iterator, Mapping
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from typing import Any, Optional
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
 
+# Nombre minimal d'échantillons avant de disposer d'une baseline statistique
+BASELINE_MIN_SAMPLES = 30
+
 
 @dataclass
 class BehaviorPattern:
@@ -63,6 +69,201 @@ class BehaviorPattern:
         }
 
 
+# Les séries de métriques partagent deux matrices NumPy (valeurs et timestamps)
+# de forme (n_metrics, capacity) : chaque ligne est un buffer circulaire
+# indépendant, ce qui permet de calculer moyennes, z-scores et corrélations
+# de toutes les métriques en une seule passe vectorisée.
+
+
+class MetricSeries:
+    """Vue chronologique (lecture seule) sur une ligne du buffer"""
+
+    def __init__(self, buffer: "MetricRingBuffer", row: int) -> None:
+        self._buffer = buffer
+        self._row = row
+
+    @property
+    def values(self) -> np.ndarray:
+        """Valeurs de la série, de la plus ancienne à la plus récente"""
+        return self._buffer._ordered(self._buffer._values, self._row)
+
+    @property
+    def timestamps(self) -> np.ndarray:
+        """Timestamps POSIX de la série, du plus ancien au plus récent"""
+        return self._buffer._ordered(self._buffer._timestamps, self._row)
+
+    def __len__(self) -> int:
+        return int(self._buffer._counts[self._row])
+
+    def __getitem__(self, index: int) -> dict[str, Any]:
+        count = len(self)
+        if index < 0:
+            index += count
+        if not 0 <= index < count:
+            raise IndexError("MetricSeries index out of range")
+
+        buffer = self._buffer
+        pos = (buffer._heads[self._row] - count + index) % buffer.capacity
+        return {
+            "value": float(buffer._values[self._row, pos]),
+            "timestamp": datetime.fromtimestamp(buffer._timestamps[self._row, pos]),
+        }
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        for value, ts in zip(self.values, self.timestamps, strict=True):
+            yield {"value": float(value), "timestamp": datetime.fromtimestamp(ts)}
+
+
+class MetricRingBuffer(Mapping[str, MetricSeries]):
+    """
+    Buffer circulaire 2-D (métriques × temps)
+
+    Les lignes sont allouées à la volée lors du premier échantillon d'une
+    métrique ; la matrice double de taille quand elle est pleine.
+    """
+
+    def __init__(self, capacity: int = 1000, initial_rows: int = 16) -> None:
+        if capacity < 1:
+            raise ValueError("capacity must be >= 1")
+
+        self.capacity = capacity
+        self._index: dict[str, int] = {}
+        self._keys: list[str] = []
+
+        rows = max(1, initial_rows)
+        self._values = np.full((rows, capacity), np.nan)
+        self._timestamps = np.full((rows, capacity), np.nan)
+        self._heads = np.zeros(rows, dtype=np.int64)
+        self._counts = np.zeros(rows, dtype=np.int64)
+
+    # ------------------------------------------------------------------
+    # Mapping
+    # ------------------------------------------------------------------
+
+    def __getitem__(self, key: str) -> MetricSeries:
+        return MetricSeries(self, self._index[key])
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._keys)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._index
+
+    # ------------------------------------------------------------------
+    # Écriture
+    # ------------------------------------------------------------------
+
+    def append(self, key: str, value: float, timestamp: float) -> None:
+        """Ajoute un échantillon (timestamp POSIX) à la série ``key``"""
+        row = self._index.get(key)
+        if row is None:
+            row = self._allocate_row(key)
+
+        head = self._heads[row]
+        self._values[row, head] = value
+        self._timestamps[row, head] = timestamp
+        self._heads[row] = (head + 1) % self.capacity
+        if self._counts[row] < self.capacity:
+            self._counts[row] += 1
+
+    def _allocate_row(self, key: str) -> int:
+        row = len(self._keys)
+        if row >= self._values.shape[0]:
+            self._grow(self._values.shape[0] * 2)
+
+        self._index[key] = row
+        self._keys.append(key)
+        return row
+
+    def _grow(self, rows: int) -> None:
+        extra = rows - self._values.shape[0]
+        self._values = np.vstack([self._values, np.full((extra, self.capacity), np.nan)])
+        self._timestamps = np.vstack([self._timestamps, np.full((extra, self.capacity), np.nan)])
+        self._heads = np.concatenate([self._heads, np.zeros(extra, dtype=np.int64)])
+        self._counts = np.concatenate([self._counts, np.zeros(extra, dtype=np.int64)])
+
+    # ------------------------------------------------------------------
+    # Lecture vectorisée
+    # ------------------------------------------------------------------
+
+    @property
+    def keys_list(self) -> list[str]:
+        """Clés dans l'ordre des lignes des matrices"""
+        return list(self._keys)
+
+    @property
+    def counts(self) -> np.ndarray:
+        """Nombre d'échantillons valides par métrique"""
+        return self._counts[: len(self._keys)]
+
+    def matrices(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Retourne ``(values, timestamps, valid)`` pour toutes les métriques.
+
+        Les colonnes sont dans l'ordre physique du buffer (non chronologique) ;
+        ``valid`` masque les cases jamais écrites. Convient aux agrégats
+        insensibles à l'ordre (moyenne, écart-type, fenêtre temporelle).
+        """
+        n = len(self._keys)
+        counts = self._counts[:n]
+        valid = np.arange(self.capacity)[None, :] < counts[:, None]
+        # Une ligne pleine a toutes ses cases valides, une ligne partielle a
+        # été remplie depuis l'indice 0 : le masque ci-dessus couvre les deux.
+        return self._values[:n], self._timestamps[:n], valid
+
+    def window(self, size: int) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Retourne les ``size`` derniers échantillons de chaque métrique.
+
+        Résultat ``(values, timestamps)`` de forme ``(n_metrics, size)``,
+        chronologique et aligné à droite ; les cases manquantes valent NaN.
+        """
+        n = len(self._keys)
+        size = max(1, min(size, self.capacity))
+        offsets = np.arange(size)[None, :]
+        positions = (self._heads[:n, None] - size + offsets) % self.capacity
+        missing = offsets < (size - self._counts[:n, None])
+
+        values = np.take_along_axis(self._values[:n], positions, axis=1)
+        timestamps = np.take_along_axis(self._timestamps[:n], positions, axis=1)
+        values[missing] = np.nan
+        timestamps[missing] = np.nan
+        return values, timestamps
+
+    def correlation_matrix(self, size: int) -> tuple[list[str], np.ndarray]:
+        """
+        Matrice de corrélation de Pearson entre toutes les métriques.
+
+        Calculée sur les ``size`` derniers échantillons ; seules les métriques
+        ayant une fenêtre complète et une variance non nulle sont retenues.
+        """
+        values, _ = self.window(size)
+        full = self.counts >= values.shape[1]
+        if values.shape[1] > 1:
+            full[full] = values[full].std(axis=1) > 0
+        else:
+            full[:] = False
+
+        keys = [k for k, keep in zip(self._keys, full, strict=True) if keep]
+        if not keys:
+            return [], np.empty((0, 0))
+
+        selected = values[full]
+        centered = selected - selected.mean(axis=1, keepdims=True)
+        normalized = centered / np.linalg.norm(centered, axis=1, keepdims=True)
+        return keys, np.clip(normalized @ normalized.T, -1.0, 1.0)
+
+    def _ordered(self, matrix: np.ndarray, row: int) -> np.ndarray:
+        count = int(self._counts[row])
+        if count < self.capacity:
+            return matrix[row, :count].copy()
+        head = int(self._heads[row])
+        return np.concatenate([matrix[row, head:], matrix[row, :head]])
+
+
 class BehaviorAnalyzer:
     """
     Analyseur de comportements IA
@@ -89,7 +290,7 @@ class BehaviorAnalyzer:
         }
 
         self.pattern_history: list[BehaviorPattern] = []
-        self.metrics_buffer: dict[str, deque] = defaultdict(lambda: deque(maxlen=1000))
+        self.metrics_buffer = MetricRingBuffer(capacity=1000)
         self.decision_history: deque = deque(maxlen=500)
 
         # État statistique
@@ -109,11 +310,7 @@ class BehaviorAnalyzer:
         timestamp = timestamp or datetime.now()
 
         key = f"{module_name}.{metric_name}"
-        self.metrics_buffer[key].append({"value": value, "timestamp": timestamp})
-
-        # Mettre à jour les statistiques de base si suffisamment d'échantillons
-        if len(self.metrics_buffer[key]) >= 30:
-            self._update_baseline_stats(key)
+        self.metrics_buffer.append(key, float(value), timestamp.timestamp())
 
     def add_decision_event(self, module_name: str, decision_data: dict):
         decision_event = {
@@ -123,75 +320,98 @@ class BehaviorAnalyzer:
         }
         self.decision_history.append(decision_event)
 
-    def _update_baseline_stats(self, metric_key: str):
-        samples = self.metrics_buffer[metric_key]
-        values = [s["value"] for s in samples]
-
-        if len(values) >= 5:  # Minimum pour calculs statistiques
-            self.baseline_stats[metric_key] = {
-                "mean": statistics.mean(values),
-                "stdev": statistics.stdev(values) if len(values) > 1 else 0.0,
-                "median": statistics.median(values),
-                "min": min(values),
-                "max": max(values),
-                "sample_size": len(values),
-                "last_updated": datetime.now(),
-            }
+    def _refresh_baseline_stats(self) -> dict[str, np.ndarray]:
+        """Recalcule les baselines de toutes les métriques en une passe vectorisée"""
+        values, _, valid = self.metrics_buffer.matrices()
+        counts = self.metrics_buffer.counts
+        masked = np.where(valid, values, np.nan)
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = np.nansum(masked, axis=1) / counts
+            sq_dev = np.nansum((masked - mean[:, None]) ** 2, axis=1)
+            stdev = np.where(counts > 1, np.sqrt(sq_dev / (counts - 1)), 0.0)
+
+        eligible = counts >= BASELINE_MIN_SAMPLES
+        if eligible.any():
+            median = np.nanmedian(masked[eligible], axis=1)
+            minimum = np.nanmin(masked[eligible], axis=1)
+            maximum = np.nanmax(masked[eligible], axis=1)
+            now = datetime.now()
+            keys = self.metrics_buffer.keys_list
+            for i, row in enumerate(np.flatnonzero(eligible)):
+                self.baseline_stats[keys[row]] = {
+                    "mean": float(mean[row]),
+                    "stdev": float(stdev[row]),
+                    "median": float(median[i]),
+                    "min": float(minimum[i]),
+                    "max": float(maximum[i]),
+                    "sample_size": int(counts[row]),
+                    "last_updated": now,
+                }
+
+        return {"mean": mean, "stdev": stdev, "eligible": eligible}
 
     def detect_statistical_anomalies(self) -> list[BehaviorPattern]:
         patterns: list[Any] = []
+        if not self.metrics_buffer:
+            return patterns
+
         now = datetime.now()
         threshold = self.config["anomaly_threshold"]
+        baseline = self._refresh_baseline_stats()
+        values, timestamps, valid = self.metrics_buffer.matrices()
+
+        # Échantillons récents (1h) pour toutes les métriques à la fois
+        recent = valid & (timestamps > now.timestamp() - 3600)
+        recent_count = recent.sum(axis=1)
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            recent_mean = np.where(recent, values, 0.0).sum(axis=1) / recent_count
+            z_scores = np.abs(recent_mean - baseline["mean"]) / baseline["stdev"]
+
+        candidates = (
+            baseline["eligible"]
+            & (baseline["stdev"] > 0)
+            & (recent_count >= 3)
+            & (z_scores > threshold)
+        )
+        if not candidates.any():
+            return patterns
 
-        for metric_key, samples in self.metrics_buffer.items():
-            if len(samples) < 10:
-                continue
-
-            # Récupérer les statistiques de base
-            stats = self.baseline_stats.get(metric_key)
-            if not stats or stats["stdev"] == 0:
-                continue
-
-            # Analyser les échantillons récents
-            recent_samples = [
-                s for s in samples if (now - s["timestamp"]).total_seconds() < 3600
-            ]  # 1h
-
-            if len(recent_samples) >= 3:
-                recent_values = [s["value"] for s in recent_samples]
-                recent_mean = statistics.mean(recent_values)
-
-                # Calculer l'écart par rapport à la baseline
-                z_score = abs(recent_mean - stats["mean"]) / stats["stdev"]
-
-                if z_score > threshold:
-                    module_name = metric_key.split(".")[0]
-                    metric_name = ".".join(metric_key.split(".")[1:])
-
-                    severity = "high" if z_score > threshold * 1.5 else "medium"
-
-                    pattern = BehaviorPattern(
-                        pattern_type="statistical_anomaly",
-                        severity=severity,
-                        description=(
-                            f"Anomalie statistique détectée dans {metric_name} "
-                            f"(z-score: {z_score:.2f})"
-                        ),
-                        affected_modules=[module_name],
-                        confidence=min(0.95, z_score / (threshold * 2)),
-                        first_detected=recent_samples[0]["timestamp"],
-                        last_detected=recent_samples[-1]["timestamp"],
-                        occurrences=len(recent_samples),
-                        metadata={
-                            "metric_key": metric_key,
-                            "z_score": z_score,
-                            "recent_mean": recent_mean,
-                            "baseline_mean": stats["mean"],
-                            "baseline_stdev": stats["stdev"],
-                            "threshold": threshold,
-                        },
-                    )
-                    patterns.append(pattern)
+        first_seen = np.where(recent, timestamps, np.inf).min(axis=1)
+        last_seen = np.where(recent, timestamps, -np.inf).max(axis=1)
+        keys = self.metrics_buffer.keys_list
+
+        for row in np.flatnonzero(candidates):
+            metric_key = keys[row]
+            z_score = float(z_scores[row])
+            module_name = metric_key.split(".")[0]
+            metric_name = ".".join(metric_key.split(".")[1:])
+
+            severity = "high" if z_score > threshold * 1.5 else "medium"
+
+            pattern = BehaviorPattern(
+                pattern_type="statistical_anomaly",
+                severity=severity,
+                description=(
+                    f"Anomalie statistique détectée dans {metric_name} "
+                    f"(z-score: {z_score:.2f})"
+                ),
+                affected_modules=[module_name],
+                confidence=min(0.95, z_score / (threshold * 2)),
+                first_detected=datetime.fromtimestamp(first_seen[row]),
+                last_detected=datetime.fromtimestamp(last_seen[row]),
+                occurrences=int(recent_count[row]),
+                metadata={
+                    "metric_key": metric_key,
+                    "z_score": z_score,
+                    "recent_mean": float(recent_mean[row]),
+                    "baseline_mean": float(baseline["mean"][row]),
+                    "baseline_stdev": float(baseline["stdev"][row]),
+                    "threshold": threshold,
+                },
+            )
+            patterns.append(pattern)
 
         return patterns
 
@@ -214,18 +434,19 @@ class BehaviorAnalyzer:
                 if metric_key not in self.metrics_buffer:
                     continue
 
-                samples = list(self.metrics_buffer[metric_key])
-                if len(samples) < 20:
+                series = self.metrics_buffer[metric_key]
+                if len(series) < 20:
                     continue
 
                 # Comparer première moitié vs deuxième moitié
-                mid = len(samples) // 2
-                first_half = [s["value"] for s in samples[:mid]]
-                second_half = [s["value"] for s in samples[mid:]]
+                values = series.values
+                mid = len(values) // 2
+                first_half = values[:mid]
+                second_half = values[mid:]
 
                 if len(first_half) >= 5 and len(second_half) >= 5:
-                    first_mean = statistics.mean(first_half)
-                    second_mean = statistics.mean(second_half)
+                    first_mean = float(first_half.mean())
+                    second_mean = float(second_half.mean())
 
                     # Pour métriques où moins = mieux (temps de réponse)
                     regression_metrics = ["response_time", "processing_time"]
@@ -251,8 +472,8 @@ class BehaviorAnalyzer:
                                 ),
                                 affected_modules=[module_name],
                                 confidence=min(0.9, abs(relative_change) * 2),
-                                first_detected=samples[mid]["timestamp"],
-                                last_detected=samples[-1]["timestamp"],
+                                first_detected=series[mid]["timestamp"],
+                                last_detected=series[-1]["timestamp"],
                                 occurrences=len(second_half),
                                 metadata={
                                     "metric_name": metric_name,
@@ -349,12 +570,17 @@ class BehaviorAnalyzer:
 
         # Analyser les corrélations de confiance entre modules
         confidence_metrics: dict[str, Any] = {}
-        for metric_key in self.metrics_buffer:
-            if "confidence" in metric_key.lower():
-                module_name = metric_key.split(".")[0]
-                recent_samples = [s["value"] for s in list(self.metrics_buffer[metric_key])[-10:]]
-                if recent_samples:
-                    confidence_metrics[module_name] = statistics.mean(recent_samples)
+        keys = self.metrics_buffer.keys_list
+        rows = [i for i, key in enumerate(keys) if "confidence" in key.lower()]
+        if rows:
+            # Moyenne des 10 derniers échantillons de toutes les métriques en une passe
+            recent_values, _ = self.metrics_buffer.window(10)
+            recent_counts = np.minimum(self.metrics_buffer.counts, recent_values.shape[1])
+            with np.errstate(invalid="ignore", divide="ignore"):
+                recent_means = np.nansum(recent_values, axis=1) / recent_counts
+            for row in rows:
+                if recent_counts[row]:
+                    confidence_metrics[keys[row].split(".")[0]] = float(recent_means[row])
 
         if len(confidence_metrics) >= 2:
             modules = list(confidence_metrics.keys())
@@ -442,24 +668,39 @@ class BehaviorAnalyzer:
         logger.info(f"✅ Behavior analysis complete - Health score: {health_score:.3f}")
         return summary
 
+    def correlation_matrix(self, window: int = 100) -> dict[str, Any]:
+        """Matrice de corrélation croisée entre toutes les métriques (fenêtre glissante)"""
+        keys, matrix = self.metrics_buffer.correlation_matrix(window)
+        return {"metrics": keys, "window": window, "matrix": matrix.tolist()}
+
     def get_pattern_history(self, limit: int | None = None) -> list[dict]:
         patterns = self.pattern_history[-limit:] if limit else self.pattern_history
         return [p.to_dict() for p in patterns]
 
     def get_metrics_summary(self) -> dict[str, Any]:
         summary: dict[str, Any] = {}
-
-        for metric_key, samples in self.metrics_buffer.items():
-            if samples:
-                values = [s["value"] for s in samples]
-                summary[metric_key] = {
-                    "sample_count": len(values),
-                    "latest_value": values[-1],
-                    "mean": statistics.mean(values),
-                    "min": min(values),
-                    "max": max(values),
-                    "last_updated": samples[-1]["timestamp"].isoformat(),
-                }
+        if not self.metrics_buffer:
+            return summary
+
+        values, timestamps, valid = self.metrics_buffer.matrices()
+        counts = self.metrics_buffer.counts
+        latest_values, latest_timestamps = self.metrics_buffer.window(1)
+        masked = np.where(valid, values, np.nan)
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            means = np.nansum(masked, axis=1) / counts
+        minimums = np.nanmin(masked, axis=1)
+        maximums = np.nanmax(masked, axis=1)
+
+        for row, metric_key in enumerate(self.metrics_buffer.keys_list):
+            summary[metric_key] = {
+                "sample_count": int(counts[row]),
+                "latest_value": float(latest_values[row, 0]),
+                "mean": float(means[row]),
+                "min": float(minimums[row]),
+                "max": float(maximums[row]),
+                "last_updated": datetime.fromtimestamp(latest_timestamps[row, 0]).isoformat(),
+            }
 
         return summary
 
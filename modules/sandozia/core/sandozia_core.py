@@ -16,6 +16,7 @@ from core.ark_logger import ark_logger
 import asyncio
 import json
 import logging
+from collections.abc import Awaitable, Callable
 from dataclasses import asdict, dataclass, field
 from datetime import datetime
 from pathlib import Path
@@ -30,9 +31,11 @@ from fastapi.responses import JSONResponse, PlainTextResponse
 from prometheus_client import CONTENT_TYPE_LATEST, Gauge, generate_latest
 
 # Imports Arkalia existants (functions disponibles)
+from ...monitoring.heartbeat_registry import publish_heartbeat
 from ...reflexia.core import get_metrics as reflexia_get_metrics
 from ...reflexia.core import launch_reflexia_check
 from ...zeroia.reason_loop import load_context, load_reflexia_state
+from .snapshot_journal import SnapshotJournal
 
 logger = logging.getLogger(__name__)
 
@@ -157,6 +160,19 @@ class SandoziaCore:
         self.snapshots_counter = 0  # Compteur simple pour le suivi
         self.active_correlations: dict[str, Any] = {}
 
+        # Journal compressé keyframes + deltas des snapshots persistés
+        journal_config = self.config.get("snapshot_journal", {})
+        self.snapshot_journal = SnapshotJournal(
+            self.state_dir / "snapshot_journal",
+            keyframe_interval=journal_config.get("keyframe_interval", 100),
+            max_segments=journal_config.get("max_segments", 50),
+        )
+
+        # Dernier état collecté avec succès par module (repli en cas de timeout)
+        self._last_module_states: dict[str, dict[str, Any]] = {}
+        # Collecte en cours par module : au plus un thread par collecteur
+        self._collector_futures: dict[str, asyncio.Future] = {}
+
         # Intégration modules IA existants (fonctions directes)
         self.reflexia_available = True
         self.zeroia_available = True
@@ -174,6 +190,9 @@ class SandoziaCore:
                 "coherence_threshold": 0.85,
                 "anomaly_threshold": 0.15,
                 "max_history_size": 1000,
+                "collector_timeout_seconds": 5.0,
+                # Timeout propre à un module (ex. {"reflexia": 2.0})
+                "collector_timeouts": {},
             },
             "modules": {
                 "reflexia_enabled": True,
@@ -184,6 +203,10 @@ class SandoziaCore:
                 "coherence_alert_threshold": 0.70,
                 "behavioral_alert_enabled": True,
             },
+            "snapshot_journal": {
+                "keyframe_interval": 100,
+                "max_segments": 50,
+            },
         }
 
         if self.config_path.exists():
@@ -235,37 +258,21 @@ class SandoziaCore:
     async def collect_intelligence_snapshot(self) -> IntelligenceSnapshot:
         """Collecte un snapshot complet de l'état d'intelligence"""
 
-        # État Reflexia
-        reflexia_state: dict[str, Any] = {}
+        # États Reflexia et ZeroIA collectés en parallèle (I/O synchrones déportées)
+        collectors: dict[str, Awaitable[dict[str, Any]]] = {}
         if self.reflexia_available:
-            try:
-                # Utiliser les fonctions disponibles
-                reflexia_check = launch_reflexia_check()
-                reflexia_state = {
-                    "active": True,
-                    "last_reflection": datetime.now().isoformat(),
-                    "status": reflexia_check.get("status", "unknown"),
-                    "metrics": reflexia_check.get("metrics", {}),
-                    "confidence_level": 0.85,  # Calculé depuis les métriques
-                }
-            except Exception as e:
-                logger.warning(f"⚠️ Reflexia state collection failed: {e}")
-                reflexia_state = {"active": False}
-
-        # État ZeroIA
-        zeroia_state: dict[str, Any] = {}
+            collectors["reflexia"] = self._collect_module_state(
+                "reflexia", self._collect_reflexia_state, {"active": False}
+            )
         if self.zeroia_available:
-            try:
-                # Charger l'état ZeroIA existant
-                zeroia_state = load_reflexia_state()
-                zeroia_state["active"] = True
+            collectors["zeroia"] = self._collect_module_state(
+                "zeroia", self._collect_zeroia_state, {"active": False, "last_check": None}
+            )
+        results = await asyncio.gather(*collectors.values())
+        states = dict(zip(collectors, results, strict=True))
 
-                # Compléter avec contexte global
-                context = load_context()
-                zeroia_state["context"] = context
-            except Exception as e:
-                logger.warning(f"⚠️ ZeroIA state collection failed: {e}")
-                zeroia_state = {"active": False, "last_check": None}
+        reflexia_state: dict[str, Any] = states.get("reflexia", {})
+        zeroia_state: dict[str, Any] = states.get("zeroia", {})
 
         # État AssistantIA (placeholder pour l'instant)
         assistant_state = {
@@ -339,6 +346,80 @@ class SandoziaCore:
 
         return snapshot
 
+    def _collect_reflexia_state(self) -> dict[str, Any]:
+        """Collecte synchrone de l'état Reflexia (exécutée dans un thread)"""
+        reflexia_check = launch_reflexia_check()
+        return {
+            "active": True,
+            "last_reflection": datetime.now().isoformat(),
+            "status": reflexia_check.get("status", "unknown"),
+            "metrics": reflexia_check.get("metrics", {}),
+            "confidence_level": 0.85,  # Calculé depuis les métriques
+        }
+
+    def _collect_zeroia_state(self) -> dict[str, Any]:
+        """Collecte synchrone de l'état ZeroIA (exécutée dans un thread)"""
+        # Charger l'état ZeroIA existant
+        zeroia_state = load_reflexia_state()
+        zeroia_state["active"] = True
+
+        # Compléter avec contexte global
+        zeroia_state["context"] = load_context()
+        return zeroia_state
+
+    async def _collect_module_state(
+        self,
+        module_name: str,
+        collector: Callable[[], dict[str, Any]],
+        failure_state: dict[str, Any],
+    ) -> dict[str, Any]:
+        """
+        Exécute un collecteur hors de la boucle d'événements avec timeout.
+
+        En cas de timeout, le dernier état connu est renvoyé marqué ``stale``
+        pour que la boucle de monitoring ne soit pas dictée par le module le
+        plus lent. La collecte dépassée continue dans son thread et met à jour
+        le dernier état à sa fin ; tant qu'elle n'est pas terminée, les ticks
+        suivants ne relancent pas le collecteur et servent directement l'état
+        ``stale``. Une erreur de collecte reste signalée comme module inactif.
+        """
+        monitoring = self.config["monitoring"]
+        timeout = monitoring.get("collector_timeouts", {}).get(
+            module_name, monitoring.get("collector_timeout_seconds", 5.0)
+        )
+
+        pending = self._collector_futures.get(module_name)
+        if pending is not None and not pending.done():
+            logger.warning(f"⚠️ {module_name} state collection still running, serving last state")
+            return self._stale_module_state(module_name, failure_state)
+
+        future = asyncio.ensure_future(asyncio.to_thread(collector))
+        future.add_done_callback(lambda done: self._store_module_state(module_name, done))
+        self._collector_futures[module_name] = future
+        try:
+            # shield : le timeout n'annule pas la collecte, qui finit en arrière-plan
+            return await asyncio.wait_for(asyncio.shield(future), timeout=timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"⚠️ {module_name} state collection timed out after {timeout}s")
+            return self._stale_module_state(module_name, failure_state)
+        except Exception as e:
+            logger.warning(f"⚠️ {module_name} state collection failed: {e}")
+            return dict(failure_state)
+
+    def _store_module_state(self, module_name: str, future: asyncio.Future):
+        """Mémorise l'état d'une collecte terminée (y compris après un timeout)"""
+        if future.cancelled() or future.exception() is not None:
+            return
+        self._last_module_states[module_name] = future.result()
+
+    def _stale_module_state(
+        self, module_name: str, failure_state: dict[str, Any]
+    ) -> dict[str, Any]:
+        last_state = self._last_module_states.get(module_name)
+        if last_state is None:
+            return dict(failure_state)
+        return {**last_state, "stale": True}
+
     async def _analyze_coherence(
         self, reflexia_state: dict, zeroia_state: dict, assistant_state: dict
     ) -> dict:
@@ -449,6 +530,7 @@ class SandoziaCore:
             except asyncio.CancelledError:
                 pass
 
+        self.snapshot_journal.seal()
         logger.info("🛑 Sandozia monitoring stopped")
 
     async def _monitoring_loop(self):
@@ -493,12 +575,16 @@ class SandoziaCore:
 
     async def _save_state(self, snapshot: IntelligenceSnapshot, metrics: SandoziaMetrics):
         """Sauvegarde l'état et métriques"""
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-
-        # Sauvegarder snapshot
-        snapshot_file = self.state_dir / f"intelligence_snapshot_{timestamp}.json"
-        with open(snapshot_file, "w") as f:
-            json.dump(snapshot.to_dict(), f, indent=2)
+        # Sauvegarder snapshot (keyframe ou delta compressé)
+        self.snapshot_journal.append(snapshot.to_dict(), snapshot.timestamp)
+        publish_heartbeat(
+            "sandozia",
+            "active",
+            {
+                "snapshots_count": self.snapshots_counter,
+                "last_snapshot": snapshot.timestamp.isoformat(),
+            },
+        )
 
         # Sauvegarder métriques
         metrics_file = self.state_dir / "latest_metrics.json"
@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+# 🗃️ modules/sandozia/core/snapshot_journal.py
+# SnapshotJournal - Persistance compacte des snapshots d'intelligence
+
+"""
+SnapshotJournal - Journal delta des snapshots Sandozia
+
+Remplace l'écriture d'un fichier JSON complet par cycle de monitoring :
+- Keyframe complète périodique (début de chaque segment)
+- Deltas JSON-patch (RFC 6902, sous-ensemble add/remove/replace) entre
+  snapshots consécutifs
+- Segment actif en JSONL brut (un ajout de ligne par cycle), compressé en
+  gzip d'un bloc lorsqu'il est scellé à la keyframe suivante
+- Rétention bornée en nombre de segments
+- Reconstruction de n'importe quel snapshot par timestamp
+"""
+
+import copy
+import gzip
+import heapq
+import json
+import logging
+from collections.abc import Iterator
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+SEGMENT_PREFIX = "segment_"
+ACTIVE_SUFFIX = ".jsonl"
+SEALED_SUFFIX = ".jsonl.gz"
+
+
+def _escape_pointer_token(token: str) -> str:
+    return token.replace("~", "~0").replace("/", "~1")
+
+
+def _unescape_pointer_token(token: str) -> str:
+    return token.replace("~1", "/").replace("~0", "~")
+
+
+def make_json_patch(old: Any, new: Any, path: str = "") -> list[dict[str, Any]]:
+    """
+    Calcule le patch JSON transformant ``old`` en ``new``.
+
+    Les dicts sont comparés récursivement ; toute autre valeur (listes
+    comprises) est remplacée en bloc lorsqu'elle diffère.
+    """
+    if isinstance(old, dict) and isinstance(new, dict):
+        ops: list[dict[str, Any]] = []
+        for key in old:
+            if key not in new:
+                ops.append({"op": "remove", "path": f"{path}/{_escape_pointer_token(key)}"})
+        for key, value in new.items():
+            child = f"{path}/{_escape_pointer_token(key)}"
+            if key not in old:
+                ops.append({"op": "add", "path": child, "value": value})
+            else:
+                ops.extend(make_json_patch(old[key], value, child))
+        return ops
+
+    if old == new and type(old) is type(new):
+        return []
+    return [{"op": "replace", "path": path, "value": new}]
+
+
+def apply_json_patch(doc: Any, patch: list[dict[str, Any]]) -> Any:
+    """Applique un patch produit par :func:`make_json_patch` (retourne une copie)"""
+    result = copy.deepcopy(doc)
+    for op in patch:
+        path = op["path"]
+        if path == "":
+            result = copy.deepcopy(op["value"])
+            continue
+
+        tokens = [_unescape_pointer_token(t) for t in path.split("/")[1:]]
+        parent = result
+        for token in tokens[:-1]:
+            parent = parent[token]
+
+        if op["op"] == "remove":
+            del parent[tokens[-1]]
+        elif op["op"] in ("add", "replace"):
+            parent[tokens[-1]] = copy.deepcopy(op["value"])
+        else:
+            raise ValueError(f"Unsupported JSON patch operation: {op['op']}")
+    return result
+
+
+class SnapshotJournal:
+    """
+    Journal de snapshots à keyframes + deltas compressés
+
+    Chaque segment commence par une keyframe complète suivie d'au plus
+    ``keyframe_interval - 1`` deltas. Un nouveau segment est ouvert à chaque
+    démarrage du processus et dès que l'intervalle de keyframe est atteint ;
+    le segment précédent de l'instance est alors scellé (compressé).
+
+    Plusieurs instances peuvent partager un répertoire (API et boucle de
+    monitoring) : chacune ne scelle que son propre segment, les noms de
+    segments sont réservés en création exclusive et un segment disparu
+    (rétention d'une autre instance) est remplacé par un nouveau segment
+    commençant par une keyframe.
+    """
+
+    def __init__(
+        self,
+        journal_dir: Path,
+        keyframe_interval: int = 100,
+        max_segments: int = 50,
+    ) -> None:
+        self.journal_dir = Path(journal_dir)
+        self.journal_dir.mkdir(parents=True, exist_ok=True)
+        self.keyframe_interval = max(1, keyframe_interval)
+        self.max_segments = max(1, max_segments)
+
+        self._segment_path: Path | None = None
+        self._records_in_segment = 0
+        self._last_doc: dict[str, Any] | None = None
+
+    # ------------------------------------------------------------------
+    # Écriture
+    # ------------------------------------------------------------------
+
+    def append(self, snapshot: dict[str, Any], timestamp: datetime | None = None) -> str:
+        """
+        Ajoute un snapshot au journal.
+
+        Returns:
+            str: ``"keyframe"`` ou ``"delta"`` selon l'enregistrement écrit
+        """
+        timestamp = timestamp or datetime.now()
+        # Normalisation JSON (tuples, datetimes sérialisés...) pour des deltas stables
+        doc = json.loads(json.dumps(snapshot, default=str))
+
+        if (
+            self._last_doc is None
+            or self._records_in_segment >= self.keyframe_interval
+            or self._segment_path is None
+            or not self._segment_path.exists()
+        ):
+            self._open_segment(timestamp)
+            record = {"t": timestamp.isoformat(), "k": "keyframe", "d": doc}
+        else:
+            patch = make_json_patch(self._last_doc, doc)
+            record = {"t": timestamp.isoformat(), "k": "delta", "d": patch}
+
+        assert self._segment_path is not None
+        line = json.dumps(record, separators=(",", ":")) + "\n"
+        with open(self._segment_path, "a", encoding="utf-8") as f:
+            f.write(line)
+
+        self._records_in_segment += 1
+        self._last_doc = doc
+        return record["k"]
+
+    def seal(self) -> None:
+        """Compresse le segment actif de cette instance (appelé à l'arrêt du monitoring)"""
+        segment = self._segment_path
+        self._segment_path = None
+        self._last_doc = None
+        if segment is None or not segment.exists():
+            return
+
+        sealed = segment.with_name(segment.name + ".gz")
+        try:
+            # Création exclusive : un segment scellé existant n'est jamais écrasé
+            with open(segment, "rb") as src, open(sealed, "xb") as raw:
+                with gzip.GzipFile(fileobj=raw, mode="wb") as dst:
+                    dst.write(src.read())
+            segment.unlink()
+        except FileExistsError:
+            logger.warning(f"⚠️ Sealed journal segment {sealed.name} exists, kept uncompressed")
+        except OSError as e:
+            logger.warning(f"⚠️ Cannot seal journal segment {segment}: {e}")
+
+    def _open_segment(self, timestamp: datetime) -> None:
+        self.seal()
+        self._segment_path = self._reserve_segment(timestamp.strftime("%Y%m%d_%H%M%S_%f"))
+        self._records_in_segment = 0
+        self._enforce_retention()
+
+    def _reserve_segment(self, stamp: str) -> Path:
+        """Crée un segment vide au nom libre (aucun segment actif ou scellé homonyme)"""
+        attempt = 0
+        while True:
+            stem = f"{SEGMENT_PREFIX}{stamp}" + (f".{attempt}" if attempt else "")
+            path = self.journal_dir / f"{stem}{ACTIVE_SUFFIX}"
+            attempt += 1
+            if path.with_name(path.name + ".gz").exists():
+                continue
+            try:
+                path.touch(exist_ok=False)
+            except FileExistsError:
+                continue
+            return path
+
+    def _enforce_retention(self) -> None:
+        segments = [s for s in self.segments() if s != self._segment_path]
+        excess = len(segments) - (self.max_segments - 1)
+        for segment in segments[: max(0, excess)]:
+            try:
+                segment.unlink()
+            except OSError as e:
+                logger.warning(f"⚠️ Cannot remove journal segment {segment}: {e}")
+
+    # ------------------------------------------------------------------
+    # Lecture
+    # ------------------------------------------------------------------
+
+    def segments(self) -> list[Path]:
+        """Segments du journal, du plus ancien au plus récent"""
+        segments = [
+            path
+            for path in self.journal_dir.glob(f"{SEGMENT_PREFIX}*")
+            if path.name.endswith((ACTIVE_SUFFIX, SEALED_SUFFIX))
+        ]
+        return sorted(segments, key=self._segment_order)
+
+    def iter_snapshots(self) -> Iterator[tuple[datetime, dict[str, Any]]]:
+        """Rejoue tout le journal et produit ``(timestamp, snapshot)`` dans l'ordre"""
+        # Fusion par horodatage : des segments d'instances concurrentes peuvent se chevaucher
+        yield from heapq.merge(
+            *(self._replay_segment(segment) for segment in self.segments()),
+            key=lambda item: item[0],
+        )
+
+    def load(self, timestamp: datetime | str | None = None) -> dict[str, Any] | None:
+        """
+        Reconstruit le snapshot en vigueur à ``timestamp``.
+
+        Renvoie le dernier snapshot dont l'horodatage est ``<= timestamp``
+        (le plus récent si ``timestamp`` est None), ou None s'il n'en existe pas.
+        """
+        if isinstance(timestamp, str):
+            timestamp = datetime.fromisoformat(timestamp)
+
+        # Le dernier segment commençant avant la cible suffit, à ceci près que les
+        # segments encore actifs d'autres instances peuvent le chevaucher
+        candidates = self.segments()
+        if timestamp is not None:
+            candidates = [s for s in candidates if self._segment_start(s) <= timestamp]
+        best: tuple[datetime, dict[str, Any]] | None = None
+        for segment in reversed(candidates):
+            if best is not None and not segment.name.endswith(ACTIVE_SUFFIX):
+                continue
+            for ts, doc in self._replay_segment(segment):
+                if timestamp is not None and ts > timestamp:
+                    break
+                if best is None or ts >= best[0]:
+                    best = (ts, doc)
+        return best[1] if best is not None else None
+
+    def latest(self) -> dict[str, Any] | None:
+        """Dernier snapshot écrit (servi depuis la mémoire quand c'est possible)"""
+        if self._last_doc is not None:
+            return copy.deepcopy(self._last_doc)
+        return self.load()
+
+    def _segment_start(self, segment: Path) -> datetime:
+        stamp = segment.name[len(SEGMENT_PREFIX) :].split(".", 1)[0]
+        return datetime.strptime(stamp, "%Y%m%d_%H%M%S_%f")
+
+    def _segment_order(self, segment: Path) -> tuple[datetime, int]:
+        # Segments de même horodatage : départagés par le compteur de réservation
+        parts = segment.name[len(SEGMENT_PREFIX) :].split(".")
+        return self._segment_start(segment), int(parts[1]) if parts[1].isdigit() else 0
+
+    def _replay_segment(self, segment: Path) -> Iterator[tuple[datetime, dict[str, Any]]]:
+        doc: dict[str, Any] | None = None
+        try:
+            opener = gzip.open if segment.name.endswith(SEALED_SUFFIX) else open
+            with opener(segment, "rt", encoding="utf-8") as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    record = json.loads(line)
+                    if record["k"] == "keyframe":
+                        doc = record["d"]
+                    elif doc is not None:
+                        doc = apply_json_patch(doc, record["d"])
+                    else:
+                        continue
+                    yield datetime.fromisoformat(record["t"]), doc
+        except (OSError, EOFError, json.JSONDecodeError) as e:
+            # Segment tronqué (arrêt brutal) : les enregistrements lus restent valides
+            logger.warning(f"⚠️ Truncated journal segment {segment.name}: {e}")
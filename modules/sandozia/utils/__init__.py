@@ -1,6 +1,6 @@
 # 🧠 modules/sandozia/utils/__init__.py
 # Utils pour Sandozia Intelligence Croisée
 
-from .metrics import SandoziaMetrics
+from .metrics import PearsonAccumulator, SandoziaMetrics
 
-__all__ = ["SandoziaMetrics"]
+__all__ = ["PearsonAccumulator", "SandoziaMetrics"]
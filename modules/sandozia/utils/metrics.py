@@ -12,18 +12,18 @@ Collecte et traite les métriques d'intelligence croisée :
 - Export Grafana
 """
 
-<<<<<<< HEAD
-from core.ark_logger import ark_logger
-=======
+import bisect
 import json
->>>>>>> dev-migration
 import logging
 import statistics
 from collections import defaultdict
+from collections.abc import Iterator
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from typing import Any, Optional
 
+from core.ark_logger import ark_logger
+
 logger = logging.getLogger(__name__)
 
 
@@ -46,6 +46,96 @@ class MetricPoint:
         }
 
 
+class MetricSeries:
+    """
+    Série de points ordonnés dans le temps
+
+    Liste avec un indice de début mobile : l'expiration avance l'indice et la
+    liste n'est compactée que lorsque la moitié des points a expiré (O(1)
+    amorti). Les fenêtres temporelles sont localisées par recherche binaire
+    sur la liste, en O(log n).
+    """
+
+    __slots__ = ("_points", "_start")
+
+    def __init__(self) -> None:
+        self._points: list[MetricPoint] = []
+        self._start = 0
+
+    def append(self, point: MetricPoint) -> None:
+        self._points.append(point)
+
+    def _index_after(self, cutoff: datetime) -> int:
+        """Indice du premier point strictement postérieur à ``cutoff``"""
+        return bisect.bisect_right(
+            self._points, cutoff, lo=self._start, key=lambda point: point.timestamp
+        )
+
+    def expire(self, cutoff: datetime) -> None:
+        """Oublie les points antérieurs ou égaux à ``cutoff``"""
+        self._start = self._index_after(cutoff)
+        if self._start * 2 >= len(self._points):
+            del self._points[: self._start]
+            self._start = 0
+
+    def since(self, cutoff: datetime) -> list[MetricPoint]:
+        """Points strictement postérieurs à ``cutoff`` (copie de la fenêtre seule)"""
+        return self._points[self._index_after(cutoff) :]
+
+    def __len__(self) -> int:
+        return len(self._points) - self._start
+
+    def __iter__(self) -> Iterator[MetricPoint]:
+        for index in range(self._start, len(self._points)):
+            yield self._points[index]
+
+    def __getitem__(self, index: int) -> MetricPoint:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("MetricSeries index out of range")
+        return self._points[self._start + index]
+
+
+class PearsonAccumulator:
+    """
+    Accumulateur de corrélation de Pearson en flux (une seule passe)
+
+    Met à jour moyennes et co-moments de façon incrémentale (Welford),
+    numériquement stable et sans conserver les valeurs.
+    """
+
+    __slots__ = ("count", "mean_x", "mean_y", "m2_x", "m2_y", "co_moment")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.mean_x = 0.0
+        self.mean_y = 0.0
+        self.m2_x = 0.0
+        self.m2_y = 0.0
+        self.co_moment = 0.0
+
+    def update(self, x: float, y: float) -> None:
+        """Ajoute une paire d'observations"""
+        self.count += 1
+        dx = x - self.mean_x
+        dy = y - self.mean_y
+        self.mean_x += dx / self.count
+        self.mean_y += dy / self.count
+        self.m2_x += dx * (x - self.mean_x)
+        self.m2_y += dy * (y - self.mean_y)
+        self.co_moment += dx * (y - self.mean_y)
+
+    def correlation(self) -> float | None:
+        """Coefficient de Pearson courant (0.0 si variance nulle)"""
+        if self.count < 2:
+            return None
+        denominator = (self.m2_x * self.m2_y) ** 0.5
+        if denominator == 0:
+            return 0.0
+        return self.co_moment / denominator
+
+
 class SandoziaMetrics:
     """
     Collecteur et processeur de métriques Sandozia
@@ -64,7 +154,8 @@ class SandoziaMetrics:
         Cette fonction fait partie du système Arkalia Luna Pro.
         """
         self.retention_hours = retention_hours
-        self.metrics_store: dict[str, list[MetricPoint]] = defaultdict(list)
+        # Séries ordonnées dans le temps : expiration en O(1) amorti, fenêtres en O(log n)
+        self.metrics_store: dict[str, MetricSeries] = defaultdict(MetricSeries)
         self.correlations_cache: dict[str, float] = {}
         logger.info("📊 SandoziaMetrics initialized")
 
@@ -78,18 +169,19 @@ class SandoziaMetrics:
 
     def _cleanup_old_metrics(self, metric_name: str):
         cutoff = datetime.now() - timedelta(hours=self.retention_hours)
-        self.metrics_store[metric_name] = [
-            point for point in self.metrics_store[metric_name] if point.timestamp > cutoff
-        ]
+        self.metrics_store[metric_name].expire(cutoff)
+
+    def _window_points(self, name: str, time_window_minutes: int | None) -> list[MetricPoint]:
+        points = self.metrics_store[name]
+        if not time_window_minutes:
+            return list(points)
+        return points.since(datetime.now() - timedelta(minutes=time_window_minutes))
 
     def get_metric_values(self, name: str, time_window_minutes: int | None = None) -> list[float]:
         if name not in self.metrics_store:
             return []
-        points = self.metrics_store[name]
-        if time_window_minutes:
-            cutoff = datetime.now() - timedelta(minutes=time_window_minutes)
-            points = [p for p in points if p.timestamp > cutoff]
-        return [p.value for p in points]
+        self._cleanup_old_metrics(name)
+        return [p.value for p in self._window_points(name, time_window_minutes)]
 
     def calculate_correlation(
         self, metric1: str, metric2: str, time_window_minutes: int = 60
@@ -100,17 +192,12 @@ class SandoziaMetrics:
         if len(values1) < 3 or len(values2) < 3 or len(values1) != len(values2):
             return None
         try:
-            mean1 = statistics.mean(values1)
-            mean2 = statistics.mean(values2)
-            numerator = sum(
-                (x - mean1) * (y - mean2) for x, y in zip(values1, values2, strict=False)
-            )
-            sum_sq1 = sum((x - mean1) ** 2 for x in values1)
-            sum_sq2 = sum((y - mean2) ** 2 for y in values2)
-            denominator = (sum_sq1 * sum_sq2) ** 0.5
-            if denominator == 0:
-                return 0.0
-            correlation = numerator / denominator
+            accumulator = PearsonAccumulator()
+            for x, y in zip(values1, values2, strict=True):
+                accumulator.update(x, y)
+            correlation = accumulator.correlation()
+            if correlation is None:
+                return None
             cache_key = f"{metric1}_{metric2}_{time_window_minutes}"
             self.correlations_cache[cache_key] = correlation
             return correlation
@@ -287,8 +374,14 @@ def demo_metrics():
 
     # Export Prometheus
     prometheus_data = metrics.export_prometheus_format()
-    ark_logger.info(f"\n📤 Prometheus export ({len(prometheus_data.split(, extra={"module": "utils"}))} metrics):")
-    ark_logger.info(prometheus_data[:200] + "..." if len(prometheus_data, extra={"module": "utils"}) > 200 else prometheus_data)
+    ark_logger.info(
+        f"\n📤 Prometheus export ({len(prometheus_data.splitlines())} metrics):",
+        extra={"module": "utils"},
+    )
+    ark_logger.info(
+        prometheus_data[:200] + "..." if len(prometheus_data) > 200 else prometheus_data,
+        extra={"module": "utils"},
+    )
 
 
 if __name__ == "__main__":
@@ -20,6 +20,7 @@ Détecte :
 from core.ark_logger import ark_logger
 import json
 import logging
+import os
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from enum import Enum
@@ -30,6 +31,23 @@ import toml
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_VALIDATOR_CONFIG: dict[str, Any] = {
+    "validation_timeout": 30,
+    "strict_mode": False,
+    "auto_fix": False,
+    "temporal_tolerance_minutes": 5,
+    "confidence_variance_threshold": 0.3,
+    "max_validation_history": 1000,
+}
+
+# Modules dont dépend chaque validateur (None = dépend de l'historique, toujours rejoué)
+VALIDATOR_DEPENDENCIES: dict[str, frozenset[str] | None] = {
+    "temporal_coherence": frozenset({"reflexia", "zeroia", "global"}),
+    "confidence_coherence": frozenset({"reflexia", "zeroia"}),
+    "logical_consistency": frozenset({"reflexia", "zeroia"}),
+    "behavioral_patterns": None,
+}
+
 
 class ValidationLevel(Enum):
     CRITICAL = "critical"
@@ -82,15 +100,16 @@ class CrossModuleValidator:
 
         Cette fonction fait partie du système Arkalia Luna Pro.
         """
-        self.config = config or {
-            "validation_timeout": 30,
-            "strict_mode": False,
-            "auto_fix": False,
-        }
+        self.config = {**DEFAULT_VALIDATOR_CONFIG, **(config or {})}
         self.validation_history: list[dict] = []
         self.known_issues: dict[str, list] = {}
         self.state_paths: dict[str, Path] = {}
         self.state_cache: dict[str, dict] = {}
+
+        # Validation incrémentale : signatures stat des fichiers d'état et
+        # derniers résultats de chaque validateur
+        self._state_signatures: dict[str, tuple[Path, tuple[int, int, int] | None]] = {}
+        self._results_cache: dict[str, list[ValidationResult]] = {}
         logger.info("🔍 CrossModuleValidator initialized")
 
     def validate_module_interfaces(self, modules_data: dict[str, dict]) -> dict[str, Any]:
@@ -321,24 +340,61 @@ class CrossModuleValidator:
         logger.info("🧹 Validation history cleared")
 
     def load_module_states(self) -> dict[str, dict]:
-        states: dict[str, Any] = {}
+        states, _ = self._refresh_module_states()
+        return states
+
+    @staticmethod
+    def _stat_signature(state_path: Path) -> tuple[int, int, int] | None:
+        try:
+            stat = os.stat(state_path)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+    def _refresh_module_states(self) -> tuple[dict[str, dict], set[str]]:
+        """
+        Recharge uniquement les états dont le fichier a changé (mtime/taille/inode).
+
+        Returns:
+            tuple: (états parsés, modules modifiés depuis l'appel précédent)
+        """
+        changed: set[str] = set()
+
+        # Modules retirés de la configuration
+        for module_name in set(self.state_cache) - set(self.state_paths):
+            del self.state_cache[module_name]
+            self._state_signatures.pop(module_name, None)
+            changed.add(module_name)
 
         for module_name, state_path in self.state_paths.items():
+            signature = (state_path, self._stat_signature(state_path))
+            if (
+                module_name in self.state_cache
+                and self._state_signatures.get(module_name) == signature
+            ):
+                continue
+
+            changed.add(module_name)
+            self._state_signatures[module_name] = signature
             try:
-                if state_path.exists():
+                if signature[1] is not None:
                     with open(state_path) as f:
-                        states[module_name] = toml.load(f)
+                        self.state_cache[module_name] = toml.load(f)
                     logger.debug(f"✅ Loaded {module_name} state")
                 else:
-                    states[module_name] = {}
+                    self.state_cache[module_name] = {}
                     logger.warning(f"⚠️ {module_name} state file not found: {state_path}")
             except Exception as e:
                 logger.error(f"❌ Error loading {module_name} state: {e}")
-                states[module_name] = {}
+                self.state_cache[module_name] = {}
 
-        # Cache pour comparaisons futures
-        self.state_cache = states.copy()
-        return states
+        return self.state_cache.copy(), changed
+
+    def invalidate_cache(self) -> None:
+        """Force le rechargement des états et la réexécution de tous les validateurs"""
+        self._state_signatures.clear()
+        self._results_cache.clear()
+        self.state_cache.clear()
 
     def validate_temporal_coherence(self, states: dict[str, dict]) -> list[ValidationResult]:
         results: list[Any] = []
@@ -558,16 +614,30 @@ class CrossModuleValidator:
     def run_full_validation(self) -> dict[str, Any]:
         logger.info("🔍 Starting cross-module validation...")
 
-        # Charger les états
-        states = self.load_module_states()
+        # Charger les états (seuls les fichiers modifiés sont relus)
+        states, changed_modules = self._refresh_module_states()
 
-        # Exécuter toutes les validations
-        all_results: list[Any] = []
+        validators = {
+            "temporal_coherence": self.validate_temporal_coherence,
+            "confidence_coherence": self.validate_confidence_coherence,
+            "logical_consistency": self.validate_logical_consistency,
+            "behavioral_patterns": self.validate_behavioral_patterns,
+        }
 
-        all_results.extend(self.validate_temporal_coherence(states))
-        all_results.extend(self.validate_confidence_coherence(states))
-        all_results.extend(self.validate_logical_consistency(states))
-        all_results.extend(self.validate_behavioral_patterns(states))
+        # Exécuter uniquement les validations dont les dépendances ont changé
+        all_results: list[Any] = []
+        executed: list[str] = []
+
+        for name, validator in validators.items():
+            dependencies = VALIDATOR_DEPENDENCIES[name]
+            if (
+                dependencies is None
+                or name not in self._results_cache
+                or dependencies & changed_modules
+            ):
+                self._results_cache[name] = validator(states)
+                executed.append(name)
+            all_results.extend(self._results_cache[name])
 
         # Ajouter à l'historique
         self.validation_history.extend(all_results)
@@ -599,6 +669,8 @@ class CrossModuleValidator:
                 "ok": sum(1 for r in all_results if r.level == ValidationLevel.OK),
             },
             "modules_analyzed": list(states.keys()),
+            "modules_changed": sorted(changed_modules),
+            "validators_executed": executed,
             "validation_results": [r.to_dict() for r in all_results],
             "overall_status": (
                 "healthy"
@@ -338,4 +338,4 @@ if __name__ == "__main__":
         # Mode interactif
         validator = BuildIntegrityValidator()
         checksums = validator.generate_checksums()
-        ark_logger.info(f"Generated checksums for {len(checksums, extra={"module": "crypto"})} files")
+        ark_logger.info(f"Generated checksums for {len(checksums)} files", extra={"module": "crypto"})
@@ -7,12 +7,19 @@ Ce module fait partie du système Arkalia Luna Pro.
 # 🎫 modules/security/crypto/token_lifecycle.py
 # Gestion du cycle de vie des tokens et sessions Arkalia-Vault
 
+import hashlib
+import hmac
 import json
 import logging
+import os
 import secrets
+import threading
+import time
+from collections import OrderedDict
 from dataclasses import asdict, dataclass
 from datetime import datetime, timedelta
 from enum import Enum
+from pathlib import Path
 from typing import Any, Optional
 
 import jwt
@@ -21,6 +28,10 @@ from .vault_manager import ArkaliaVault, VaultError
 
 logger = logging.getLogger(__name__)
 
+API_KEY_PREFIX = "ak_"
+# Clé réservée du secret ``token_metadata`` : dernière entrée du journal d'usage appliquée
+USAGE_CHECKPOINT_KEY = "__usage_journal_seq__"
+
 
 class TokenType(Enum):
     SESSION = "session"
@@ -30,6 +41,10 @@ class TokenType(Enum):
     TEMPORARY = "temporary"
 
 
+# Types de tokens émis comme JWT (les autres sont des clés API opaques)
+JWT_TOKEN_TYPES = frozenset({TokenType.ACCESS_TOKEN, TokenType.REFRESH_TOKEN, TokenType.SESSION})
+
+
 class TokenStatus(Enum):
     ACTIVE = "active"
     EXPIRED = "expired"
@@ -52,6 +67,7 @@ class TokenMetadata:
     permissions: list[str]
     client_info: dict[str, str]  # IP, User-Agent, etc.
     tags: list[str]
+    key_digest: str | None = None  # HMAC-SHA256 (pepper serveur) de la clé API
 
     def to_dict(self) -> dict:
         data = asdict(self)
@@ -91,6 +107,7 @@ class TokenMetadata:
             permissions=data.get("permissions", []),
             client_info=data.get("client_info", {}),
             tags=data.get("tags", []),
+            key_digest=data.get("key_digest"),
         )
 
     def is_expired(self) -> bool:
@@ -126,12 +143,120 @@ class TokenMetadata:
         )
 
 
+class UsageJournal:
+    """
+    Journal d'usage des tokens en ajout seul
+
+    Une ligne ``seq<TAB>token_id<TAB>horodatage`` par validation réussie,
+    écrite avant que la validation ne soit acceptée : après un arrêt brutal,
+    les usages non encore consolidés dans le vault sont rejoués au démarrage.
+    Une ligne tronquée (écriture interrompue) est ignorée.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self.seq = 0
+        self._fd: int | None = None
+
+    def _open(self) -> int:
+        if self._fd is None:
+            self._fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+        return self._fd
+
+    def append(self, token_id: str, used_at: datetime) -> int:
+        seq = self.seq + 1
+        os.write(self._open(), f"{seq}\t{token_id}\t{used_at.isoformat()}\n".encode())
+        self.seq = seq
+        return seq
+
+    def replay(self) -> list[tuple[int, str, datetime]]:
+        if not self.path.exists():
+            return []
+        entries: list[tuple[int, str, datetime]] = []
+        for line in self.path.read_text().splitlines():
+            try:
+                seq, token_id, used_at = line.split("\t")
+                entries.append((int(seq), token_id, datetime.fromisoformat(used_at)))
+            except ValueError:
+                logger.warning(f"⚠️ Ignoring malformed usage journal line: {line!r}")
+        return entries
+
+    def truncate(self) -> None:
+        os.ftruncate(self._open(), 0)
+
+    def __len__(self) -> int:
+        return self.path.stat().st_size if self.path.exists() else 0
+
+    def close(self) -> None:
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+
+class VerifiedTokenCache:
+    """
+    Cache LRU des claims JWT déjà vérifiés, indexé par empreinte SHA-256 du token
+
+    Une entrée expire au plus tard à ``exp`` du token, et au bout de ``ttl``
+    secondes : un token chaud est revalidé par une simple recherche, sans
+    ``jwt.decode``. La révocation et l'état des métadonnées restent vérifiés
+    à chaque validation.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl: float = 30.0) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: OrderedDict[bytes, tuple[dict[str, Any], float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(token_value: str) -> bytes:
+        return hashlib.sha256(token_value.encode()).digest()
+
+    def get(self, key: bytes) -> dict[str, Any] | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[1] <= time.time():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: bytes, claims: dict[str, Any]):
+        if self.max_entries <= 0:
+            return
+        expires_at = time.time() + self.ttl
+        if isinstance(claims.get("exp"), int | float):
+            expires_at = min(expires_at, claims["exp"])
+        with self._lock:
+            self._entries[key] = (claims, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
 class TokenManager:
     """
     Gestionnaire du cycle de vie des tokens
 
     Fonctionnalités:
     - Génération de tokens JWT et API keys
+    - Index des API keys par HMAC (pepper serveur) : une recherche par validation
+    - Compteurs d'usage en mémoire, journalisés puis consolidés par lots dans le vault
+    - Clé de signature JWT en mémoire, rechargée à la rotation du secret
+    - Cache des claims JWT vérifiés (les sessions chaudes évitent ``jwt.decode``)
     - Gestion des sessions utilisateur
     - Révocation et expiration automatique
     - Audit trail complet
@@ -139,7 +264,17 @@ class TokenManager:
     - Rate limiting par token
     """
 
-    def __init__(self, vault: ArkaliaVault, jwt_secret_name: str = "jwt_master_secret") -> None:  # nosec B107
+    def __init__(
+        self,
+        vault: ArkaliaVault,
+        jwt_secret_name: str = "jwt_master_secret",  # nosec B107
+        pepper_name: str = "api_key_pepper",
+        usage_flush_interval: float = 5.0,
+        usage_flush_batch: int = 100,
+        claims_cache_size: int = 1024,
+        claims_cache_ttl: float = 30.0,
+        jwt_key_refresh_interval: float = 30.0,
+    ) -> None:
         """
         Fonction __init__.
 
@@ -147,14 +282,35 @@ class TokenManager:
         """
         self.vault = vault
         self.jwt_secret_name = jwt_secret_name
+        self.pepper_name = pepper_name
         self.token_metadata: dict[str, TokenMetadata] = {}
         self.revoked_tokens: set[str] = set()
+        # Empreinte HMAC de la clé API -> token_id
+        self.api_key_index: dict[str, str] = {}
+        self.claims_cache = VerifiedTokenCache(claims_cache_size, claims_cache_ttl)
+        # Rechargement de la clé JWT sur signature invalide (rotation par un autre
+        # processus), au plus une fois par intervalle
+        self.jwt_key_refresh_interval = jwt_key_refresh_interval
+        self._jwt_secret: str | None = None
+        self._jwt_secret_loaded_at = 0.0
+
+        # Usage : compteurs en mémoire, journal en ajout seul, consolidation par lots
+        self.usage_journal = UsageJournal(vault.vault_dir / "token_usage.journal")
+        self.usage_flush_interval = usage_flush_interval
+        self.usage_flush_batch = usage_flush_batch
+        self._usage_lock = threading.RLock()
+        self._pending_usage = 0
+        self._last_usage_flush = time.monotonic()
 
         # Initialiser le secret JWT si nécessaire
         self._ensure_jwt_secret()
+        self._pepper = self._ensure_pepper()
+        self.vault.add_change_listener(self._on_vault_change)
 
         # Charger les métadonnées existantes
         self._load_token_metadata()
+        self._replay_usage_journal()
+        self._build_api_key_index()
 
         logger.info("🎫 TokenManager initialized")
 
@@ -180,16 +336,112 @@ class TokenManager:
             logger.error(f"❌ Failed to ensure JWT secret: {e}")
             raise
 
+    def _ensure_pepper(self) -> bytes:
+        """Pepper serveur des empreintes de clés API (gardé en mémoire)"""
+        pepper = self.vault.retrieve_secret(self.pepper_name)
+        if pepper is None:
+            pepper = secrets.token_urlsafe(32)
+            self.vault.store_secret(
+                name=self.pepper_name,
+                value=pepper,
+                tags=["api_key", "pepper", "system"],
+                overwrite=False,
+            )
+            logger.info("🔑 New API key pepper generated")
+        return pepper.encode()
+
+    def _api_key_digest(self, token_value: str) -> str:
+        return hmac.new(self._pepper, token_value.encode(), hashlib.sha256).hexdigest()
+
+    def _build_api_key_index(self):
+        """Construit l'index des clés API actives depuis les métadonnées"""
+        migrated = 0
+        for token_id, metadata in self.token_metadata.items():
+            if metadata.token_type in JWT_TOKEN_TYPES or metadata.status != TokenStatus.ACTIVE:
+                continue
+            if metadata.key_digest is None:
+                # Clé émise avant l'index : empreinte calculée une fois depuis le vault
+                stored_token = self.vault.retrieve_secret(f"token_{token_id}")
+                if stored_token is None:
+                    continue
+                metadata.key_digest = self._api_key_digest(stored_token)
+                migrated += 1
+            self.api_key_index[metadata.key_digest] = token_id
+        if migrated:
+            self._save_token_metadata()
+            logger.info(f"📇 Indexed {migrated} existing API keys")
+
+    def _lookup_api_key(self, token_value: str) -> str | None:
+        """token_id d'une clé API : une recherche dans l'index, comparaison à temps constant"""
+        digest = self._api_key_digest(token_value)
+        token_id = self.api_key_index.get(digest)
+        if token_id is None:
+            return None
+        metadata = self.token_metadata.get(token_id)
+        if metadata is None or metadata.key_digest is None:
+            return None
+        return token_id if hmac.compare_digest(metadata.key_digest, digest) else None
+
     def _get_jwt_secret(self) -> str:
+        """Clé de signature JWT, lue dans le vault au premier usage puis gardée en mémoire"""
+        jwt_secret = self._jwt_secret
+        if jwt_secret is None:
+            jwt_secret = self.vault.retrieve_secret(self.jwt_secret_name)
+            if jwt_secret is None:
+                raise VaultError("JWT secret not found in vault")
+            self._jwt_secret = jwt_secret
+            self._jwt_secret_loaded_at = time.monotonic()
+        return jwt_secret
+
+    def refresh_jwt_secret(self, *_args: Any) -> None:
         """
-        Fonction _get_jwt_secret.
+        Oublie la clé JWT en mémoire et les claims vérifiés avec elle
 
-        Cette fonction fait partie du système Arkalia Luna Pro.
+        Utilisable comme ``notification_callback`` d'une ``RotationPolicy`` ;
+        les rotations passant par le vault de ce processus sont déjà suivies.
         """
+        self._jwt_secret = None
+        self.claims_cache.clear()
+
+    def _on_vault_change(self, action: str, name: str):
+        if name == self.jwt_secret_name:
+            logger.info(f"🔄 JWT signing key reloaded ({action})")
+            self.refresh_jwt_secret()
+
+    def _reload_rotated_jwt_secret(self) -> bool:
+        """Relit la clé JWT (rotation par un autre processus), au plus une fois par intervalle"""
+        now = time.monotonic()
+        if now - self._jwt_secret_loaded_at < self.jwt_key_refresh_interval:
+            return False
+        self._jwt_secret_loaded_at = now
+        # Le SecretCache du vault servirait l'ancienne clé jusqu'à expiration du TTL
+        self.vault.cache.invalidate(self.jwt_secret_name)
         jwt_secret = self.vault.retrieve_secret(self.jwt_secret_name)
-        if jwt_secret is None:
-            raise VaultError("JWT secret not found in vault")
-        return jwt_secret
+        if jwt_secret is None or jwt_secret == self._jwt_secret:
+            return False
+        self.claims_cache.clear()
+        self._jwt_secret = jwt_secret
+        return True
+
+    def _decode_jwt(self, token_value: str) -> dict[str, Any] | None:
+        """Claims d'un JWT valide : depuis le cache, sinon vérifiés par ``jwt.decode``"""
+        cache_key = VerifiedTokenCache.key(token_value)
+        claims = self.claims_cache.get(cache_key)
+        if claims is not None:
+            return claims
+        try:
+            claims = jwt.decode(token_value, self._get_jwt_secret(), algorithms=["HS256"])
+        except jwt.InvalidSignatureError:
+            if not self._reload_rotated_jwt_secret():
+                return None
+            try:
+                claims = jwt.decode(token_value, self._get_jwt_secret(), algorithms=["HS256"])
+            except jwt.InvalidTokenError:
+                return None
+        except jwt.InvalidTokenError:
+            return None
+        self.claims_cache.put(cache_key, claims)
+        return claims
 
     def _load_token_metadata(self):
         """
@@ -201,31 +453,101 @@ class TokenManager:
             metadata_json = self.vault.retrieve_secret("token_metadata")
             if metadata_json:
                 data = json.loads(metadata_json)
+                self.usage_journal.seq = data.pop(USAGE_CHECKPOINT_KEY, 0)
                 for token_id, meta_dict in data.items():
-                    self.token_metadata[token_id] = TokenMetadata.from_dict(meta_dict)
+                    metadata = TokenMetadata.from_dict(meta_dict)
+                    self.token_metadata[token_id] = metadata
+                    if metadata.status == TokenStatus.REVOKED:
+                        self.revoked_tokens.add(token_id)
 
                 logger.info(f"📊 Loaded metadata for {len(self.token_metadata)} tokens")
         except Exception as e:
             logger.warning(f"⚠️ Could not load token metadata: {e}")
 
-    def _save_token_metadata(self):
+    def _replay_usage_journal(self):
+        """Réapplique les usages journalisés après le dernier point de consolidation"""
+        checkpoint = self.usage_journal.seq
+        replayed = 0
+        for seq, token_id, used_at in self.usage_journal.replay():
+            self.usage_journal.seq = max(self.usage_journal.seq, seq)
+            metadata = self.token_metadata.get(token_id)
+            if seq <= checkpoint or metadata is None:
+                continue
+            metadata.usage_count += 1
+            if metadata.last_used_at is None or used_at > metadata.last_used_at:
+                metadata.last_used_at = used_at
+            replayed += 1
+        if replayed:
+            logger.info(f"📒 Replayed {replayed} token usages from journal")
+            self._save_token_metadata()
+
+    def _save_token_metadata(self) -> bool:
         """
-        Fonction _save_token_metadata.
+        Consolide toutes les métadonnées (usages compris) dans le vault
 
-        Cette fonction fait partie du système Arkalia Luna Pro.
+        Le journal d'usage est vidé une fois l'écriture réussie ; le numéro de
+        la dernière entrée appliquée est enregistré avec les métadonnées pour
+        qu'un journal non vidé (arrêt entre les deux) ne soit pas recompté.
         """
-        try:
-            data = {token_id: meta.to_dict() for token_id, meta in self.token_metadata.items()}
-            metadata_json = json.dumps(data, indent=2)
+        with self._usage_lock:
+            try:
+                data: dict[str, Any] = {
+                    token_id: meta.to_dict() for token_id, meta in self.token_metadata.items()
+                }
+                data[USAGE_CHECKPOINT_KEY] = self.usage_journal.seq
+                metadata_json = json.dumps(data, indent=2)
 
-            self.vault.store_secret(
-                name="token_metadata",
-                value=metadata_json,
-                tags=["system", "token_metadata"],
-                overwrite=True,
-            )
-        except Exception as e:
-            logger.error(f"❌ Failed to save token metadata: {e}")
+                self.vault.store_secret(
+                    name="token_metadata",
+                    value=metadata_json,
+                    tags=["system", "token_metadata"],
+                    overwrite=True,
+                )
+            except Exception as e:
+                logger.error(f"❌ Failed to save token metadata: {e}")
+                return False
+
+            self.usage_journal.truncate()
+            self._pending_usage = 0
+            self._last_usage_flush = time.monotonic()
+            return True
+
+    def _record_usage(self, metadata: TokenMetadata) -> bool:
+        """
+        Comptabilise un usage : vérification de ``max_usage_count`` et
+        incrément atomiques, journalisés avant acceptation
+
+        Returns:
+            False si la limite d'usage est déjà atteinte
+        """
+        with self._usage_lock:
+            if metadata.is_usage_exceeded():
+                return False
+            now = datetime.now()
+            self.usage_journal.append(metadata.token_id, now)
+            metadata.usage_count += 1
+            metadata.last_used_at = now
+            self._pending_usage += 1
+        self._maybe_flush_usage()
+        return True
+
+    def _maybe_flush_usage(self):
+        if self._pending_usage and (
+            self._pending_usage >= self.usage_flush_batch
+            or time.monotonic() - self._last_usage_flush >= self.usage_flush_interval
+        ):
+            self._save_token_metadata()
+
+    def flush_usage(self) -> bool:
+        """Consolide immédiatement les usages en attente dans le vault"""
+        return self._save_token_metadata() if self._pending_usage else True
+
+    def close(self):
+        """Consolide les usages en attente et ferme le journal"""
+        self.vault.remove_change_listener(self._on_vault_change)
+        self.flush_usage()
+        self.usage_journal.close()
+        self.claims_cache.clear()
 
     def generate_token(
         self,
@@ -280,14 +602,12 @@ class TokenManager:
         )
 
         # Générer la valeur du token selon le type
-        if token_type in [
-            TokenType.ACCESS_TOKEN,
-            TokenType.REFRESH_TOKEN,
-            TokenType.SESSION,
-        ]:
+        if token_type in JWT_TOKEN_TYPES:
             token_value = self._generate_jwt_token(metadata, custom_claims)
         else:
             token_value = self._generate_api_key(metadata)
+            metadata.key_digest = self._api_key_digest(token_value)
+            self.api_key_index[metadata.key_digest] = token_id
 
         # Stocker les métadonnées
         self.token_metadata[token_id] = metadata
@@ -338,7 +658,7 @@ class TokenManager:
         return jwt.encode(payload, jwt_secret, algorithm="HS256")
 
     def _generate_api_key(self, metadata: TokenMetadata) -> str:
-        prefix = f"ak_{metadata.token_type.value}"
+        prefix = f"{API_KEY_PREFIX}{metadata.token_type.value}"
         suffix = secrets.token_urlsafe(32)
         return f"{prefix}_{suffix}"
 
@@ -359,18 +679,16 @@ class TokenManager:
             # Décoder le token pour obtenir l'ID
             token_id = None
 
-            # Essayer de décoder comme JWT
-            try:
-                jwt_secret = self._get_jwt_secret()
-                decoded = jwt.decode(token_value, jwt_secret, algorithms=["HS256"])
-                token_id = decoded.get("jti")
-            except jwt.InvalidTokenError:
-                # Pas un JWT, chercher dans les API keys
-                for tid, _metadata in self.token_metadata.items():
-                    stored_token = self.vault.retrieve_secret(f"token_{tid}")
-                    if stored_token == token_value:
-                        token_id = tid
-                        break
+            if token_value.startswith(API_KEY_PREFIX):
+                token_id = self._lookup_api_key(token_value)
+            else:
+                # Essayer de décoder comme JWT
+                claims = self._decode_jwt(token_value)
+                if claims is not None:
+                    token_id = claims.get("jti")
+                else:
+                    # Pas un JWT, chercher dans l'index des API keys
+                    token_id = self._lookup_api_key(token_value)
 
             if not token_id:
                 return False, None, "Token not found"
@@ -394,10 +712,9 @@ class TokenManager:
                 if not all(perm in metadata.permissions for perm in required_permissions):
                     return False, metadata, "Insufficient permissions"
 
-            # Mettre à jour les statistiques d'usage
-            metadata.usage_count += 1
-            metadata.last_used_at = datetime.now()
-            self._save_token_metadata()
+            # Mettre à jour les statistiques d'usage (journal, consolidation par lots)
+            if not self._record_usage(metadata):
+                return False, metadata, "Usage limit exceeded"
 
             return True, metadata, "Valid"
 
@@ -421,8 +738,11 @@ class TokenManager:
             return False
 
         # Marquer comme révoqué
-        self.token_metadata[token_id].status = TokenStatus.REVOKED
+        metadata = self.token_metadata[token_id]
+        metadata.status = TokenStatus.REVOKED
         self.revoked_tokens.add(token_id)
+        if metadata.key_digest is not None:
+            self.api_key_index.pop(metadata.key_digest, None)
 
         # Supprimer du vault
         self.vault.delete_secret(f"token_{token_id}")
@@ -10,11 +10,16 @@ Ce module fait partie du système Arkalia Luna Pro.
 import json
 import logging
 import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any, Optional
 
-from cryptography.fernet import Fernet
+from cryptography.fernet import Fernet, InvalidToken
 
 from .checksum_validator import BuildIntegrityValidator, SecurityError
 
@@ -74,19 +79,82 @@ class SecretMetadata:
         return metadata
 
 
+class SecretCache:
+    """
+    Cache LRU + TTL des secrets déchiffrés
+
+    Les valeurs sont gardées dans des ``bytearray`` remis à zéro dès qu'elles
+    quittent le cache (éviction, expiration, invalidation). Les ``str``
+    rendus aux appelants restent des copies immuables hors de ce contrôle.
+    """
+
+    def __init__(self, max_entries: int = 128, ttl: float = 300.0) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[bytearray, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _zeroize(buffer: bytearray) -> None:
+        buffer[:] = bytes(len(buffer))
+
+    def get(self, name: str) -> str | None:
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is None:
+                return None
+            buffer, cached_at = entry
+            if time.monotonic() - cached_at >= self.ttl:
+                self._discard(name)
+                return None
+            self._entries.move_to_end(name)
+            return buffer.decode()
+
+    def put(self, name: str, value: str) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._discard(name)
+            self._entries[name] = (bytearray(value.encode()), time.monotonic())
+            while len(self._entries) > self.max_entries:
+                self._discard(next(iter(self._entries)))
+
+    def invalidate(self, name: str | None = None) -> None:
+        """Oublie ``name`` (ou tout le cache) en effaçant les valeurs"""
+        with self._lock:
+            for key in [name] if name is not None else list(self._entries):
+                self._discard(key)
+
+    def _discard(self, name: str) -> None:
+        entry = self._entries.pop(name, None)
+        if entry is not None:
+            self._zeroize(entry[0])
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
 class ArkaliaVault(BuildIntegrityValidator):
     """
     Arkalia-Vault Enterprise - Extension sécurisée du validateur existant
 
     Fonctionnalités:
-    - Stockage sécurisé des secrets (chiffrement Fernet)
+    - Stockage sécurisé des secrets (chiffrement Fernet, un enregistrement
+      SQLite par secret : lecture et écriture indépendantes de la taille du vault)
+    - Cache borné des valeurs déchiffrées (TTL, buffers remis à zéro)
     - Rotation automatique des clés
     - Gestion du cycle de vie des secrets
     - Audit trail complet
     - Intégration avec l'intégrité existante
     """
 
-    def __init__(self, base_dir: Path | None = None, master_key: bytes | None = None) -> None:
+    def __init__(
+        self,
+        base_dir: Path | None = None,
+        master_key: bytes | None = None,
+        cache_size: int = 128,
+        cache_ttl: float = 300.0,
+    ) -> None:
         """
         Fonction __init__.
 
@@ -97,19 +165,27 @@ class ArkaliaVault(BuildIntegrityValidator):
 
         # Configuration Vault
         self.vault_dir = self.base_dir / "security" / "vault"
-        self.secrets_file = self.vault_dir / "secrets.encrypted"
-        self.metadata_file = self.vault_dir / "metadata.json"
+        self.secrets_file = self.vault_dir / "secrets.db"
         self.audit_log = self.vault_dir / "audit.log"
         self.key_file = self.vault_dir / ".vault_key"
+        # Ancien format (fichier chiffré d'un bloc + métadonnées JSON), migré à l'ouverture
+        self.legacy_secrets_file = self.vault_dir / "secrets.encrypted"
+        self.metadata_file = self.vault_dir / "metadata.json"
 
         # Créer les répertoires nécessaires
         self.vault_dir.mkdir(parents=True, exist_ok=True)
 
         # Initialiser la cryptographie
         self.cipher_suite = self._initialize_encryption(master_key)
+        self.cache = SecretCache(cache_size, cache_ttl)
+        # Abonnés notifiés (action, nom) à chaque écriture/suppression de secret
+        self._change_listeners: list[Callable[[str, str], None]] = []
 
-        # Charger les métadonnées existantes
+        # Ouvrir le stockage et charger les métadonnées existantes
+        self._db_lock = threading.RLock()
+        self._db = self._open_store()
         self.secrets_metadata: dict[str, SecretMetadata] = self._load_metadata()
+        self._migrate_legacy_vault()
 
         logger.info("🔐 ArkaliaVault initialized successfully")
 
@@ -130,50 +206,141 @@ class ArkaliaVault(BuildIntegrityValidator):
 
         return Fernet(key)
 
-    def _load_metadata(self) -> dict[str, SecretMetadata]:
-        if not self.metadata_file.exists():
-            return {}
+    def _open_store(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.secrets_file, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS secrets (
+                name TEXT PRIMARY KEY,
+                token BLOB NOT NULL,
+                metadata TEXT NOT NULL
+            )
+        """
+        )
+        conn.commit()
+        os.chmod(self.secrets_file, 0o600)
+        return conn
 
-        try:
-            with open(self.metadata_file) as f:
-                data = json.load(f)
+    def _encrypt_record(self, name: str, value: str, cipher: Fernet | None = None) -> bytes:
+        # Le nom est chiffré avec la valeur : un enregistrement déplacé est détecté
+        payload = json.dumps({"name": name, "value": value}).encode()
+        return (cipher or self.cipher_suite).encrypt(payload)
 
-            metadata: dict[str, Any] = {}
-            for name, meta_dict in data.items():
-                metadata[name] = SecretMetadata.from_dict(meta_dict)
+    def _decrypt_record(self, name: str, token: bytes, cipher: Fernet | None = None) -> str:
+        try:
+            record = json.loads((cipher or self.cipher_suite).decrypt(token))
+        except (InvalidToken, ValueError) as e:
+            raise VaultError(f"Failed to decrypt secret '{name}': {e}") from e
+        if record.get("name") != name:
+            raise VaultError(f"Secret record '{name}' does not match its name")
+        return record["value"]
 
-            return metadata
+    def _load_metadata(self) -> dict[str, SecretMetadata]:
+        try:
+            with self._db_lock:
+                rows = self._db.execute("SELECT name, metadata FROM secrets").fetchall()
+            return {name: SecretMetadata.from_dict(json.loads(meta)) for name, meta in rows}
         except Exception as e:
             logger.error(f"❌ Error loading metadata: {e}")
             return {}
 
-    def _save_metadata(self):
-        data = {name: meta.to_dict() for name, meta in self.secrets_metadata.items()}
-
-        with open(self.metadata_file, "w") as f:
-            json.dump(data, f, indent=2)
+    def _save_metadata(self, name: str | None = None):
+        """Persiste les métadonnées de ``name`` (ou de tous les secrets)"""
+        names = [name] if name is not None else list(self.secrets_metadata)
+        with self._db_lock:
+            self._db.executemany(
+                "UPDATE secrets SET metadata = ? WHERE name = ?",
+                [
+                    (json.dumps(self.secrets_metadata[n].to_dict()), n)
+                    for n in names
+                    if n in self.secrets_metadata
+                ],
+            )
+            self._db.commit()
+
+    def _load_secret(self, name: str) -> str | None:
+        with self._db_lock:
+            row = self._db.execute("SELECT token FROM secrets WHERE name = ?", (name,)).fetchone()
+        return None if row is None else self._decrypt_record(name, row[0])
 
     def _load_secrets(self) -> dict[str, str]:
-        if not self.secrets_file.exists():
-            return {}
+        """Déchiffre tous les secrets (rotation, contrôle d'intégrité)"""
+        with self._db_lock:
+            rows = self._db.execute("SELECT name, token FROM secrets").fetchall()
+        return {name: self._decrypt_record(name, token) for name, token in rows}
 
+    def _save_secret(self, name: str, value: str, metadata: SecretMetadata):
         try:
-            encrypted_data = self.secrets_file.read_bytes()
-            decrypted_data = self.cipher_suite.decrypt(encrypted_data)
-            return json.loads(decrypted_data.decode())
+            token = self._encrypt_record(name, value)
+            with self._db_lock:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO secrets (name, token, metadata) VALUES (?, ?, ?)",
+                    (name, token, json.dumps(metadata.to_dict())),
+                )
+                self._db.commit()
         except Exception as e:
-            logger.error(f"❌ Error loading secrets: {e}")
-            raise VaultError(f"Failed to decrypt vault: {e}") from e
+            logger.error(f"❌ Error saving secret: {e}")
+            raise VaultError(f"Failed to encrypt secret '{name}': {e}") from e
 
-    def _save_secrets(self, secrets: dict[str, str]):
+    def _migrate_legacy_vault(self):
+        """Importe l'ancien fichier chiffré d'un bloc, un enregistrement par secret"""
+        if not self.legacy_secrets_file.exists():
+            return
         try:
-            json_data = json.dumps(secrets, indent=2).encode()
-            encrypted_data = self.cipher_suite.encrypt(json_data)
-            self.secrets_file.write_bytes(encrypted_data)
-            os.chmod(self.secrets_file, 0o600)
+            decrypted = self.cipher_suite.decrypt(self.legacy_secrets_file.read_bytes())
+            secrets = json.loads(decrypted.decode())
+            legacy_metadata = (
+                json.loads(self.metadata_file.read_text()) if self.metadata_file.exists() else {}
+            )
         except Exception as e:
-            logger.error(f"❌ Error saving secrets: {e}")
-            raise VaultError(f"Failed to encrypt vault: {e}") from e
+            logger.error(f"❌ Error loading legacy vault: {e}")
+            raise VaultError(f"Failed to decrypt legacy vault: {e}") from e
+
+        now = datetime.now()
+        with self._db_lock:
+            for name, value in secrets.items():
+                if name in self.secrets_metadata:
+                    continue
+                meta = legacy_metadata.get(name)
+                metadata = (
+                    SecretMetadata.from_dict(meta) if meta else SecretMetadata(name, created_at=now)
+                )
+                self._db.execute(
+                    "INSERT INTO secrets (name, token, metadata) VALUES (?, ?, ?)",
+                    (name, self._encrypt_record(name, value), json.dumps(metadata.to_dict())),
+                )
+                self.secrets_metadata[name] = metadata
+            self._db.commit()
+
+        suffix = f".migrated.{int(now.timestamp())}"
+        for legacy_file in (self.legacy_secrets_file, self.metadata_file):
+            if legacy_file.exists():
+                legacy_file.rename(legacy_file.with_name(legacy_file.name + suffix))
+        self._audit_log_entry("MIGRATION", "SYSTEM", f"secrets_count={len(secrets)}")
+        logger.info(f"📦 Legacy vault migrated: {len(secrets)} secrets")
+
+    def add_change_listener(self, callback: Callable[[str, str], None]):
+        """Abonne ``callback(action, nom)`` aux modifications de secrets (STORE, DELETE)"""
+        self._change_listeners.append(callback)
+
+    def remove_change_listener(self, callback: Callable[[str, str], None]):
+        if callback in self._change_listeners:
+            self._change_listeners.remove(callback)
+
+    def _notify_change(self, action: str, name: str):
+        for callback in list(self._change_listeners):
+            try:
+                callback(action, name)
+            except Exception as e:
+                logger.error(f"⚠️ Vault change listener failed: {e}")
+
+    def close(self):
+        """Ferme le stockage et efface les secrets en cache"""
+        self.cache.invalidate()
+        with self._db_lock:
+            self._db.close()
 
     def _audit_log_entry(self, action: str, secret_name: str, details: str = ""):
         timestamp = datetime.now().isoformat()
@@ -209,27 +376,23 @@ class ArkaliaVault(BuildIntegrityValidator):
         if not overwrite and name in self.secrets_metadata:
             raise VaultError(f"Secret '{name}' already exists. Use overwrite=True to replace.")
 
-        # Charger les secrets existants
-        secrets = self._load_secrets()
-
-        # Ajouter le nouveau secret
-        secrets[name] = value
-
         # Créer les métadonnées
         expires_at = None
         if expires_in_days:
             expires_at = datetime.now() + timedelta(days=expires_in_days)
 
-        self.secrets_metadata[name] = SecretMetadata(
+        metadata = SecretMetadata(
             name=name, created_at=datetime.now(), expires_at=expires_at, tags=tags or []
         )
 
-        # Sauvegarder
-        self._save_secrets(secrets)
-        self._save_metadata()
+        # Sauvegarder (un seul enregistrement écrit)
+        self._save_secret(name, value, metadata)
+        self.secrets_metadata[name] = metadata
+        self.cache.invalidate(name)
 
         # Audit log
         self._audit_log_entry("STORE", name, f"tags={tags}, expires={expires_at}")
+        self._notify_change("STORE", name)
 
         logger.info(f"🔐 Secret '{name}' stored successfully")
         return True
@@ -259,18 +422,19 @@ class ArkaliaVault(BuildIntegrityValidator):
             self._audit_log_entry("ACCESS_DENIED", name, "EXPIRED")
             raise VaultError(f"Secret '{name}' has expired")
 
-        # Charger et récupérer le secret
-        secrets = self._load_secrets()
-        value = secrets.get(name)
-
+        # Récupérer le secret (cache, sinon déchiffrement de son seul enregistrement)
+        value = self.cache.get(name)
         if value is None:
-            logger.error(f"❌ Secret '{name}' found in metadata but missing from vault")
-            return None
+            value = self._load_secret(name)
+            if value is None:
+                logger.error(f"❌ Secret '{name}' found in metadata but missing from vault")
+                return None
+            self.cache.put(name, value)
 
         # Mettre à jour les statistiques d'accès
         metadata.access_count += 1
         metadata.last_accessed = datetime.now()
-        self._save_metadata()
+        self._save_metadata(name)
 
         # Audit log
         self._audit_log_entry("RETRIEVE", name, f"access_count={metadata.access_count}")
@@ -291,18 +455,16 @@ class ArkaliaVault(BuildIntegrityValidator):
             logger.warning(f"⚠️ Secret '{name}' not found for deletion")
             return False
 
-        # Charger et supprimer le secret
-        secrets = self._load_secrets()
-        if name in secrets:
-            del secrets[name]
-            self._save_secrets(secrets)
-
-        # Supprimer les métadonnées
+        # Supprimer l'enregistrement, ses métadonnées et la valeur en cache
+        with self._db_lock:
+            self._db.execute("DELETE FROM secrets WHERE name = ?", (name,))
+            self._db.commit()
         del self.secrets_metadata[name]
-        self._save_metadata()
+        self.cache.invalidate(name)
 
         # Audit log
         self._audit_log_entry("DELETE", name)
+        self._notify_change("DELETE", name)
 
         logger.info(f"🗑️ Secret '{name}' deleted successfully")
         return True
@@ -363,6 +525,7 @@ class ArkaliaVault(BuildIntegrityValidator):
 
         # Charger tous les secrets avec l'ancienne clé
         secrets = self._load_secrets()
+        old_cipher = self.cipher_suite
 
         # Générer ou utiliser la nouvelle clé
         if new_key is None:
@@ -384,8 +547,17 @@ class ArkaliaVault(BuildIntegrityValidator):
             self.key_file.write_bytes(new_key)
             os.chmod(self.key_file, 0o600)
 
-            # Re-chiffrer tous les secrets avec la nouvelle clé
-            self._save_secrets(secrets)
+            # Re-chiffrer tous les secrets avec la nouvelle clé (une transaction)
+            with self._db_lock:
+                self._db.executemany(
+                    "UPDATE secrets SET token = ? WHERE name = ?",
+                    [
+                        (self._encrypt_record(name, value, new_cipher), name)
+                        for name, value in secrets.items()
+                    ],
+                )
+                self._db.commit()
+            self.cache.invalidate()
 
             # Audit log
             self._audit_log_entry("KEY_ROTATION", "SYSTEM", f"secrets_count={len(secrets)}")
@@ -395,9 +567,10 @@ class ArkaliaVault(BuildIntegrityValidator):
 
         except Exception as e:
             # Rollback en cas d'erreur
+            self._db.rollback()
             if backup_key_file.exists():
                 self.key_file.write_bytes(backup_key_file.read_bytes())
-                self.cipher_suite = self._initialize_encryption()
+            self.cipher_suite = old_cipher
 
             logger.error(f"❌ Key rotation failed: {e}")
             raise VaultError(f"Key rotation failed: {e}") from e
@@ -427,7 +600,7 @@ class ArkaliaVault(BuildIntegrityValidator):
         violations: list[Any] = []
 
         # Vérifier que les fichiers vault existent
-        required_files = [self.key_file, self.metadata_file, self.audit_log]
+        required_files = [self.key_file, self.secrets_file, self.audit_log]
         for file_path in required_files:
             if not file_path.exists():
                 violations.append(f"Missing vault file: {file_path}")
@@ -280,7 +280,9 @@ if __name__ == "__main__":
         ark_logger.info("✅ Initialisation réussie", extra={"module": "zeroia"})
 
         decision, confidence = core.run_decision_cycle()
-        ark_logger.info(f"🎯 Décision: {decision} (confiance: {confidence:.2f}, extra={"module": "zeroia"})")
+        ark_logger.info(
+            f"🎯 Décision: {decision} (confiance: {confidence:.2f})", extra={"module": "zeroia"}
+        )
 
         status = core.get_status()
         ark_logger.info(f"📊 État: {status['status']}", extra={"module": "zeroia"})
@@ -9,6 +9,7 @@ from typing import Any, Optional
 
 import toml
 
+from modules.monitoring.heartbeat_registry import DEFAULT_REGISTRY_PATH, publish_heartbeat
 from modules.zeroia.adaptive_thresholds import should_lower_cpu_threshold
 from modules.zeroia.model_integrity import validate_decision_integrity
 from modules.zeroia.utils.backup import save_backup
@@ -300,8 +301,8 @@ def validate_and_fix_context(ctx: dict) -> dict:
             status[key] = default_value
             ark_logger.info(
                 f"⚠️ [ZeroIA] {key} manquant dans le contexte, valeur par défaut: {default_value}",
-                flush=True,
-            , extra={"module": "zeroia"})
+                extra={"module": "zeroia"},
+            )
 
     return validated_ctx
 
@@ -326,22 +327,27 @@ def reason_loop(
     try:
         integrity_valid, integrity_reason = validate_decision_integrity(ctx, decision, score)
         if not integrity_valid:
-            ark_logger.info(f"🚨 [ZeroIA] INTEGRITY VIOLATION: {integrity_reason}", flush=True, extra={"module": "zeroia"})
+            ark_logger.info(f"🚨 [ZeroIA] INTEGRITY VIOLATION: {integrity_reason}", extra={"module": "zeroia"})
             # En cas de compromission, forcer décision sécurisée
             decision, score = "monitor", 0.3
     except Exception as e:
-        ark_logger.error(f"⚠️ [ZeroIA] Integrity check failed: {e}", flush=True, extra={"module": "zeroia"})
+        ark_logger.error(f"⚠️ [ZeroIA] Integrity check failed: {e}", extra={"module": "zeroia"})
 
     # Vérifie si on doit traiter cette décision (anti-spam)
     if not should_process_decision(decision):
         ark_logger.info(
-            f"[ZeroIA] Décision {decision} ignorée (répétition trop fréquente, extra={"module": "zeroia"})",
-            flush=True,
+            f"[ZeroIA] Décision {decision} ignorée (répétition trop fréquente)",
+            extra={"module": "zeroia"},
         )
         return decision, score
 
     persist_state(decision, score, ctx, state_path)
     update_dashboard(decision, score, ctx, dashboard_path)
+    # Heartbeat publié à côté de l'état fourni (registre par défaut sinon)
+    heartbeat_path = state_path.parent / DEFAULT_REGISTRY_PATH.name if state_path else None
+    publish_heartbeat(
+        "zeroia", "active", {"last_decision": decision, "confidence": score}, heartbeat_path
+    )
 
     reflexia_decision = reflexia_data.get("decision", {}).get("last_decision", "unknown")
     if check_for_ia_conflict(
@@ -356,8 +362,11 @@ def reason_loop(
     # Logs modifiés pour éviter le spam
     status = ctx.get("status", {})
     cpu = status.get("cpu", "N/A")
-    ark_logger.info(f"✅ ZeroIA decided: {decision} (confidence={score}, extra={"module": "zeroia"})", flush=True)
-    ark_logger.info(f"[ZeroIA] CPU usage: {cpu}% → decision={decision} (score={score}, extra={"module": "zeroia"})", flush=True)
+    ark_logger.info(f"✅ ZeroIA decided: {decision} (confidence={score})", extra={"module": "zeroia"})
+    ark_logger.info(
+        f"[ZeroIA] CPU usage: {cpu}% → decision={decision} (score={score})",
+        extra={"module": "zeroia"},
+    )
 
     return decision, score
 
@@ -367,17 +376,17 @@ def compute_confidence_score(success_rate: float, error_rate: float) -> float:
 
 
 def main_loop() -> None:
-    ark_logger.info("[ZeroIA] loop started", flush=True, extra={"module": "zeroia"})
+    ark_logger.info("[ZeroIA] loop started", extra={"module": "zeroia"})
     try:
         reason_loop()
     except Exception as e:
-        ark_logger.info(f"[ZeroIA] 🚨 ERREUR dans reason_loop(, extra={"module": "zeroia"}): {e}", flush=True)
+        ark_logger.info(f"[ZeroIA] 🚨 ERREUR dans reason_loop(): {e}", extra={"module": "zeroia"})
         logger.exception(e)
 
 
 if __name__ == "__main__":
     try:
-        ark_logger.info("[ZeroIA] 🔄 Boucle cognitive initialisée...", flush=True, extra={"module": "zeroia"})
+        ark_logger.info("[ZeroIA] 🔄 Boucle cognitive initialisée...", extra={"module": "zeroia"})
         while True:
             main_loop()
             time.sleep(15)  # Augmentation de l'intervalle à 15 secondes
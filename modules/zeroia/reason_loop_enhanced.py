@@ -240,7 +240,7 @@ def load_toml_enhanced_cache(path: Path, max_age: int | None = None) -> dict:
                     toml.dump(default_context, f)
                 _TOML_CACHE[path_str] = default_context
                 _CACHE_TIMESTAMPS[path_str] = current_time
-                ark_logger.info(f"✅ [ZeroIA Enhanced] Contexte par défaut créé: {path}", flush=True, extra={"module": "zeroia"})
+                ark_logger.info(f"✅ [ZeroIA Enhanced] Contexte par défaut créé: {path}", extra={"module": "zeroia"})
                 return default_context
             raise ValueError(f"TOML file {path} is empty or missing")
 
@@ -641,18 +641,18 @@ def reason_loop_enhanced_with_recovery(
         error_recovery_status = "✅" if decision_error is None else "🔄"
         ark_logger.error(
             f"{error_recovery_status} ZeroIA decided: {decision} "
-            f"(confidence={score}, health={system_health:.2f}, extra={"module": "zeroia"})",
-            flush=True,
+            f"(confidence={score}, health={system_health:.2f})",
+            extra={"module": "zeroia"},
         )
         ark_logger.info(
-            f"[ZeroIA] CPU usage: {cpu}% → decision={decision} (score={score}, extra={"module": "zeroia"})",
-            flush=True,
+            f"[ZeroIA] CPU usage: {cpu}% → decision={decision} (score={score})",
+            extra={"module": "zeroia"},
         )
 
         if decision_error:
             ark_logger.error(
-                f"[ZeroIA] Error Recovery triggered for: {type(decision_error, extra={"module": "zeroia"}).__name__}",
-                flush=True,
+                f"[ZeroIA] Error Recovery triggered for: {type(decision_error).__name__}",
+                extra={"module": "zeroia"},
             )
 
         return decision, score
@@ -717,7 +717,7 @@ def main_loop_enhanced() -> None:
         time.sleep(2)
 
     except SystemRebootRequired as e:
-        ark_logger.info(f"[ZeroIA Enhanced] 🔄 REDÉMARRAGE REQUIS: {e}", flush=True, extra={"module": "zeroia"})
+        ark_logger.info(f"[ZeroIA Enhanced] 🔄 REDÉMARRAGE REQUIS: {e}", extra={"module": "zeroia"})
 
         # Event sourcing critique
         if event_store is not None:
@@ -735,13 +735,13 @@ def main_loop_enhanced() -> None:
         time.sleep(60)
 
     except (CognitiveOverloadError, DecisionIntegrityError) as e:
-        ark_logger.info(f"[ZeroIA Enhanced] ⚠️ SURCHARGE: {e}", flush=True, extra={"module": "zeroia"})
+        ark_logger.info(f"[ZeroIA Enhanced] ⚠️ SURCHARGE: {e}", extra={"module": "zeroia"})
 
         # Graceful degradation
         time.sleep(30)
 
     except Exception as e:
-        ark_logger.info(f"[ZeroIA Enhanced] 🚨 ERREUR: {e}", flush=True, extra={"module": "zeroia"})
+        ark_logger.info(f"[ZeroIA Enhanced] 🚨 ERREUR: {e}", extra={"module": "zeroia"})
         logger.exception(e)
 
         # Event sourcing d'erreur
@@ -23,6 +23,22 @@ def ensure_state_file() -> None:
     ensure_test_toml()
 
 
+@pytest.fixture(autouse=True, scope="session")
+def isolated_heartbeat_registry(tmp_path_factory):
+    """
+    Registre de heartbeats par défaut dans un répertoire temporaire : les
+    modules testés ne publient pas dans state/module_health.db.
+    """
+    from modules.monitoring import heartbeat_registry
+
+    registry = heartbeat_registry.HeartbeatRegistry(
+        tmp_path_factory.mktemp("heartbeats") / "module_health.db"
+    )
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(heartbeat_registry, "_registry", registry)
+        yield registry
+
+
 @pytest.hookimpl(tryfirst=True, hookwrapper=True)
 def pytest_runtest_makereport(item, call):
     outcome = yield
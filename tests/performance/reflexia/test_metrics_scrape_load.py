@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+🧪 Tests de Performance - Scrape Prometheus sous charge
+
+Vérifie que /metrics et /reflexia/metrics restent rapides pendant que des
+requêtes concurrentes arrivent, même lorsque la collecte système est lente :
+les endpoints ne lisent que le cache publié par le sampler Reflexia. Les
+latences sont affichées ; les assertions portent sur le thread qui collecte,
+pas sur des durées sensibles à la charge de la machine (couverture...).
+"""
+
+import asyncio
+import statistics
+import threading
+import time
+
+import httpx
+import pytest
+
+import modules.reflexia.logic.metrics_enhanced as metrics_enhanced
+from app.main import app
+from modules.reflexia.logic.metrics_enhanced import MetricsSampler
+
+COLLECTOR_DELAY_S = 0.3
+# Le router Reflexia porte déjà le préfixe /reflexia et app/main.py en ajoute un
+REFLEXIA = "/reflexia/reflexia"
+
+
+SAMPLER_THREAD = "reflexia-metrics-sampler"
+
+
+def _slow(payload: dict, callers: list[str]):
+    def collector() -> dict:
+        callers.append(threading.current_thread().name)
+        time.sleep(COLLECTOR_DELAY_S)
+        return payload
+
+    return collector
+
+
+def _make_slow_sampler(callers: list[str]) -> MetricsSampler:
+    return MetricsSampler(
+        intervals={"system": 0.0, "containers": 0.0, "modules": 0.0, "logs": 0.0},
+        collectors={
+            "system": _slow(
+                {"cpu_percent": 21.0, "memory_percent": 42.0, "memory_used_bytes": 1024}, callers
+            ),
+            "containers": _slow({"reflexia": "healthy"}, callers),
+            "modules": _slow({"reflexia": {"active": True}}, callers),
+            "logs": _slow({"recent_errors": 0, "recent_warnings": 0}, callers),
+        },
+    )
+
+
+@pytest.fixture
+def collector_callers() -> list[str]:
+    """Noms des threads ayant appelé un collecteur"""
+    return []
+
+
+@pytest.fixture
+def slow_sampler(monkeypatch, collector_callers):
+    """Sampler dont chaque collecte bloque 300 ms, rafraîchi en continu"""
+    sampler = _make_slow_sampler(collector_callers)
+    sampler.refresh(force=True)
+    monkeypatch.setattr(metrics_enhanced, "_sampler", sampler)
+    collector_callers.clear()
+    sampler.start()
+    yield sampler
+    sampler.stop()
+
+
+@pytest.mark.performance
+def test_scrape_latency_under_concurrent_requests(slow_sampler, collector_callers):
+    """100 scrapes + 100 requêtes concurrentes : aucune ne déclenche de collecte"""
+
+    async def timed(client: httpx.AsyncClient, path: str) -> float:
+        started = time.perf_counter()
+        response = await client.get(path)
+        assert response.status_code == 200
+        return time.perf_counter() - started
+
+    async def run_load() -> tuple[list[float], list[float]]:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            scrapes = [timed(client, p) for p in ("/metrics", f"{REFLEXIA}/metrics") * 50]
+            traffic = [timed(client, p) for p in ("/health", f"{REFLEXIA}/check") * 50]
+            results = await asyncio.gather(*scrapes, *traffic)
+        return list(results[: len(scrapes)]), list(results[len(scrapes) :])
+
+    started = time.perf_counter()
+    scrape_latencies, traffic_latencies = asyncio.run(run_load())
+    total = time.perf_counter() - started
+
+    p95_scrape = statistics.quantiles(scrape_latencies, n=20)[-1]
+    print(
+        f"\nScrape p95 {p95_scrape * 1e3:.1f} ms · trafic max "
+        f"{max(traffic_latencies) * 1e3:.1f} ms · total {total:.2f} s "
+        f"(collecte {COLLECTOR_DELAY_S * 1e3:.0f} ms par section)"
+    )
+    # Le sampler a collecté pendant la charge, mais jamais sur le chemin d'une requête
+    assert collector_callers
+    assert set(collector_callers) == {SAMPLER_THREAD}
+
+
+@pytest.mark.performance
+def test_reflexia_metrics_served_from_cache(slow_sampler):
+    async def scrape() -> str:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.get(f"{REFLEXIA}/metrics")
+            return response.text
+
+    body = asyncio.run(scrape())
+
+    assert "reflexia_cpu_usage_percent 21.0" in body
+    assert "reflexia_ram_usage_percent 42.0" in body
+
+
+@pytest.mark.performance
+def test_scrape_does_not_start_sampler(monkeypatch, collector_callers):
+    sampler = _make_slow_sampler(collector_callers)
+    sampler.refresh(force=True)
+    monkeypatch.setattr(metrics_enhanced, "_sampler", sampler)
+    collector_callers.clear()
+
+    async def scrape() -> str:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return (await client.get(f"{REFLEXIA}/metrics")).text
+
+    body = asyncio.run(scrape())
+
+    assert "reflexia_cpu_usage_percent 21.0" in body
+    assert not sampler.is_running()
+    assert collector_callers == []
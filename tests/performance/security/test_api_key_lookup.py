@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+🧪 Benchmark - Authentification par clé API
+
+Résolution d'une clé API vers son token_id avec 100 000 clés émises : une
+empreinte HMAC et une recherche dans l'index, contre l'ancien parcours de
+tous les tokens avec lecture du vault pour chacun.
+"""
+
+import secrets
+import time
+from datetime import datetime
+
+import pytest
+
+from modules.security.crypto import ArkaliaVault, TokenManager, TokenType
+from modules.security.crypto.token_lifecycle import TokenMetadata, TokenStatus
+
+ISSUED_KEYS = 100_000
+
+
+def _issue_in_memory(manager: TokenManager, count: int) -> list[str]:
+    """Émet ``count`` clés dans l'index sans passer par le vault (seule la recherche compte)"""
+    keys = []
+    for _ in range(count):
+        token_id = f"api_key_{secrets.token_urlsafe(16)}"
+        metadata = TokenMetadata(
+            token_id=token_id,
+            token_type=TokenType.API_KEY,
+            status=TokenStatus.ACTIVE,
+            created_at=datetime.now(),
+            expires_at=None,
+            last_used_at=None,
+            usage_count=0,
+            max_usage_count=None,
+            associated_user=None,
+            associated_service="bench",
+            permissions=["read"],
+            client_info={},
+            tags=[],
+        )
+        key = manager._generate_api_key(metadata)
+        metadata.key_digest = manager._api_key_digest(key)
+        manager.token_metadata[token_id] = metadata
+        manager.api_key_index[metadata.key_digest] = token_id
+        keys.append(key)
+    return keys
+
+
+def _lookup_latency(manager: TokenManager, keys: list[str], rounds: int = 2000) -> float:
+    sample = [keys[i * len(keys) // rounds] for i in range(rounds)]
+    started = time.perf_counter()
+    for key in sample:
+        assert manager._lookup_api_key(key) is not None
+    return (time.perf_counter() - started) / rounds
+
+
+@pytest.mark.performance
+def test_api_key_lookup_constant_with_100k_keys(tmp_path):
+    manager = TokenManager(ArkaliaVault(base_dir=tmp_path))
+    vault = manager.vault
+
+    # Ancien chemin : lecture du vault pour chaque token jusqu'à trouver la clé
+    legacy_ids = [
+        manager.generate_token(TokenType.API_KEY, service_id=f"legacy_{i}")[0] for i in range(200)
+    ]
+    target = vault.retrieve_secret(f"token_{legacy_ids[-1]}")
+    vault.cache.invalidate()
+    started = time.perf_counter()
+    for token_id in legacy_ids:
+        if vault.retrieve_secret(f"token_{token_id}") == target:
+            break
+    legacy_200 = time.perf_counter() - started
+
+    small = _lookup_latency(manager, _issue_in_memory(manager, 1_000))
+    keys = _issue_in_memory(manager, ISSUED_KEYS - 1_000)
+    large = _lookup_latency(manager, keys)
+
+    print(
+        f"\nIndex HMAC : {small * 1e6:.1f} µs (1k clés) · {large * 1e6:.1f} µs "
+        f"({len(manager.api_key_index):,} clés) · parcours vault : "
+        f"{legacy_200 * 1e3:.1f} ms pour 200 clés"
+    )
+    assert len(manager.api_key_index) >= ISSUED_KEYS
+    assert large < small * 3
+    assert large < legacy_200 / 100
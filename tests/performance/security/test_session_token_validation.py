@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+🧪 Benchmark - Validation d'un token de session chaud
+
+Revalidation d'un même JWT : claims lus dans le cache par empreinte du token,
+contre ``jwt.decode`` à chaque appel et l'ancien chemin qui relisait aussi la
+clé de signature dans le vault.
+"""
+
+import time
+
+import jwt
+import pytest
+
+from modules.security.crypto import ArkaliaVault, TokenManager, TokenType
+
+ROUNDS = 2_000
+
+
+def _validation_latency(manager: TokenManager, token_value: str) -> float:
+    assert manager.validate_token(token_value)[0] is True
+    started = time.perf_counter()
+    for _ in range(ROUNDS):
+        manager.validate_token(token_value)
+    return (time.perf_counter() - started) / ROUNDS
+
+
+@pytest.mark.performance
+def test_hot_session_validation(tmp_path):
+    cached = TokenManager(ArkaliaVault(base_dir=tmp_path / "cached"), usage_flush_interval=3600)
+    uncached = TokenManager(
+        ArkaliaVault(base_dir=tmp_path / "uncached"), claims_cache_size=0, usage_flush_interval=3600
+    )
+    _, hot = cached.generate_token(TokenType.SESSION, user_id="hot")
+    _, cold = uncached.generate_token(TokenType.SESSION, user_id="hot")
+
+    hit = _validation_latency(cached, hot)
+    decode = _validation_latency(uncached, cold)
+
+    # Ancien chemin : clé relue dans le vault puis jwt.decode, à chaque validation
+    vault = uncached.vault
+    started = time.perf_counter()
+    for _ in range(ROUNDS):
+        jwt.decode(cold, vault.retrieve_secret(uncached.jwt_secret_name), algorithms=["HS256"])
+    legacy = (time.perf_counter() - started) / ROUNDS + decode
+
+    print(
+        f"\nSession chaude : cache {hit * 1e6:.1f} µs · jwt.decode {decode * 1e6:.1f} µs · "
+        f"vault + jwt.decode {legacy * 1e6:.1f} µs"
+    )
+    assert cached.claims_cache.hits >= ROUNDS
+    assert hit < decode
+    assert hit < legacy / 2
+    cached.close()
+    uncached.close()
@@ -77,8 +77,8 @@ def test_metrics_endpoint(mock_memory, mock_cpu):
     assert b"arkalia_cpu_usage" in response.content
 
 
-@patch("psutil.cpu_percent", side_effect=Exception("Test error"))
-def test_metrics_endpoint_error(mock_cpu):
+@patch("app.main.generate_latest", side_effect=Exception("Test error"))
+def test_metrics_endpoint_error(mock_generate):
     """Test de l'endpoint metrics avec erreur"""
     response = client.get("/metrics")
     assert response.status_code == 500
@@ -86,6 +86,15 @@ def test_metrics_endpoint_error(mock_cpu):
     assert "Test error" in response.json()["error"]
 
 
+@patch("psutil.cpu_percent", side_effect=Exception("psutil must not be called"))
+def test_metrics_endpoint_reads_cached_snapshot(mock_cpu):
+    """Le scrape /metrics ne fait aucune mesure psutil sur le chemin de la requête"""
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert b"arkalia_cpu_usage" in response.content
+    mock_cpu.assert_not_called()
+
+
 def test_metrics_middleware():
     """Test du middleware de métriques"""
     # Réinitialiser les compteurs
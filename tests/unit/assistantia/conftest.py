@@ -0,0 +1,139 @@
+"""
+Fixtures AssistantIA : serveur Ollama factice local, cache de réponses vidé.
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+
+class FakeOllamaServer(ThreadingHTTPServer):
+    """Imite ``/api/tags`` et ``/api/generate`` (réponse complète ou NDJSON chunké)"""
+
+    daemon_threads = True
+
+    def __init__(self) -> None:
+        super().__init__(("127.0.0.1", 0), FakeOllamaHandler)
+        self.models = ["mistral:latest", "llama2:latest"]
+        self.tokens = ["Bon", "jour", " !"]
+        self.delay = 0.0
+        self.token_delay = 0.0
+        self.tags_status = 200
+
+        self.lock = threading.Lock()
+        self.connections: set[tuple[str, int]] = set()
+        self.requests: list[tuple[str, str]] = []
+        self.payloads: list[dict] = []
+        self.in_flight: dict[str, int] = {}
+        self.max_in_flight: dict[str, int] = {}
+        self.aborted = 0
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def count(self, path: str) -> int:
+        with self.lock:
+            return sum(1 for _, p in self.requests if p == path)
+
+
+class FakeOllamaHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: FakeOllamaServer
+
+    def log_message(self, format, *args) -> None:  # noqa: A002
+        pass
+
+    def _record(self) -> None:
+        with self.server.lock:
+            self.server.connections.add(self.client_address)
+            self.server.requests.append((self.command, self.path))
+
+    def _send_json(self, status: int, data: dict) -> None:
+        body = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self) -> None:
+        self._record()
+        if self.path == "/api/tags":
+            models = [{"name": name} for name in self.server.models]
+            self._send_json(self.server.tags_status, {"models": models})
+        else:
+            self._send_json(404, {"error": "not found"})
+
+    def do_POST(self) -> None:
+        self._record()
+        payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+        if self.path != "/api/generate":
+            self._send_json(404, {"error": "not found"})
+            return
+        model = payload.get("model", "")
+        if model not in self.server.models:
+            self._send_json(404, {"error": f"model '{model}' not found"})
+            return
+
+        with self.server.lock:
+            self.server.payloads.append(payload)
+            current = self.server.in_flight.get(model, 0) + 1
+            self.server.in_flight[model] = current
+            self.server.max_in_flight[model] = max(self.server.max_in_flight.get(model, 0), current)
+        try:
+            time.sleep(self.server.delay)
+            if payload.get("stream"):
+                self._stream(model)
+            else:
+                self._send_json(200, {"model": model, "response": "".join(self.server.tokens)})
+        finally:
+            with self.server.lock:
+                self.server.in_flight[model] -= 1
+
+    def _stream(self, model: str) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        chunks = [{"model": model, "response": t, "done": False} for t in self.server.tokens]
+        chunks.append({"model": model, "response": "", "done": True})
+        try:
+            for chunk in chunks:
+                data = json.dumps(chunk).encode() + b"\n"
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+                self.wfile.flush()
+                time.sleep(self.server.token_delay)
+            self.wfile.write(b"0\r\n\r\n")
+            self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            # Client parti : la génération s'arrête
+            with self.server.lock:
+                self.server.aborted += 1
+            self.close_connection = True
+
+
+@pytest.fixture
+def fake_ollama():
+    server = FakeOllamaServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture(autouse=True)
+def _empty_response_cache():
+    """Le cache de réponses partagé ne doit pas fuir d'un test à l'autre"""
+    from modules.assistantia.utils.response_cache import get_response_cache
+
+    get_response_cache().clear()
+    yield
+    get_response_cache().clear()
@@ -0,0 +1,100 @@
+import asyncio
+import json
+import os
+
+from fastapi.testclient import TestClient
+
+from modules.assistantia.core import app
+from modules.assistantia.utils import context_provider
+from modules.assistantia.utils.context_provider import ArkaliaContextProvider, default_sources
+
+
+def _provider(tmp_path, check_interval: float = 0.0) -> ArkaliaContextProvider:
+    return ArkaliaContextProvider(default_sources(tmp_path), check_interval=check_interval)
+
+
+def _write_states(tmp_path) -> None:
+    state = tmp_path / "state"
+    (state / "sandozia").mkdir(parents=True)
+    (state / "sandozia" / "snapshot.json").write_text("{}")
+    (state / "zeroia_dashboard.json").write_text(json.dumps({"last_decision": "monitor"}))
+    (state / "reflexia_state.toml").write_text('status = "ok"\n')
+    (state / "cognitive_reactor_state.toml").write_text('status = "idle"\n')
+
+
+def test_all_sources_missing(tmp_path) -> None:
+    context = _provider(tmp_path).refresh()
+    assert context.text == (
+        "ZeroIA: inactive | Reflexia: inactive | Sandozia: inactive | Cognitive: inactive"
+    )
+    assert context.quality == 8.0
+    assert context.version == 1
+
+
+def test_all_sources_active(tmp_path) -> None:
+    _write_states(tmp_path)
+    context = _provider(tmp_path).refresh()
+    assert context.parts == (
+        "ZeroIA: monitor",
+        "Reflexia: ok",
+        "Sandozia: active",
+        "Cognitive: idle",
+    )
+    assert context.quality == 100.0
+
+
+def test_unreadable_source_reports_error(tmp_path) -> None:
+    _write_states(tmp_path)
+    (tmp_path / "state" / "reflexia_state.toml").write_text("<<<<<<< HEAD\n")
+    context = _provider(tmp_path).refresh()
+    assert "Reflexia: error" in context.parts
+    assert context.quality == 80.0
+
+
+def test_unchanged_files_are_not_reparsed(tmp_path) -> None:
+    _write_states(tmp_path)
+    provider = _provider(tmp_path)
+    first = provider.refresh()
+    for _ in range(5):
+        assert provider.refresh() is first
+    assert all(probe.loads == 1 for _, probe in provider.sources)
+
+    dashboard = tmp_path / "state" / "zeroia_dashboard.json"
+    dashboard.write_text(json.dumps({"last_decision": "reduce_load!"}))
+    os.utime(dashboard, ns=(1, 1))
+    updated = provider.refresh()
+    assert updated.version == 2
+    assert updated.parts[0] == "ZeroIA: reduce_load!"
+    assert provider.sources[1][1].loads == 1
+
+
+def test_current_serves_memory_within_interval(tmp_path) -> None:
+    _write_states(tmp_path)
+    provider = _provider(tmp_path, check_interval=60)
+
+    async def scenario():
+        first = await provider.current()
+        (tmp_path / "state" / "reflexia_state.toml").write_text('status = "alert"\n')
+        second = await provider.current()
+        provider.check_interval = 0
+        third = await provider.current()
+        return first, second, third
+
+    first, second, third = asyncio.run(scenario())
+    assert second is first
+    assert "Reflexia: alert" in third.parts
+
+
+def test_health_uses_context_provider(tmp_path, monkeypatch) -> None:
+    _write_states(tmp_path)
+    monkeypatch.setattr(context_provider, "_provider", _provider(tmp_path))
+
+    with TestClient(app) as client:
+        modules = client.get("/api/v1/health").json()["arkalia_modules"]
+
+    assert modules == {
+        "ZeroIA": "monitor",
+        "Reflexia": "ok",
+        "Sandozia": "active",
+        "Cognitive": "idle",
+    }
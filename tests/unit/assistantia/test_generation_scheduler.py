@@ -0,0 +1,170 @@
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from modules.assistantia.core import app
+from modules.assistantia.utils.scheduler import (
+    PRIORITY_HIGH,
+    GenerationScheduler,
+    SchedulerOverloaded,
+    request_identity,
+)
+
+MODEL = "mistral:latest"
+
+
+def test_priority_then_round_robin_between_clients() -> None:
+    async def scenario():
+        scheduler = GenerationScheduler(max_concurrency_per_model=1)
+        order: list[str] = []
+        await scheduler.acquire(MODEL)  # créneau occupé : tout le reste attend
+
+        async def request(name: str, client_id: str, priority: int = 1) -> None:
+            async with scheduler.slot(MODEL, client_id, priority):
+                order.append(name)
+
+        tasks = []
+        for name, client_id, priority in [
+            ("a1", "A", 1),
+            ("a2", "A", 1),
+            ("a3", "A", 1),
+            ("b1", "B", 1),
+            ("h1", "C", PRIORITY_HIGH),
+        ]:
+            tasks.append(asyncio.create_task(request(name, client_id, priority)))
+            await asyncio.sleep(0)
+        assert scheduler.queued(MODEL) == 5
+
+        scheduler.release(MODEL)
+        await asyncio.gather(*tasks)
+        return order
+
+    assert asyncio.run(scenario()) == ["h1", "a1", "b1", "a2", "a3"]
+
+
+def test_sheds_when_estimated_wait_exceeds_budget() -> None:
+    async def scenario():
+        scheduler = GenerationScheduler(max_concurrency_per_model=1, latency_budget=1.0)
+        await scheduler.acquire(MODEL)
+        scheduler.release(MODEL, service_time=2.0)
+        await scheduler.acquire(MODEL)
+        with pytest.raises(SchedulerOverloaded) as excinfo:
+            await scheduler.acquire(MODEL)
+        return scheduler, excinfo.value
+
+    scheduler, error = asyncio.run(scenario())
+    assert error.retry_after == 2
+    assert scheduler.shed == 1
+    assert scheduler.queued(MODEL) == 0
+
+
+def test_bounded_queue() -> None:
+    async def scenario():
+        scheduler = GenerationScheduler(max_concurrency_per_model=1, max_queue=2)
+        await scheduler.acquire(MODEL)
+        waiters = [asyncio.create_task(scheduler.acquire(MODEL)) for _ in range(2)]
+        await asyncio.sleep(0)
+        with pytest.raises(SchedulerOverloaded):
+            await scheduler.acquire(MODEL)
+        for task in waiters:
+            task.cancel()
+        await asyncio.gather(*waiters, return_exceptions=True)
+        return scheduler
+
+    scheduler = asyncio.run(scenario())
+    # Les attentes annulées quittent la file
+    assert scheduler.queued(MODEL) == 0
+    assert scheduler.in_flight(MODEL) == 1
+
+
+def test_identical_prompts_are_coalesced() -> None:
+    calls = 0
+
+    async def generate() -> str:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return "réponse"
+
+    async def scenario():
+        scheduler = GenerationScheduler()
+        results = await asyncio.gather(
+            *(scheduler.run(MODEL, generate, coalesce_key="same") for _ in range(5)),
+            scheduler.run(MODEL, generate, coalesce_key="other"),
+        )
+        return scheduler, results
+
+    scheduler, results = asyncio.run(scenario())
+    assert results == ["réponse"] * 6
+    assert calls == 2
+    assert scheduler.coalesced == 4
+    assert scheduler.in_flight(MODEL) == 0
+
+
+def test_coalesced_generation_survives_until_last_waiter_leaves() -> None:
+    async def scenario():
+        scheduler = GenerationScheduler()
+        gate = asyncio.Event()
+
+        async def generate() -> str:
+            await gate.wait()
+            return "ok"
+
+        first = asyncio.create_task(scheduler.run(MODEL, generate, coalesce_key="k"))
+        second = asyncio.create_task(scheduler.run(MODEL, generate, coalesce_key="k"))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        await asyncio.sleep(0.01)
+        gate.set()
+        result = await second
+
+        third = asyncio.create_task(scheduler.run(MODEL, asyncio.Event().wait, coalesce_key="x"))
+        await asyncio.sleep(0.01)
+        inflight = scheduler._inflight["x"].task
+        third.cancel()
+        await asyncio.gather(third, return_exceptions=True)
+        await asyncio.sleep(0)
+        return result, first.cancelled(), inflight.cancelled(), scheduler.in_flight(MODEL)
+
+    result, first_cancelled, orphan_cancelled, in_flight = asyncio.run(scenario())
+    assert result == "ok"
+    assert first_cancelled
+    assert orphan_cancelled
+    assert in_flight == 0
+
+
+def test_chat_returns_503_with_retry_after_when_shed() -> None:
+    query = AsyncMock(side_effect=SchedulerOverloaded(MODEL, 3, "file pleine"))
+
+    with (
+        patch("modules.assistantia.core.real_query_ollama", query),
+        patch("modules.assistantia.core._check_ollama_health", return_value=True),
+        TestClient(app) as client,
+    ):
+        response = client.post("/api/v1/chat", json={"message": "Bonjour"})
+
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "3"
+
+
+def test_chat_passes_client_identity_to_scheduler() -> None:
+    seen = []
+
+    async def query(prompt: str, model: str, temperature: float) -> str:
+        seen.append(request_identity.get())
+        return "ok"
+
+    with (
+        patch("modules.assistantia.core.real_query_ollama", query),
+        patch("modules.assistantia.core._check_ollama_health", return_value=True),
+        TestClient(app) as client,
+    ):
+        client.post(
+            "/api/v1/chat",
+            json={"message": "Bonjour", "use_cache": False},
+            headers={"X-Client-ID": "dashboard-1", "X-Priority": "high"},
+        )
+
+    assert seen == [("dashboard-1", PRIORITY_HIGH)]
@@ -0,0 +1,168 @@
+import asyncio
+import json
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from modules.assistantia.core import app
+from modules.assistantia.utils import ollama_connector
+from modules.assistantia.utils.ollama_connector import (
+    AsyncOllamaClient,
+    aquery_ollama,
+    close_ollama_client,
+    resolve_model,
+)
+
+
+def _run(coro_factory, *args):
+    async def main():
+        try:
+            return await coro_factory(*args)
+        finally:
+            await close_ollama_client()
+
+    return asyncio.run(main())
+
+
+def test_resolve_model_alias() -> None:
+    catalog = {"models": [{"name": "mistral:latest"}]}
+    assert resolve_model("mistral", catalog) == "mistral:latest"
+    assert resolve_model("mistral:latest", catalog) == "mistral:latest"
+    assert resolve_model("llama2", None) == "llama2"
+    with pytest.raises(ValueError):
+        resolve_model("inconnu", catalog)
+
+
+def test_generate_reuses_pooled_connection(fake_ollama) -> None:
+    async def scenario():
+        client = AsyncOllamaClient(base_url=fake_ollama.url)
+        try:
+            return [await client.generate("Salut", "mistral:latest") for _ in range(3)]
+        finally:
+            await client.aclose()
+
+    assert _run(scenario) == ["Bonjour !"] * 3
+    # Connexion keep-alive unique pour les trois générations
+    assert len(fake_ollama.connections) == 1
+    assert fake_ollama.payloads[0]["stream"] is False
+    assert fake_ollama.payloads[0]["options"] == {"temperature": 0.7}
+
+
+def test_stream_yields_tokens_in_order(fake_ollama) -> None:
+    async def scenario():
+        client = AsyncOllamaClient(base_url=fake_ollama.url)
+        try:
+            return [token async for token in client.stream("Salut", "mistral:latest")]
+        finally:
+            await client.aclose()
+
+    assert _run(scenario) == ["Bon", "jour", " !"]
+    assert fake_ollama.payloads[0]["stream"] is True
+
+
+def test_concurrency_bounded_per_model(fake_ollama) -> None:
+    fake_ollama.delay = 0.1
+
+    async def scenario():
+        client = AsyncOllamaClient(base_url=fake_ollama.url, max_concurrency_per_model=1)
+        try:
+            await asyncio.gather(
+                *(client.generate(f"x{i}", "mistral:latest") for i in range(3)),
+                client.generate("x", "llama2:latest"),
+            )
+        finally:
+            await client.aclose()
+
+    started = time.perf_counter()
+    _run(scenario)
+    elapsed = time.perf_counter() - started
+
+    assert fake_ollama.max_in_flight == {"mistral:latest": 1, "llama2:latest": 1}
+    # Les trois générations mistral sont sérialisées, llama2 passe en parallèle
+    assert 0.3 <= elapsed < 0.6
+
+
+def test_closing_stream_aborts_upstream_generation(fake_ollama) -> None:
+    fake_ollama.tokens = [f"t{i} " for i in range(500)]
+    fake_ollama.token_delay = 0.01
+
+    async def scenario():
+        client = AsyncOllamaClient(base_url=fake_ollama.url)
+        tokens = client.stream("Raconte", "mistral:latest")
+        received = [await anext(tokens), await anext(tokens)]
+        await tokens.aclose()
+        in_flight = client.in_flight("mistral:latest")
+        await client.aclose()
+        return received, in_flight
+
+    received, in_flight = _run(scenario)
+    assert received == ["t0 ", "t1 "]
+    assert in_flight == 0
+
+    deadline = time.time() + 5
+    while fake_ollama.aborted == 0 and time.time() < deadline:
+        time.sleep(0.02)
+    assert fake_ollama.aborted == 1
+
+
+def test_aquery_ollama_resolves_alias(fake_ollama, monkeypatch) -> None:
+    monkeypatch.setattr(ollama_connector, "OLLAMA_BASE_URL", fake_ollama.url)
+
+    assert _run(aquery_ollama, "Hello", "mistral") == "Bonjour !"
+    assert fake_ollama.payloads[-1]["model"] == "mistral:latest"
+    with pytest.raises(ValueError):
+        _run(aquery_ollama, "Hello", "inconnu")
+
+
+def test_aquery_ollama_unreachable(monkeypatch) -> None:
+    monkeypatch.setattr(ollama_connector, "OLLAMA_BASE_URL", "http://127.0.0.1:9")
+
+    assert "Erreur IA" in _run(aquery_ollama, "Hello", "mistral")
+
+
+def _parse_sse(body: str) -> list[tuple[str, dict]]:
+    events = []
+    for frame in body.strip().split("\n\n"):
+        event, data = "message", {}
+        for line in frame.splitlines():
+            if line.startswith("event: "):
+                event = line[len("event: ") :]
+            elif line.startswith("data: "):
+                data = json.loads(line[len("data: ") :])
+        events.append((event, data))
+    return events
+
+
+def test_chat_stream_endpoint(fake_ollama, monkeypatch) -> None:
+    monkeypatch.setattr(ollama_connector, "OLLAMA_BASE_URL", fake_ollama.url)
+
+    with TestClient(app) as client:
+        response = client.post(
+            "/api/v1/chat/stream", json={"message": "Bonjour", "include_context": False}
+        )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = _parse_sse(response.text)
+    assert [data["token"] for event, data in events if event == "message"] == [
+        "Bon",
+        "jour",
+        " !",
+    ]
+    event, done = events[-1]
+    assert event == "done"
+    assert done["model_used"] == "mistral:latest"
+
+
+def test_chat_stream_unknown_model(fake_ollama, monkeypatch) -> None:
+    monkeypatch.setattr(ollama_connector, "OLLAMA_BASE_URL", fake_ollama.url)
+
+    with TestClient(app) as client:
+        response = client.post(
+            "/api/v1/chat/stream",
+            json={"message": "Bonjour", "model": "inconnu", "include_context": False},
+        )
+
+    assert response.status_code == 400
+    assert fake_ollama.count("/api/generate") == 0
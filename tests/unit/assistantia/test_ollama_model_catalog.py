@@ -0,0 +1,142 @@
+import asyncio
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from modules.assistantia.core import app
+from modules.assistantia.utils import ollama_connector
+from modules.assistantia.utils.model_catalog import ModelCatalog
+from modules.assistantia.utils.ollama_connector import AsyncOllamaClient, aquery_ollama
+
+TAGS = {"models": [{"name": "mistral:latest"}, {"name": "mistral:7b"}, {"name": "llama2:13b"}]}
+
+
+class FakeFetch:
+    def __init__(self, data=TAGS) -> None:
+        self.data = data
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(0)
+        return self.data
+
+
+def test_resolve_from_index() -> None:
+    async def scenario():
+        catalog = ModelCatalog(FakeFetch())
+        assert catalog.resolve("mistral") == "mistral"  # catalogue non chargé
+        await catalog.ready()
+        return catalog
+
+    catalog = asyncio.run(scenario())
+    assert catalog.resolve("mistral") == "mistral:latest"
+    assert catalog.resolve("mistral:7b") == "mistral:7b"
+    assert catalog.resolve("llama2") == "llama2:13b"
+    with pytest.raises(ValueError):
+        catalog.resolve("inconnu")
+
+
+def test_concurrent_cold_start_fetches_once() -> None:
+    fetch = FakeFetch()
+
+    async def scenario():
+        catalog = ModelCatalog(fetch)
+        await asyncio.gather(*(catalog.ready() for _ in range(10)))
+
+    asyncio.run(scenario())
+    assert fetch.calls == 1
+
+
+def test_stale_catalog_refreshes_in_background() -> None:
+    fetch = FakeFetch()
+
+    async def scenario():
+        catalog = ModelCatalog(fetch, ttl=0.05)
+        await catalog.ready()
+        await catalog.ready()
+        assert fetch.calls == 1  # encore frais
+        await asyncio.sleep(0.06)
+        await catalog.ready()  # ne bloque pas : rafraîchissement planifié
+        assert fetch.calls == 1
+        await asyncio.sleep(0.01)
+        assert fetch.calls == 2
+
+    asyncio.run(scenario())
+
+
+def test_failed_fetch_marks_unhealthy_and_retries() -> None:
+    fetch = FakeFetch(data=None)
+
+    async def scenario():
+        catalog = ModelCatalog(fetch, ttl=60, retry_interval=0.02)
+        await catalog.ready()
+        assert not catalog.is_available
+        assert catalog.resolve("mistral") == "mistral"
+        fetch.data = TAGS
+        await asyncio.sleep(0.03)
+        await catalog.ready()
+        await asyncio.sleep(0.01)
+        return catalog
+
+    catalog = asyncio.run(scenario())
+    assert catalog.is_available
+    assert catalog.status()["consecutive_failures"] == 0
+    assert fetch.calls == 2
+
+
+def test_periodic_probe() -> None:
+    fetch = FakeFetch()
+
+    async def scenario():
+        catalog = ModelCatalog(fetch, ttl=0.02)
+        catalog.start()
+        await asyncio.sleep(0.07)
+        await catalog.stop()
+
+    asyncio.run(scenario())
+    assert fetch.calls >= 3
+
+
+def test_generation_failure_marks_ollama_unreachable() -> None:
+    async def scenario():
+        client = AsyncOllamaClient(base_url="http://127.0.0.1:9")
+        try:
+            with pytest.raises(httpx.ConnectError):
+                await client.generate("x", "mistral:latest")
+            return client.catalog.status()
+        finally:
+            await client.aclose()
+
+    status = asyncio.run(scenario())
+    assert status["healthy"] is False
+    assert status["consecutive_failures"] == 1
+
+
+def test_hot_path_makes_no_catalog_calls(fake_ollama, monkeypatch) -> None:
+    monkeypatch.setattr(ollama_connector, "OLLAMA_BASE_URL", fake_ollama.url)
+
+    async def scenario():
+        try:
+            return [await aquery_ollama("Salut", "mistral") for _ in range(5)]
+        finally:
+            await ollama_connector.close_ollama_client()
+
+    assert asyncio.run(scenario()) == ["Bonjour !"] * 5
+    assert fake_ollama.count("/api/tags") == 1
+    assert fake_ollama.count("/api/generate") == 5
+
+
+def test_chat_endpoint_uses_cached_health(fake_ollama, monkeypatch) -> None:
+    monkeypatch.setattr(ollama_connector, "OLLAMA_BASE_URL", fake_ollama.url)
+
+    with TestClient(app) as client:
+        for _ in range(3):
+            response = client.post("/api/v1/chat", json={"message": "Bonjour", "model": "mistral"})
+            assert response.status_code == 200
+        models = client.get("/api/v1/models").json()["models"]
+
+    assert response.json()["response"] == "Bonjour !"
+    assert [m["name"] for m in models] == fake_ollama.models
+    assert fake_ollama.count("/api/tags") == 1
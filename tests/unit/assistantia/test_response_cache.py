@@ -0,0 +1,123 @@
+import time
+from unittest.mock import AsyncMock, patch
+
+from fastapi.testclient import TestClient
+
+from modules.assistantia.core import app
+from modules.assistantia.utils.response_cache import MinHasher, ResponseCache, normalize_prompt
+
+STATUS = "What is the system status?"
+
+
+def test_normalize_prompt() -> None:
+    assert normalize_prompt("  What   IS the\nsystem status? ") == "what is the system status?"
+
+
+def test_exact_hit_is_keyed_by_model_temperature_and_context() -> None:
+    cache = ResponseCache()
+    cache.put("mistral:latest", 0.7, STATUS, "All green", context="ZeroIA: ok")
+
+    hit = cache.get("mistral:latest", 0.7, "what is  the system STATUS?", context="ZeroIA: ok")
+    assert hit is not None and hit.response == "All green" and hit.kind == "exact"
+    assert cache.get("llama2:latest", 0.7, STATUS, context="ZeroIA: ok") is None
+    assert cache.get("mistral:latest", 0.2, STATUS, context="ZeroIA: ok") is None
+    assert cache.get("mistral:latest", 0.7, STATUS, context="ZeroIA: alert") is None
+    assert cache.stats["hits_exact"] == 1
+    assert cache.stats["misses"] == 3
+
+
+def test_ttl_expiry() -> None:
+    cache = ResponseCache(ttl=0.05)
+    cache.put("m", 0.7, STATUS, "All green")
+    assert cache.get("m", 0.7, STATUS) is not None
+    time.sleep(0.06)
+    assert cache.get("m", 0.7, STATUS) is None
+    assert len(cache) == 0
+
+
+def test_lru_bound() -> None:
+    cache = ResponseCache(max_entries=2)
+    cache.put("m", 0.7, "a", "A")
+    cache.put("m", 0.7, "b", "B")
+    cache.get("m", 0.7, "a")  # "a" devient le plus récent
+    cache.put("m", 0.7, "c", "C")
+
+    assert len(cache) == 2
+    assert cache.get("m", 0.7, "b") is None
+    assert cache.get("m", 0.7, "a").response == "A"
+    assert cache.stats["evictions"] == 1
+
+
+def test_persistent_backing(tmp_path) -> None:
+    db = tmp_path / "cache.db"
+    cache = ResponseCache(max_entries=2, persist_path=db)
+    for prompt in ("a", "b", "c"):
+        cache.put("m", 0.7, prompt, prompt.upper())
+    cache.close()
+
+    reloaded = ResponseCache(max_entries=2, persist_path=db)
+    assert reloaded.get("m", 0.7, "a") is None
+    assert reloaded.get("m", 0.7, "c").response == "C"
+    assert len(reloaded) == 2
+    reloaded.close()
+
+
+def test_similarity_tier() -> None:
+    cache = ResponseCache(similarity_threshold=0.6)
+    cache.put("m", 0.7, STATUS, "All green", context="ctx")
+
+    hit = cache.get("m", 0.7, "What is the system status ??", context="ctx")
+    assert hit is not None and hit.kind == "similar" and hit.similarity >= 0.6
+    assert cache.get("m", 0.7, "Restart the sandozia container now", context="ctx") is None
+    # Jamais de réponse similaire d'un autre modèle ou contexte
+    assert cache.get("m", 0.7, "What is the system status ??", context="other") is None
+
+
+def test_similarity_tier_is_opt_in() -> None:
+    cache = ResponseCache()
+    cache.put("m", 0.7, STATUS, "All green")
+    assert cache.hasher is None
+    assert cache.get("m", 0.7, "What is the system status ??") is None
+
+
+def test_minhash_estimates_jaccard() -> None:
+    hasher = MinHasher(num_perm=128, bands=32)
+    same = hasher.similarity(hasher.signature("abcdefgh"), hasher.signature("abcdefgh"))
+    far = hasher.similarity(hasher.signature("abcdefgh"), hasher.signature("zyxwvuts"))
+    assert same == 1.0
+    assert far < 0.2
+
+
+def test_chat_serves_repeated_prompt_from_cache() -> None:
+    query = AsyncMock(return_value="Tout est nominal")
+    payload = {"message": "Quel est l'état du système ?", "include_context": False}
+
+    with (
+        patch("modules.assistantia.core.real_query_ollama", query),
+        patch("modules.assistantia.core._check_ollama_health", return_value=True),
+        TestClient(app) as client,
+    ):
+        first = client.post("/api/v1/chat", json=payload).json()
+        second = client.post("/api/v1/chat", json=payload).json()
+        bypass = client.post("/api/v1/chat", json={**payload, "use_cache": False}).json()
+
+    assert first["cached"] is False and second["cached"] is True
+    assert second["response"] == "Tout est nominal"
+    assert bypass["cached"] is False
+    assert query.await_count == 2
+
+
+def test_chat_does_not_cache_errors() -> None:
+    query = AsyncMock(return_value="Erreur IA: connexion refusée")
+    payload = {"message": "Bonjour", "include_context": False}
+
+    with (
+        patch("modules.assistantia.core.real_query_ollama", query),
+        patch("modules.assistantia.core._check_ollama_health", return_value=True),
+        TestClient(app) as client,
+    ):
+        client.post("/api/v1/chat", json=payload)
+        response = client.post("/api/v1/chat", json=payload).json()
+
+    assert response["cached"] is False
+    assert query.await_count == 2
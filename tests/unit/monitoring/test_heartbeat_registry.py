@@ -0,0 +1,77 @@
+"""Tests pour le registre de heartbeats des modules"""
+
+import os
+
+import modules.monitoring.heartbeat_registry as heartbeat_registry
+from modules.monitoring.heartbeat_registry import HeartbeatRegistry, StatCachedProbe
+
+
+def test_heartbeat_upsert_and_read(tmp_path):
+    registry = HeartbeatRegistry(tmp_path / "health.db")
+
+    assert registry.heartbeat("zeroia", "active", {"last_decision": "monitor"})
+    assert registry.heartbeat("zeroia", "degraded", {"last_decision": "reduce_load"})
+    assert registry.heartbeat("sandozia")
+
+    beats = registry.read_all()
+    assert set(beats) == {"zeroia", "sandozia"}
+    assert beats["zeroia"]["status"] == "degraded"
+    assert beats["zeroia"]["details"] == {"last_decision": "reduce_load"}
+    assert beats["zeroia"]["stale"] is False
+
+
+def test_heartbeat_staleness(tmp_path):
+    registry = HeartbeatRegistry(tmp_path / "health.db", stale_after=60)
+    registry.heartbeat("zeroia")
+    updated_at = registry.read_all()["zeroia"]["updated_at"]
+
+    assert registry.read_all(now=updated_at + 30)["zeroia"]["stale"] is False
+    assert registry.read_all(now=updated_at + 61)["zeroia"]["stale"] is True
+
+
+def test_registry_shared_between_instances(tmp_path):
+    writer = HeartbeatRegistry(tmp_path / "health.db")
+    reader = HeartbeatRegistry(tmp_path / "health.db")
+
+    writer.heartbeat("sandozia", details={"snapshots_count": 3})
+
+    assert reader.read_all()["sandozia"]["details"]["snapshots_count"] == 3
+
+
+def test_stat_probe_reloads_only_on_change(tmp_path):
+    state = tmp_path / "state.json"
+    state.write_text("a")
+    probe = StatCachedProbe(state, lambda path: {"content": path.read_text()})
+
+    assert probe.read() == {"content": "a"}
+    assert probe.read() == {"content": "a"}
+    assert probe.loads == 1
+
+    state.write_text("bb")
+    assert probe.read() == {"content": "bb"}
+    assert probe.loads == 2
+
+
+def test_stat_probe_directory_tracks_entries(tmp_path):
+    directory = tmp_path / "journal"
+    directory.mkdir()
+    probe = StatCachedProbe(directory, lambda path: {"count": len(os.listdir(path))})
+
+    assert probe.read() == {"count": 0}
+    (directory / "segment_1").touch()
+    # mtime du répertoire modifiée par la création d'entrée
+    os.utime(directory, ns=(0, os.stat(directory).st_mtime_ns + 1))
+    assert probe.read() == {"count": 1}
+
+
+def test_stat_probe_missing_path(tmp_path):
+    probe = StatCachedProbe(tmp_path / "missing", lambda path: {})
+    assert probe.read() is None
+
+
+def test_publish_heartbeat_never_raises(monkeypatch):
+    def broken():
+        raise RuntimeError("disk full")
+
+    monkeypatch.setattr(heartbeat_registry, "get_heartbeat_registry", broken)
+    assert heartbeat_registry.publish_heartbeat("zeroia") is False
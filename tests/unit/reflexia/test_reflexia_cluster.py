@@ -0,0 +1,192 @@
+# 🧪 tests/unit/reflexia/test_reflexia_cluster.py
+"""Tests du mode agrégation multi-nœuds de Reflexia"""
+
+import os
+import socket
+import struct
+import tempfile
+import time
+
+import pytest
+import toml
+
+from modules.reflexia.logic.cluster import (
+    NodeMetrics,
+    ReflexiaAgent,
+    ReflexiaAggregator,
+    SocketTransport,
+    SpoolTransport,
+    decode_frame,
+    encode_frame,
+    main,
+)
+
+
+def _wait_for(predicate, timeout: float = 2.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return predicate()
+
+
+def test_frame_roundtrip_is_compact() -> None:
+    node = NodeMetrics("node-a", 1700000000.5, 42.5, 61.25, 70.0, 12.0, 4, 2)
+
+    frame = encode_frame(node)
+
+    assert len(frame) < 64
+    assert decode_frame(frame) == node
+
+
+def test_invalid_frames_are_rejected() -> None:
+    aggregator = ReflexiaAggregator()
+
+    assert aggregator.ingest(b"garbage") is None
+    assert aggregator.ingest(b"XXXX" + encode_frame(NodeMetrics("n", 0, 1, 1))[4:]) is None
+    assert aggregator.frames_rejected == 2
+
+
+def test_spool_fan_in_and_percentiles(tmp_path) -> None:
+    spool = tmp_path / "spool"
+    for i, cpu in enumerate([10, 20, 30, 40, 95]):
+        ReflexiaAgent(f"node-{i}", SpoolTransport(spool)).push(
+            {"cpu": cpu, "ram": 50 + i, "latency": 5 * i, "errors": 1}
+        )
+
+    aggregator = ReflexiaAggregator()
+    assert aggregator.ingest_spool(spool) == 5
+    assert list(spool.glob("*.frame")) == []
+
+    view = aggregator.cluster_view()
+    assert view["active_nodes"] == 5
+    assert view["cpu"] == {"p50": 30.0, "p90": 95.0, "p99": 95.0}
+    assert view["latency_max"] == 20.0
+    assert view["errors_total"] == 5
+
+
+def test_stale_nodes_excluded_from_percentiles() -> None:
+    aggregator = ReflexiaAggregator(stale_after=30)
+    now = time.time()
+    aggregator.ingest(encode_frame(NodeMetrics("fresh", now, 20.0, 30.0)))
+    aggregator.ingest(encode_frame(NodeMetrics("old", now - 120, 99.0, 99.0)))
+
+    view = aggregator.cluster_view(now)
+
+    assert view["nodes"]["old"]["stale"] is True
+    assert view["nodes"]["fresh"]["stale"] is False
+    assert view["active_nodes"] == 1 and view["stale_nodes"] == 1
+    assert view["cpu"]["p99"] == 20.0
+
+
+def test_out_of_order_frame_does_not_override_newer() -> None:
+    aggregator = ReflexiaAggregator()
+    aggregator.ingest(encode_frame(NodeMetrics("n", 200.0, 50.0, 50.0)))
+    aggregator.ingest(encode_frame(NodeMetrics("n", 100.0, 10.0, 10.0)))
+
+    assert aggregator.cluster_view(now=201.0)["nodes"]["n"]["cpu"] == 50.0
+
+
+def test_unix_socket_fan_in() -> None:
+    address = os.path.join(tempfile.mkdtemp(prefix="rfx"), "agg.sock")
+    aggregator = ReflexiaAggregator()
+    aggregator.serve(address)
+    try:
+        agents = [ReflexiaAgent(f"node-{i}", SocketTransport(address)) for i in range(3)]
+        for _ in range(2):
+            for i, agent in enumerate(agents):
+                agent.push({"cpu": 10.0 * (i + 1), "ram": 40.0})
+
+        assert _wait_for(lambda: aggregator.frames_received == 6)
+        assert aggregator.cluster_view()["active_nodes"] == 3
+        for agent in agents:
+            agent.transport.close()
+    finally:
+        aggregator.shutdown()
+
+
+def test_tcp_socket_fan_in() -> None:
+    aggregator = ReflexiaAggregator()
+    address = aggregator.serve(("127.0.0.1", 0))
+    try:
+        transport = SocketTransport(address)
+        ReflexiaAgent("tcp-node", transport).push({"cpu": 33.0, "ram": 44.0})
+        assert _wait_for(lambda: "tcp-node" in aggregator.cluster_view()["nodes"])
+        transport.close()
+    finally:
+        aggregator.shutdown()
+
+
+def test_oversized_frame_closes_connection() -> None:
+    aggregator = ReflexiaAggregator()
+    address = aggregator.serve(("127.0.0.1", 0))
+    try:
+        with socket.create_connection(address, timeout=2.0) as sock:
+            sock.sendall(struct.pack("!I", 0xFFFFFFFF))
+            assert sock.recv(1) == b""  # fermeture côté agrégateur
+        assert aggregator.frames_rejected == 1
+        assert aggregator.cluster_view()["nodes"] == {}
+    finally:
+        aggregator.shutdown()
+
+
+def test_publish_feeds_monitor_status_and_zeroia(tmp_path) -> None:
+    from modules.zeroia.reason_loop import load_reflexia_state
+
+    aggregator = ReflexiaAggregator()
+    now = time.time()
+    for i, cpu in enumerate([20.0, 30.0, 95.0]):
+        aggregator.ingest(encode_frame(NodeMetrics(f"n{i}", now, cpu, 40.0)))
+
+    path = tmp_path / "reflexia_cluster_state.toml"
+    result = aggregator.publish(path, zeroia_path=None)
+
+    assert result["status"] == "🛑 surcharge CPU"
+    state = load_reflexia_state(path)
+    assert state["metrics"]["cpu"] == pytest.approx(95.0)
+    assert state["metrics"]["nodes_active"] == 3
+    assert toml.load(path)["status"] == result["status"]
+
+
+def test_publish_updates_zeroia_reflexia_state(tmp_path) -> None:
+    from modules.zeroia.reason_loop import load_reflexia_state
+
+    zeroia_path = tmp_path / "reflexia_state.toml"
+    zeroia_path.write_text("[decision_metrics]\ncpu_threshold = 80\n")
+    aggregator = ReflexiaAggregator()
+    aggregator.ingest(encode_frame(NodeMetrics("n0", time.time(), 97.0, 40.0)))
+
+    aggregator.publish(tmp_path / "cluster.toml", zeroia_path=zeroia_path)
+
+    state = load_reflexia_state(zeroia_path)
+    assert state["status"] == "active"
+    assert state["decision"]["last_decision"] == "reduce_load"
+    assert state["cluster"]["nodes_active"] == 1
+    assert state["decision_metrics"]["cpu_threshold"] == 80
+
+
+def test_main_aggregate_requires_source() -> None:
+    with pytest.raises(SystemExit):
+        main(["aggregate"])
+
+
+def test_dark_cluster_not_reported_healthy(tmp_path) -> None:
+    from modules.zeroia.reason_loop import load_reflexia_state
+
+    zeroia_path = tmp_path / "reflexia_state.toml"
+    aggregator = ReflexiaAggregator(stale_after=30.0)
+    old = time.time() - 120
+    for i in range(2):
+        aggregator.ingest(encode_frame(NodeMetrics(f"n{i}", old, 10.0, 20.0)))
+
+    result = aggregator.publish(tmp_path / "cluster.toml", zeroia_path=zeroia_path)
+
+    assert result["metrics"]["nodes_active"] == 0
+    assert result["status"] == "degraded"
+    assert load_reflexia_state(zeroia_path)["decision"]["last_decision"] == "monitor"
+    # Aucun nœud jamais vu : même verdict
+    assert (
+        ReflexiaAggregator().publish(tmp_path / "empty.toml", zeroia_path=None)["status"]
+        == "degraded"
+    )
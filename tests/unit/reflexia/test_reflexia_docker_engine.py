@@ -0,0 +1,173 @@
+# 🧪 tests/unit/reflexia/test_reflexia_docker_engine.py
+"""Tests du client Docker Engine (socket Unix) contre un faux démon local"""
+
+import json
+import os
+import queue
+import socketserver
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler
+
+import pytest
+
+from modules.reflexia.logic.docker_engine import DockerContainerMonitor, DockerEngineClient
+
+
+class FakeDockerDaemon:
+    """Faux démon Docker : /containers/json et flux /events chunké"""
+
+    def __init__(self, socket_path: str) -> None:
+        self.socket_path = socket_path
+        self.containers = [
+            {"Names": ["/zeroia"], "State": "running", "Status": "Up 2 hours (healthy)"},
+            {"Names": ["/reflexia"], "State": "running", "Status": "Up 5 minutes"},
+            {"Names": ["/postgres"], "State": "running", "Status": "Up 1 hour (healthy)"},
+        ]
+        self.events: queue.Queue = queue.Queue()
+        self.connections = 0
+        self.requests: list[str] = []
+        daemon = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self) -> None:
+                daemon.connections += 1
+                super().setup()
+
+            def log_message(self, *args) -> None:
+                pass
+
+            def do_GET(self) -> None:
+                daemon.requests.append(self.path)
+                if self.path.startswith("/containers/json"):
+                    body = json.dumps(daemon.containers).encode()
+                    self.send_response(200)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                elif self.path.startswith("/events"):
+                    self.send_response(200)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Transfer-Encoding", "chunked")
+                    self.end_headers()
+                    self.wfile.flush()
+                    while True:
+                        event = daemon.events.get()
+                        if event is None:
+                            self.wfile.write(b"0\r\n\r\n")
+                            return
+                        data = json.dumps(event).encode() + b"\n"
+                        self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+                        self.wfile.flush()
+                else:
+                    self.send_error(404)
+
+        class Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+            daemon_threads = True
+
+        self.server = Server(socket_path, Handler)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def start(self) -> "FakeDockerDaemon":
+        self.thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.events.put(None)
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def _container_event(name: str, action: str) -> dict:
+    return {"Type": "container", "Action": action, "Actor": {"Attributes": {"name": name}}}
+
+
+def _wait_for(predicate, timeout: float = 2.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return predicate()
+
+
+@pytest.fixture
+def socket_path():
+    directory = tempfile.mkdtemp(prefix="dkr")
+    yield os.path.join(directory, "docker.sock")
+
+
+@pytest.fixture
+def daemon(socket_path):
+    fake = FakeDockerDaemon(socket_path).start()
+    yield fake
+    fake.stop()
+
+
+def test_client_reuses_persistent_connection(daemon, socket_path) -> None:
+    client = DockerEngineClient(socket_path)
+
+    for _ in range(5):
+        containers = client.list_containers()
+
+    assert len(containers) == 3
+    assert daemon.connections == 1
+    client.close()
+
+
+def test_monitor_initial_sync_filters_arkalia_containers(daemon, socket_path) -> None:
+    monitor = DockerContainerMonitor(DockerEngineClient(socket_path))
+
+    assert monitor.sync()
+
+    assert monitor.status() == {"zeroia": "healthy", "reflexia": "running"}
+
+
+def test_monitor_applies_event_stream(daemon, socket_path) -> None:
+    monitor = DockerContainerMonitor(DockerEngineClient(socket_path))
+    monitor.start()
+    try:
+        assert _wait_for(lambda: any(p.startswith("/events") for p in daemon.requests))
+        assert "since=" in next(p for p in daemon.requests if p.startswith("/events"))
+
+        daemon.events.put(_container_event("reflexia", "health_status: healthy"))
+        daemon.events.put(_container_event("sandozia", "start"))
+        daemon.events.put(_container_event("zeroia", "die"))
+        daemon.events.put(_container_event("postgres", "die"))
+
+        assert _wait_for(lambda: monitor.status() == {"reflexia": "healthy", "sandozia": "running"})
+    finally:
+        monitor.stop()
+
+
+def test_monitor_falls_back_to_polling_when_daemon_missing(socket_path) -> None:
+    monitor = DockerContainerMonitor(DockerEngineClient(socket_path), poll_interval=0.05)
+    monitor.start()
+    try:
+        assert "error" in monitor.status()
+
+        fake = FakeDockerDaemon(socket_path).start()
+        try:
+            assert _wait_for(lambda: "zeroia" in monitor.status())
+        finally:
+            monitor.stop()
+            fake.stop()
+    finally:
+        monitor.stop()
+
+
+def test_status_lookup_is_in_memory(daemon, socket_path) -> None:
+    monitor = DockerContainerMonitor(DockerEngineClient(socket_path))
+    monitor.sync()
+    requests_before = len(daemon.requests)
+
+    started = time.perf_counter()
+    for _ in range(1000):
+        monitor.status()
+
+    assert (time.perf_counter() - started) / 1000 < 0.001
+    assert len(daemon.requests) == requests_before
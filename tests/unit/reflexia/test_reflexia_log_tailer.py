@@ -0,0 +1,112 @@
+# 🧪 tests/unit/reflexia/test_reflexia_log_tailer.py
+"""Tests du suiveur incrémental de logs Reflexia"""
+
+import os
+
+from modules.reflexia.logic.log_tailer import EventTimes, LogTailer
+
+
+def _append(path, *lines: str) -> None:
+    with open(path, "a") as f:
+        for line in lines:
+            f.write(line + "\n")
+
+
+def test_reads_only_new_bytes(tmp_path) -> None:
+    log = tmp_path / "app_errors.log"
+    _append(log, "INFO start", "ERROR boom")
+    tailer = LogTailer(log)
+
+    assert tailer.poll(now=1000.0) == 2
+    first_read = tailer.bytes_read
+
+    _append(log, "WARNING slow")
+    assert tailer.poll(now=1001.0) == 1
+    assert tailer.bytes_read - first_read == len("WARNING slow\n")
+    assert tailer.poll(now=1002.0) == 0
+
+    counts = tailer.counts(now=1002.0)["60s"]
+    assert counts == {"errors": 1, "warnings": 1}
+
+
+def test_partial_line_is_buffered(tmp_path) -> None:
+    log = tmp_path / "app_errors.log"
+    log.write_text("ERR")
+    tailer = LogTailer(log)
+
+    assert tailer.poll(now=0.0) == 0
+    with open(log, "a") as f:
+        f.write("OR half written\n")
+    assert tailer.poll(now=1.0) == 1
+    assert tailer.counts(now=1.0)["60s"]["errors"] == 1
+
+
+def test_rotation_reads_tail_of_old_file_then_new_file(tmp_path) -> None:
+    log = tmp_path / "app_errors.log"
+    _append(log, "ERROR one")
+    tailer = LogTailer(log)
+    tailer.poll(now=0.0)
+
+    _append(log, "ERROR two")  # écrit juste avant la rotation
+    os.rename(log, tmp_path / "app_errors.log.1")
+    _append(log, "ERROR three", "WARNING four")
+
+    assert tailer.poll(now=1.0) == 3
+    assert tailer.rotations == 1
+    assert tailer.counts(now=1.0)["60s"] == {"errors": 3, "warnings": 1}
+
+
+def test_truncation_restarts_from_beginning(tmp_path) -> None:
+    log = tmp_path / "app_errors.log"
+    _append(log, "ERROR a", "ERROR b", "ERROR c")
+    tailer = LogTailer(log)
+    tailer.poll(now=0.0)
+
+    log.write_text("WARNING after truncate\n")
+
+    assert tailer.poll(now=1.0) == 1
+    assert tailer.counts(now=1.0)["60s"] == {"errors": 3, "warnings": 1}
+
+
+def test_rolling_windows_expire(tmp_path) -> None:
+    log = tmp_path / "app_errors.log"
+    tailer = LogTailer(log, windows=(60, 300))
+    log.touch()
+    tailer.poll(now=0.0)
+
+    _append(log, "ERROR old")
+    tailer.poll(now=100.0)
+    _append(log, "ERROR recent")
+    tailer.poll(now=250.0)
+
+    counts = tailer.counts(now=280.0)
+    assert counts["60s"]["errors"] == 1
+    assert counts["300s"]["errors"] == 2
+    assert tailer.counts(now=1000.0)["300s"]["errors"] == 0
+
+
+def test_initial_open_only_backfills_tail(tmp_path) -> None:
+    log = tmp_path / "app_errors.log"
+    _append(log, *["ERROR historical"] * 10_000)
+    tailer = LogTailer(log, backfill_bytes=1024)
+
+    tailer.poll(now=0.0)
+
+    assert tailer.bytes_read <= 1024
+    assert 0 < tailer.counts(now=0.0)["60s"]["errors"] < 100
+
+
+def test_event_times_expiry_compacts_list() -> None:
+    events = EventTimes()
+    for t in range(10):
+        events.append(float(t))
+
+    events.expire(3.0)  # 3 événements sur 10 : indice déplacé seulement
+    assert len(events) == 7
+    assert len(events._times) == 10
+    assert events.count_since(8.0) == 2
+
+    events.expire(8.0)  # plus de la moitié : liste compactée
+    assert len(events) == 2
+    assert events._times == [8.0, 9.0]
+    assert events.count_since(0.0) == 2
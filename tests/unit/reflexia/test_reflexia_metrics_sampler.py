@@ -0,0 +1,150 @@
+# 🧪 tests/unit/reflexia/test_reflexia_metrics_sampler.py
+"""Tests du sampler de métriques Reflexia en arrière-plan"""
+
+import time
+from dataclasses import FrozenInstanceError
+
+import pytest
+
+from modules.reflexia.logic.metrics_enhanced import MetricsSampler, MetricsSnapshot
+
+
+def _make_sampler(calls: dict[str, int], intervals: dict[str, float] | None = None):
+    def counting(name, payload):
+        def collector():
+            calls[name] = calls.get(name, 0) + 1
+            return payload
+
+        return collector
+
+    return MetricsSampler(
+        intervals=intervals,
+        collectors={
+            "system": counting(
+                "system",
+                {
+                    "cpu_percent": 12.5,
+                    "memory_percent": 40.0,
+                    "disk_usage": 50.0,
+                    "load_avg": [1, 1, 1],
+                },
+            ),
+            "containers": counting("containers", {"reflexia": "healthy", "zeroia": "running"}),
+            "modules": counting(
+                "modules", {"zeroia": {"active": True}, "sandozia": {"active": False}}
+            ),
+            "logs": counting("logs", {"recent_errors": 3, "recent_warnings": 1}),
+        },
+    )
+
+
+def test_failed_collectors_use_neutral_values() -> None:
+    def failing():
+        raise OSError("psutil unavailable")
+
+    sampler = MetricsSampler(
+        collectors={
+            "system": failing,
+            "containers": failing,
+            "modules": failing,
+            "logs": failing,
+        }
+    )
+    snapshot = sampler.latest()
+
+    assert snapshot.system == {"error": "system collection failed: psutil unavailable"}
+    assert snapshot.to_simple() == {
+        "cpu": 0,
+        "ram": 0,
+        "latency": snapshot.collection_time_ms,
+        "containers": 0,
+        "modules_active": 0,
+        "errors": 0,
+    }
+
+
+def test_snapshot_is_immutable() -> None:
+    snapshot = _make_sampler({}).latest()
+
+    assert isinstance(snapshot, MetricsSnapshot)
+    with pytest.raises(FrozenInstanceError):
+        snapshot.collection_time_ms = 0.0  # type: ignore[misc]
+    with pytest.raises(TypeError):
+        snapshot.system["cpu_percent"] = 99.0  # type: ignore[index]
+
+
+def test_simple_and_enhanced_views_share_one_collection() -> None:
+    calls: dict[str, int] = {}
+    snapshot = _make_sampler(calls).latest()
+
+    simple = snapshot.to_simple()
+    enhanced = snapshot.to_enhanced()
+
+    assert calls == {"system": 1, "containers": 1, "modules": 1, "logs": 1}
+    assert simple["cpu"] == enhanced["system"]["cpu_percent"] == 12.5
+    assert simple["containers"] == 2
+    assert simple["modules_active"] == 1
+    assert simple["errors"] == 3
+    assert enhanced["system"]["load_avg"] == [1, 1, 1]
+    # Les vues retournées sont des copies modifiables
+    enhanced["system"]["cpu_percent"] = 0.0
+    assert snapshot.system["cpu_percent"] == 12.5
+
+
+def test_sections_refresh_on_independent_schedules() -> None:
+    calls: dict[str, int] = {}
+    sampler = _make_sampler(
+        calls, intervals={"system": 0.0, "containers": 3600, "modules": 3600, "logs": 3600}
+    )
+
+    for _ in range(5):
+        sampler.refresh()
+
+    assert calls["system"] == 5
+    assert calls["containers"] == calls["modules"] == calls["logs"] == 1
+
+
+def test_failing_collector_does_not_break_snapshot() -> None:
+    sampler = _make_sampler({})
+    sampler.collectors["containers"] = lambda: 1 / 0
+
+    snapshot = sampler.refresh(force=True)
+
+    assert "error" in snapshot.containers
+    assert snapshot.to_simple()["containers"] == 0
+
+
+def test_background_thread_publishes_and_reads_are_fast() -> None:
+    calls: dict[str, int] = {}
+    sampler = _make_sampler(calls, intervals={"system": 0.01})
+    sampler.start()
+    try:
+        deadline = time.monotonic() + 2.0
+        while calls.get("system", 0) < 3 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert calls.get("system", 0) >= 3
+
+        started = time.perf_counter()
+        for _ in range(1000):
+            sampler.latest()
+        assert (time.perf_counter() - started) / 1000 < 0.001
+    finally:
+        sampler.stop()
+    assert not sampler.is_running()
+
+
+def test_modules_health_prefers_fresh_heartbeats(tmp_path, monkeypatch) -> None:
+    import modules.monitoring.heartbeat_registry as heartbeat_registry
+    from modules.monitoring.heartbeat_registry import HeartbeatRegistry
+    from modules.reflexia.logic.metrics_enhanced import get_arkalia_modules_health
+
+    registry = HeartbeatRegistry(tmp_path / "health.db")
+    monkeypatch.setattr(heartbeat_registry, "_registry", registry)
+    registry.heartbeat("zeroia", "active", {"last_decision": "monitor"})
+
+    health = get_arkalia_modules_health()
+
+    assert health["zeroia"]["active"] is True
+    assert health["zeroia"]["source"] == "heartbeat"
+    assert health["zeroia"]["last_decision"] == "monitor"
+    assert "sandozia" in health and "reflexia" in health
@@ -0,0 +1,202 @@
+# 🧪 tests/unit/reflexia/test_reflexia_scheduler.py
+"""Tests du planificateur asyncio à cadence fixe de Reflexia"""
+
+import asyncio
+import threading
+import time
+
+import modules.reflexia.logic.main_loop_enhanced as main_loop_enhanced
+from modules.reflexia.logic.metrics_enhanced import MetricsSampler
+from modules.reflexia.logic.scheduler import (
+    ReflexiaScheduler,
+    ScheduleStats,
+    TickResult,
+    fixed_rate,
+    load_scheduler_config,
+)
+
+
+def _sampler(calls: dict[str, int] | None = None) -> MetricsSampler:
+    calls = calls if calls is not None else {}
+
+    def counting(name, payload):
+        def collector():
+            calls[name] = calls.get(name, 0) + 1
+            return payload
+
+        return collector
+
+    return MetricsSampler(
+        collectors={
+            "system": counting("system", {"cpu_percent": 10.0, "memory_percent": 20.0}),
+            "containers": counting("containers", {}),
+            "modules": counting("modules", {}),
+            "logs": counting("logs", {"recent_errors": 0, "recent_warnings": 0}),
+        }
+    )
+
+
+def _on_tick(work_seconds: float = 0.0):
+    def on_tick(tick, snapshot):
+        if work_seconds:
+            time.sleep(work_seconds)
+        return TickResult(tick=tick, snapshot=snapshot, metrics=snapshot.to_simple())
+
+    return on_tick
+
+
+def test_fixed_rate_does_not_drift() -> None:
+    async def run() -> float:
+        stats = ScheduleStats()
+        stop = asyncio.Event()
+        started = time.perf_counter()
+        async for tick in fixed_rate(0.05, stats, stop):
+            await asyncio.sleep(0.03)  # travail < période
+            if tick >= 9:
+                break
+        return time.perf_counter() - started
+
+    elapsed = asyncio.run(run())
+
+    # sleep-après-travail donnerait ~10 * (0.05 + 0.03) = 0.8 s
+    assert elapsed < 0.65
+
+
+def test_overrun_ticks_are_counted_as_missed() -> None:
+    scheduler = ReflexiaScheduler(
+        on_tick=_on_tick(work_seconds=0.12), tick_seconds=0.05, sampler=_sampler()
+    )
+
+    stats = asyncio.run(scheduler.run(max_ticks=3))
+
+    assert stats["ticks"]["runs"] == 3
+    assert stats["ticks"]["missed"] >= 4
+
+
+def test_collectors_run_at_their_own_rates() -> None:
+    calls: dict[str, int] = {}
+    scheduler = ReflexiaScheduler(
+        on_tick=_on_tick(),
+        tick_seconds=0.05,
+        collector_rates={"system": 0.02, "containers": 10, "modules": 10, "logs": 0.1},
+        sampler=_sampler(calls),
+    )
+
+    stats = asyncio.run(scheduler.run(max_ticks=8))
+
+    assert stats["collectors"]["system"]["runs"] > 2 * stats["collectors"]["logs"]["runs"]
+    # Collecte initiale + premier tick du collecteur lent, puis plus rien
+    assert calls["containers"] <= 2
+
+
+def test_persistence_overlaps_next_collection() -> None:
+    persisted: list[int] = []
+    collected_during_persist = threading.Event()
+    calls: dict[str, int] = {}
+    persisting = threading.Event()
+
+    sampler = _sampler(calls)
+    original = sampler.collectors["system"]
+
+    def system_collector():
+        if persisting.is_set():
+            collected_during_persist.set()
+        return original()
+
+    sampler.collectors["system"] = system_collector
+
+    def persist(result: TickResult) -> None:
+        persisting.set()
+        time.sleep(0.08)
+        persisting.clear()
+        persisted.append(result.tick)
+
+    scheduler = ReflexiaScheduler(
+        on_tick=_on_tick(),
+        persist=persist,
+        tick_seconds=0.05,
+        collector_rates={"system": 0.01},
+        sampler=sampler,
+    )
+
+    stats = asyncio.run(scheduler.run(max_ticks=4))
+
+    assert len(persisted) == 4
+    assert collected_during_persist.is_set()
+    assert stats["persist"]["runs"] == 4
+
+
+def test_scheduler_config_from_monitoring_toml(tmp_path) -> None:
+    config_file = tmp_path / "monitoring_config.toml"
+    config_file.write_text("[scheduler]\ntick_seconds = 2.5\n[scheduler.rates]\nlogs = 7.0\n")
+
+    config = load_scheduler_config(config_file)
+
+    assert config["tick_seconds"] == 2.5
+    assert config["rates"]["logs"] == 7.0
+    assert config["rates"]["containers"] == 15.0
+    assert load_scheduler_config(tmp_path / "missing.toml")["tick_seconds"] == 1.0
+
+
+def test_reflexia_loop_enhanced_uses_scheduler(monkeypatch) -> None:
+    saved: list[str] = []
+    monkeypatch.setattr(
+        main_loop_enhanced, "save_snapshot", lambda metrics, status: saved.append(status)
+    )
+    monkeypatch.setattr(
+        "modules.reflexia.logic.scheduler.get_metrics_sampler", lambda start=False: _sampler()
+    )
+
+    stats = main_loop_enhanced.reflexia_loop_enhanced(
+        max_iterations=2, sleep_seconds=0.05, verbose=False
+    )
+
+    assert stats["ticks"]["runs"] == 2
+    assert saved == ["ok", "ok"]
+
+
+def test_failing_collectors_and_ticks_do_not_stop_loop(monkeypatch) -> None:
+    def broken():
+        raise RuntimeError("logs indisponibles")
+
+    sampler = _sampler()
+    sampler.collectors["logs"] = broken
+    sampler.collectors["system"] = broken
+    saved: list[str] = []
+    monkeypatch.setattr(
+        main_loop_enhanced, "save_snapshot", lambda metrics, status: saved.append(status)
+    )
+    monkeypatch.setattr(
+        "modules.reflexia.logic.scheduler.get_metrics_sampler", lambda start=False: sampler
+    )
+
+    stats = main_loop_enhanced.reflexia_loop_enhanced(
+        max_iterations=3, sleep_seconds=0.02, verbose=True
+    )
+
+    assert stats["ticks"]["runs"] == 3
+    assert stats["ticks"]["failed"] == 0
+    assert len(saved) == 3
+
+
+def test_tick_errors_are_counted_and_loop_continues() -> None:
+    ticks: list[int] = []
+
+    def on_tick(tick, snapshot):
+        ticks.append(tick)
+        if tick == 0:
+            raise KeyError("recent_errors")
+        return TickResult(tick=tick, snapshot=snapshot, metrics=snapshot.to_simple())
+
+    persisted: list[int] = []
+    scheduler = ReflexiaScheduler(
+        on_tick=on_tick,
+        persist=lambda result: persisted.append(result.tick),
+        tick_seconds=0.02,
+        sampler=_sampler(),
+    )
+    stats = asyncio.run(scheduler.run(max_ticks=3))
+
+    assert stats["ticks"]["runs"] == 3
+    assert stats["ticks"]["failed"] == 1
+    assert persisted == ticks[1:]
@@ -1,9 +1,10 @@
-import json
+import toml
 
-from modules.reflexia.logic.snapshot import save_snapshot
+from modules.reflexia.logic.snapshot import SnapshotWriter, save_snapshot
+from modules.zeroia.reason_loop import load_reflexia_state
 
 
-def test_snapshot_file_creation(tmp_path) -> None:
+def test_snapshot_file_creation(tmp_path, monkeypatch) -> None:
     # Remplace le chemin du fichier temporairement
     test_file = tmp_path / "reflexia_state.toml"
 
@@ -13,10 +14,66 @@ def test_snapshot_file_creation(tmp_path) -> None:
     # Simule un enregistrement
     from modules.reflexia.logic import snapshot
 
-    snapshot.SNAPSHOT_FILE = test_file
+    monkeypatch.setattr(snapshot, "SNAPSHOT_FILE", test_file)
     save_snapshot(metrics, status)
 
     assert test_file.exists()
-    data = json.loads(test_file.read_text())
+    data = toml.loads(test_file.read_text())
     assert data["status"] == "ok"
     assert "timestamp" in data
+
+
+def test_snapshot_is_readable_by_zeroia(tmp_path) -> None:
+    path = tmp_path / "reflexia_state.toml"
+    SnapshotWriter(path).save({"cpu": 12.5, "ram": 40.0, "latency": 3}, "ok")
+
+    state = load_reflexia_state(path)
+
+    assert state["metrics"]["cpu"] == 12.5
+    assert state["status"] == "ok"
+
+
+def test_unchanged_snapshot_is_not_rewritten(tmp_path) -> None:
+    path = tmp_path / "reflexia_state.toml"
+    writer = SnapshotWriter(path)
+
+    assert writer.save({"cpu": 10}, "ok") is True
+    mtime = path.stat().st_mtime_ns
+    assert writer.save({"cpu": 10}, "ok") is False
+    assert path.stat().st_mtime_ns == mtime
+    assert writer.save({"cpu": 11}, "ok") is True
+
+
+def test_history_ring_is_bounded_and_persisted(tmp_path) -> None:
+    path = tmp_path / "reflexia_state.toml"
+    writer = SnapshotWriter(path, history_size=3)
+
+    for cpu in range(5):
+        writer.save({"cpu": cpu}, "ok")
+
+    assert [s["metrics"]["cpu"] for s in writer.history] == [2, 3, 4]
+    on_disk = toml.load(path)["history"]
+    assert [s["metrics"]["cpu"] for s in on_disk] == [2, 3, 4]
+
+    # Un nouveau writer reprend l'anneau et le dernier contenu
+    restored = SnapshotWriter(path, history_size=3)
+    assert [s["metrics"]["cpu"] for s in restored.history] == [2, 3, 4]
+    assert restored.save({"cpu": 4}, "ok") is False
+
+
+def test_atomic_write_leaves_no_temporary_files(tmp_path) -> None:
+    path = tmp_path / "reflexia_state.toml"
+    writer = SnapshotWriter(path)
+    for cpu in range(3):
+        writer.save({"cpu": cpu}, "ok")
+
+    assert [p.name for p in tmp_path.iterdir()] == ["reflexia_state.toml"]
+
+
+def test_legacy_json_snapshot_is_replaced(tmp_path) -> None:
+    path = tmp_path / "reflexia_state.toml"
+    path.write_text('{\n  "status": "ok"\n}')
+
+    writer = SnapshotWriter(path)
+    assert writer.save({"cpu": 1}, "ok") is True
+    assert toml.load(path)["metrics"]["cpu"] == 1
@@ -148,3 +148,50 @@ def test_get_metrics_summary():
     analyzer = BehaviorAnalyzer()
     summary = analyzer.get_metrics_summary()
     assert isinstance(summary, dict)
+
+
+def test_metrics_buffer_ring_wraparound():
+    analyzer = BehaviorAnalyzer()
+    analyzer.metrics_buffer = behavior.MetricRingBuffer(capacity=5)
+
+    for i in range(8):
+        analyzer.add_metric_sample("zeroia", "cpu_usage", float(i))
+
+    series = analyzer.metrics_buffer["zeroia.cpu_usage"]
+    assert len(series) == 5
+    assert list(series.values) == [3.0, 4.0, 5.0, 6.0, 7.0]
+    assert series[0]["value"] == 3.0
+    assert series[-1]["value"] == 7.0
+
+
+def test_detect_statistical_anomalies_vectorized():
+    analyzer = BehaviorAnalyzer()
+    old = datetime.now().timestamp() - 7200
+
+    for i in range(60):
+        ts = datetime.fromtimestamp(old + i)
+        analyzer.add_metric_sample("reflexia", "latency", 1.0 + (i % 2) * 0.1, ts)
+        analyzer.add_metric_sample("zeroia", "latency", 1.0 + (i % 2) * 0.1, ts)
+    for _ in range(5):
+        analyzer.add_metric_sample("reflexia", "latency", 10.0)
+        analyzer.add_metric_sample("zeroia", "latency", 1.05)
+
+    anomalies = analyzer.detect_statistical_anomalies()
+
+    assert [p.metadata["metric_key"] for p in anomalies] == ["reflexia.latency"]
+    assert anomalies[0].occurrences == 5
+    assert "zeroia.latency" in analyzer.baseline_stats
+
+
+def test_correlation_matrix():
+    analyzer = BehaviorAnalyzer()
+    for i in range(20):
+        analyzer.add_metric_sample("zeroia", "cpu", float(i))
+        analyzer.add_metric_sample("zeroia", "idle", float(-i))
+        analyzer.add_metric_sample("zeroia", "flat", 1.0)
+
+    result = analyzer.correlation_matrix(window=20)
+
+    assert result["metrics"] == ["zeroia.cpu", "zeroia.idle"]
+    assert result["matrix"][0][1] == pytest.approx(-1.0)
+    assert result["matrix"][0][0] == pytest.approx(1.0)
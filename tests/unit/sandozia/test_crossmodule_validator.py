@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# 🧠 tests/unit/sandozia/test_crossmodule_validator.py
+# Tests pour la validation incrémentale de CrossModuleValidator
+
+import os
+from unittest.mock import patch
+
+import pytest
+import toml
+
+from modules.sandozia.validators.crossmodule import CrossModuleValidator
+
+
+@pytest.fixture
+def validator(tmp_path):
+    reflexia_path = tmp_path / "reflexia_state.toml"
+    zeroia_path = tmp_path / "zeroia_state.toml"
+    toml.dump({"decision_metrics": {"confidence": 0.95}}, reflexia_path.open("w"))
+    toml.dump({"confidence_score": 0.2, "contradictions_detected": 1}, zeroia_path.open("w"))
+
+    validator = CrossModuleValidator()
+    validator.state_paths = {"reflexia": reflexia_path, "zeroia": zeroia_path}
+    return validator
+
+
+def touch_with_content(path, data):
+    stat = path.stat()
+    toml.dump(data, path.open("w"))
+    # Garantit un changement de mtime même sur les systèmes de fichiers à faible résolution
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def test_first_run_executes_all_validators(validator):
+    summary = validator.run_full_validation()
+
+    assert summary["validators_executed"] == [
+        "temporal_coherence",
+        "confidence_coherence",
+        "logical_consistency",
+        "behavioral_patterns",
+    ]
+    assert summary["modules_changed"] == ["reflexia", "zeroia"]
+    assert summary["issues_by_level"]["critical"] == 1  # variance de confiance
+    assert summary["issues_by_level"]["warning"] == 1  # contradiction logique
+
+
+def test_steady_state_reuses_results_without_reparsing(validator):
+    first = validator.run_full_validation()
+
+    with patch("modules.sandozia.validators.crossmodule.toml.load") as mock_load:
+        second = validator.run_full_validation()
+
+    mock_load.assert_not_called()
+    assert second["modules_changed"] == []
+    assert second["validators_executed"] == ["behavioral_patterns"]
+    assert second["coherence_score"] == first["coherence_score"]
+    assert second["validation_results"] == first["validation_results"]
+
+
+def test_changed_state_reruns_dependent_validators(validator):
+    validator.run_full_validation()
+
+    touch_with_content(validator.state_paths["zeroia"], {"confidence_score": 0.9})
+    summary = validator.run_full_validation()
+
+    assert summary["modules_changed"] == ["zeroia"]
+    assert "confidence_coherence" in summary["validators_executed"]
+    assert "logical_consistency" in summary["validators_executed"]
+    assert summary["issues_by_level"]["critical"] == 0
+    assert summary["coherence_score"] == 1.0
+
+
+def test_unrelated_module_change_keeps_cached_validators(validator, tmp_path):
+    validator.state_paths["assistantia"] = tmp_path / "assistantia.toml"
+    validator.run_full_validation()
+
+    toml.dump({"sessions": 3}, (tmp_path / "assistantia.toml").open("w"))
+    summary = validator.run_full_validation()
+
+    assert summary["modules_changed"] == ["assistantia"]
+    assert summary["validators_executed"] == ["behavioral_patterns"]
+
+
+def test_invalidate_cache_forces_full_run(validator):
+    validator.run_full_validation()
+    validator.invalidate_cache()
+
+    summary = validator.run_full_validation()
+
+    assert len(summary["validators_executed"]) == 4
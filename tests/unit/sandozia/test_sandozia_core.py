@@ -3,6 +3,7 @@
 # Tests unitaires SandoziaCore
 
 import asyncio
+import threading
 from unittest.mock import patch
 
 import pytest
@@ -78,6 +79,94 @@ class TestSandoziaCore:
             assert snapshot.coherence_analysis["coherence_score"] >= 0.0
             assert len(snapshot.recommendations) > 0
 
+    @pytest.mark.asyncio
+    async def test_collect_snapshot_runs_collectors_concurrently(self, sandozia_core):
+        """Test collecte Reflexia/ZeroIA en parallèle hors boucle d'événements"""
+        # Chaque collecteur attend l'autre : une collecte séquentielle casserait la barrière
+        barrier = threading.Barrier(2, timeout=5)
+
+        def reflexia_check():
+            barrier.wait()
+            return {"status": "ok", "metrics": {}}
+
+        def zeroia_state():
+            barrier.wait()
+            return {}
+
+        with (
+            patch(
+                "modules.sandozia.core.sandozia_core.launch_reflexia_check",
+                side_effect=reflexia_check,
+            ) as mock_reflexia,
+            patch(
+                "modules.sandozia.core.sandozia_core.load_reflexia_state",
+                side_effect=zeroia_state,
+            ) as mock_zeroia_state,
+            patch("modules.sandozia.core.sandozia_core.load_context", return_value={}),
+        ):
+            snapshot = await sandozia_core.collect_intelligence_snapshot()
+
+        assert snapshot.reflexia_state["active"] is True
+        assert snapshot.zeroia_state["active"] is True
+        assert mock_reflexia.call_count == 1
+        assert mock_zeroia_state.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_collect_snapshot_timeout_uses_stale_state(self, sandozia_core):
+        """Test repli sur le dernier état connu quand un collecteur dépasse son timeout"""
+        sandozia_core.config["monitoring"]["collector_timeouts"] = {"reflexia": 0.1}
+        release = threading.Event()
+
+        with (
+            patch(
+                "modules.sandozia.core.sandozia_core.launch_reflexia_check",
+                return_value={"status": "ok", "metrics": {"cpu": 12}},
+            ) as mock_reflexia,
+            patch("modules.sandozia.core.sandozia_core.load_reflexia_state", return_value={}),
+            patch("modules.sandozia.core.sandozia_core.load_context", return_value={}),
+        ):
+            await sandozia_core.collect_intelligence_snapshot()
+
+            def hung_check():
+                release.wait(5)
+                return {"status": "ok", "metrics": {"cpu": 34}}
+
+            mock_reflexia.side_effect = hung_check
+            snapshots = [await sandozia_core.collect_intelligence_snapshot() for _ in range(3)]
+
+            # Un seul appel en cours pour le collecteur bloqué, malgré trois ticks
+            assert mock_reflexia.call_count == 2
+            for snapshot in snapshots:
+                assert snapshot.reflexia_state["stale"] is True
+                assert snapshot.reflexia_state["metrics"] == {"cpu": 12}
+                assert "stale" not in snapshot.zeroia_state
+
+            # La collecte bloquée se termine : son état est repris au tick suivant
+            release.set()
+            await sandozia_core._collector_futures["reflexia"]
+            assert sandozia_core._last_module_states["reflexia"]["metrics"] == {"cpu": 34}
+            mock_reflexia.side_effect = None
+            snapshot = await sandozia_core.collect_intelligence_snapshot()
+
+        assert mock_reflexia.call_count == 3
+        assert "stale" not in snapshot.reflexia_state
+
+    @pytest.mark.asyncio
+    async def test_collect_snapshot_error_marks_module_inactive(self, sandozia_core):
+        """Test qu'une erreur de collecte reste signalée comme module inactif"""
+        with (
+            patch(
+                "modules.sandozia.core.sandozia_core.launch_reflexia_check",
+                side_effect=RuntimeError("boom"),
+            ),
+            patch("modules.sandozia.core.sandozia_core.load_reflexia_state", return_value={}),
+            patch("modules.sandozia.core.sandozia_core.load_context", return_value={}),
+        ):
+            snapshot = await sandozia_core.collect_intelligence_snapshot()
+
+        assert snapshot.reflexia_state == {"active": False}
+        assert "Reflexia inactive" in snapshot.coherence_analysis["issues"]
+
     @pytest.mark.asyncio
     async def test_analyze_coherence(self, sandozia_core):
         """Test analyse cohérence"""
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+# 🗃️ tests/unit/sandozia/test_snapshot_journal.py
+# Tests pour modules/sandozia/core/snapshot_journal.py
+
+import gzip
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from modules.sandozia.core.snapshot_journal import (
+    SnapshotJournal,
+    apply_json_patch,
+    make_json_patch,
+)
+
+BASE_TIME = datetime(2025, 7, 1, 12, 0, 0)
+
+
+def make_snapshot(i: int) -> dict:
+    return {
+        "reflexia_state": {"active": True, "metrics": {"cpu": 40 + i % 3}},
+        "zeroia_state": {"active": i % 5 != 0, "context": {"status": {"cpu": 45.0}}},
+        "recommendations": ["Système d'intelligence croisée fonctionnel"],
+        "timestamp": (BASE_TIME + timedelta(seconds=30 * i)).isoformat(),
+    }
+
+
+def test_json_patch_roundtrip():
+    old = {"a": 1, "b": {"c": [1, 2], "d": "x"}, "e/f": True}
+    new = {"a": 1, "b": {"c": [1, 2, 3]}, "e/f": False, "g": None}
+
+    patch = make_json_patch(old, new)
+
+    assert apply_json_patch(old, patch) == new
+    assert old["b"]["d"] == "x"  # l'original n'est pas modifié
+    assert make_json_patch(new, new) == []
+
+
+def test_apply_json_patch_rejects_unknown_op():
+    with pytest.raises(ValueError):
+        apply_json_patch({"a": 1}, [{"op": "move", "path": "/a"}])
+
+
+def test_journal_keyframes_and_deltas(tmp_path):
+    journal = SnapshotJournal(tmp_path, keyframe_interval=4)
+
+    kinds = [
+        journal.append(make_snapshot(i), BASE_TIME + timedelta(seconds=30 * i)) for i in range(10)
+    ]
+
+    assert kinds[0] == "keyframe"
+    assert kinds[1:4] == ["delta"] * 3
+    assert kinds[4] == "keyframe"
+    segments = journal.segments()
+    assert len(segments) == 3
+    # Seul le segment actif reste en clair, les précédents sont compressés
+    assert [s.name.endswith(".gz") for s in segments] == [True, True, False]
+
+    journal.seal()
+    assert all(s.name.endswith(".gz") for s in journal.segments())
+    with gzip.open(journal.segments()[0], "rt", encoding="utf-8") as f:
+        assert len(f.readlines()) == 4
+
+
+def test_journal_reconstructs_by_timestamp(tmp_path):
+    journal = SnapshotJournal(tmp_path, keyframe_interval=4)
+    for i in range(10):
+        journal.append(make_snapshot(i), BASE_TIME + timedelta(seconds=30 * i))
+
+    # Nouveau lecteur : reconstruction depuis le disque uniquement
+    reader = SnapshotJournal(tmp_path)
+    for i in range(10):
+        target = BASE_TIME + timedelta(seconds=30 * i + 10)
+        assert reader.load(target) == make_snapshot(i)
+
+    assert reader.load(BASE_TIME - timedelta(seconds=1)) is None
+    assert reader.load() == make_snapshot(9)
+    assert reader.load((BASE_TIME + timedelta(seconds=60)).isoformat()) == make_snapshot(2)
+    assert [doc for _, doc in reader.iter_snapshots()] == [make_snapshot(i) for i in range(10)]
+
+
+def test_journal_retention_and_size(tmp_path):
+    journal = SnapshotJournal(tmp_path, keyframe_interval=50, max_segments=2)
+    for i in range(200):
+        journal.append(make_snapshot(i), BASE_TIME + timedelta(seconds=30 * i))
+
+    journal.seal()
+    assert len(journal.segments()) == 2
+
+    # Comparaison avec l'ancien format : un fichier JSON indenté par snapshot
+    journal_size = sum(p.stat().st_size for p in journal.segments())
+    full_size = sum(len(json.dumps(make_snapshot(i), indent=2)) for i in range(100, 200))
+    assert journal_size < full_size / 10
+
+
+def test_journal_tolerates_truncated_segment(tmp_path):
+    journal = SnapshotJournal(tmp_path, keyframe_interval=10)
+    for i in range(3):
+        journal.append(make_snapshot(i), BASE_TIME + timedelta(seconds=30 * i))
+
+    # Arrêt brutal au milieu de l'écriture d'un enregistrement
+    segment = journal.segments()[-1]
+    with open(segment, "a", encoding="utf-8") as f:
+        f.write('{"t":"2025-07-01T12:05:00","k":"del')
+
+    reader = SnapshotJournal(tmp_path)
+    assert reader.load() == make_snapshot(2)
+
+
+def test_journals_sharing_directory_seal_only_their_segment(tmp_path):
+    a = SnapshotJournal(tmp_path, keyframe_interval=10)
+    b = SnapshotJournal(tmp_path, keyframe_interval=10)
+    a.append({"x": 1}, BASE_TIME)
+    b.append({"y": 1}, BASE_TIME + timedelta(seconds=1))
+    a.append({"x": 2}, BASE_TIME + timedelta(seconds=2))
+
+    b.seal()
+    assert a.append({"x": 3}, BASE_TIME + timedelta(seconds=3)) == "delta"
+
+    assert [doc for _, doc in SnapshotJournal(tmp_path).iter_snapshots()] == [
+        {"x": 1},
+        {"y": 1},
+        {"x": 2},
+        {"x": 3},
+    ]
+    assert SnapshotJournal(tmp_path).load() == {"x": 3}
+
+
+def test_journal_never_overwrites_sealed_segment(tmp_path):
+    first = SnapshotJournal(tmp_path)
+    first.append({"x": 1}, BASE_TIME)
+    first.seal()
+    sealed = tmp_path.glob("*.jsonl.gz")
+    before = {path.name: path.read_bytes() for path in sealed}
+
+    # Même horodatage de segment : un autre nom est réservé
+    second = SnapshotJournal(tmp_path)
+    second.append({"x": 2}, BASE_TIME)
+    second.seal()
+
+    after = {path.name: path.read_bytes() for path in tmp_path.glob("*.jsonl.gz")}
+    assert len(after) == 2
+    assert all(after[name] == content for name, content in before.items())
+    assert [doc for _, doc in SnapshotJournal(tmp_path).iter_snapshots()] == [{"x": 1}, {"x": 2}]
+
+
+def test_journal_restarts_with_keyframe_when_segment_removed(tmp_path):
+    journal = SnapshotJournal(tmp_path)
+    journal.append({"x": 1}, BASE_TIME)
+    for segment in journal.segments():
+        segment.unlink()
+
+    assert journal.append({"x": 2}, BASE_TIME + timedelta(seconds=1)) == "keyframe"
+    assert SnapshotJournal(tmp_path).load() == {"x": 2}
@@ -4,7 +4,7 @@
 
 import importlib.util
 import sys
-from datetime import datetime
+from datetime import datetime, timedelta
 from pathlib import Path
 
 import pytest
@@ -114,3 +114,68 @@ def test_demo_metrics():
     # Test que demo_metrics() s'exécute sans erreur
     demo_metrics()
     assert True  # Si on arrive ici, pas d'exception
+
+
+def test_retention_pops_expired_points():
+    metrics = SandoziaMetrics(retention_hours=1)
+    old = datetime.now() - timedelta(hours=2)
+    metrics.metrics_store["cpu_usage"].append(MetricPoint(old, 1.0, {}))
+    metrics.metrics_store["cpu_usage"].append(MetricPoint(old, 2.0, {}))
+
+    metrics.add_metric("cpu_usage", 3.0)
+
+    assert [p.value for p in metrics.metrics_store["cpu_usage"]] == [3.0]
+
+
+def test_get_metric_values_time_window():
+    metrics = SandoziaMetrics()
+    now = datetime.now()
+    for minutes, value in ((50, 1.0), (20, 2.0), (5, 3.0), (1, 4.0)):
+        point = MetricPoint(now - timedelta(minutes=minutes), value, {})
+        metrics.metrics_store["latency"].append(point)
+
+    assert metrics.get_metric_values("latency", time_window_minutes=10) == [3.0, 4.0]
+    assert metrics.get_metric_values("latency", time_window_minutes=30) == [2.0, 3.0, 4.0]
+    assert metrics.get_metric_values("latency") == [1.0, 2.0, 3.0, 4.0]
+
+
+def test_metric_series_expiry_compacts_list():
+    series = metrics.MetricSeries()
+    now = datetime.now()
+    for minutes in range(10, 0, -1):
+        series.append(MetricPoint(now - timedelta(minutes=minutes), float(minutes), {}))
+
+    series.expire(now - timedelta(minutes=8))  # 3 points sur 10 : indice déplacé seulement
+    assert len(series) == 7
+    assert series[0].value == 7.0 and series[-1].value == 1.0
+    assert len(series._points) == 10
+
+    series.expire(now - timedelta(minutes=3))  # plus de la moitié : liste compactée
+    assert [p.value for p in series] == [2.0, 1.0]
+    assert len(series._points) == 2
+    assert [p.value for p in series.since(now - timedelta(minutes=2))] == [1.0]
+
+
+def test_calculate_correlation_streaming():
+    metrics = SandoziaMetrics()
+    for x in (1.0, 2.0, 4.0, 7.0, 11.0):
+        metrics.add_metric("a", x)
+        metrics.add_metric("b", 3.0 * x + 1.0)
+        metrics.add_metric("c", -x)
+
+    assert metrics.calculate_correlation("a", "b") == pytest.approx(1.0)
+    assert metrics.calculate_correlation("a", "c") == pytest.approx(-1.0)
+
+
+def test_pearson_accumulator_matches_reference():
+    xs = [0.5, 1.5, 2.0, 3.5, 2.5, 4.0]
+    ys = [1.0, 1.2, 2.9, 3.1, 2.0, 4.4]
+    accumulator = metrics.PearsonAccumulator()
+    for x, y in zip(xs, ys, strict=True):
+        accumulator.update(x, y)
+
+    mean_x, mean_y = sum(xs) / len(xs), sum(ys) / len(ys)
+    cov = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys, strict=True))
+    var_x = sum((x - mean_x) ** 2 for x in xs)
+    var_y = sum((y - mean_y) ** 2 for y in ys)
+    assert accumulator.correlation() == pytest.approx(cov / (var_x * var_y) ** 0.5)
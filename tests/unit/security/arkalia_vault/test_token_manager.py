@@ -7,7 +7,16 @@ from pathlib import Path
 
 import pytest
 
-from modules.security.crypto import ArkaliaVault, TokenManager, TokenStatus, TokenType
+from modules.security.crypto import (
+    ArkaliaVault,
+    TokenManager,
+    TokenStatus,
+    TokenType,
+    create_api_key,
+    token_lifecycle,
+)
+
+ROTATED_SECRET = "rotated-jwt-secret-" * 4
 
 
 class TestTokenManager:
@@ -86,3 +95,145 @@ class TestTokenManager:
             token_id not in token_manager.token_metadata
             or token_manager.token_metadata[token_id].status == TokenStatus.REVOKED
         )
+
+    def test_api_key_lookup_uses_index(self, token_manager, monkeypatch) -> None:
+        token_id, token_value = create_api_key(token_manager, "indexed_service", ["read"])
+        metadata = token_manager.token_metadata[token_id]
+        assert token_manager.api_key_index[metadata.key_digest] == token_id
+        assert token_value not in metadata.key_digest
+
+        def no_vault_read(name):
+            raise AssertionError(f"vault read during API key lookup: {name}")
+
+        monkeypatch.setattr(token_manager.vault, "retrieve_secret", no_vault_read)
+        assert token_manager._lookup_api_key(token_value) == token_id
+        assert token_manager._lookup_api_key(token_value + "x") is None
+
+    def test_revoked_api_key_removed_from_index(self, token_manager) -> None:
+        token_id, token_value = create_api_key(token_manager, "revoked_service", ["read"])
+        token_manager.revoke_token(token_id)
+        assert token_manager.api_key_index == {}
+        is_valid, _, reason = token_manager.validate_token(token_value)
+        assert is_valid is False
+        assert reason == "Token not found"
+
+    def test_api_key_index_rebuilt_on_restart(self, vault, token_manager) -> None:
+        token_id, token_value = create_api_key(token_manager, "restart_service", ["read"])
+        restarted = TokenManager(vault)
+        is_valid, metadata, _ = restarted.validate_token(token_value)
+        assert is_valid is True
+        assert metadata.token_id == token_id
+
+    def test_legacy_api_keys_indexed_once(self, vault, token_manager) -> None:
+        token_id, token_value = create_api_key(token_manager, "legacy_service", ["read"])
+        token_manager.token_metadata[token_id].key_digest = None
+        token_manager._save_token_metadata()
+
+        restarted = TokenManager(vault)
+        assert restarted.token_metadata[token_id].key_digest is not None
+        assert restarted.validate_token(token_value)[0] is True
+
+    def test_usage_batched_instead_of_saved_per_validation(self, vault, monkeypatch) -> None:
+        manager = TokenManager(vault, usage_flush_interval=3600, usage_flush_batch=10)
+        _, token_value = create_api_key(manager, "batched_service", ["read"])
+        stored: list[str] = []
+        store_secret = vault.store_secret
+
+        def counting_store(name, *args, **kwargs):
+            stored.append(name)
+            return store_secret(name, *args, **kwargs)
+
+        monkeypatch.setattr(vault, "store_secret", counting_store)
+        for _ in range(9):
+            assert manager.validate_token(token_value)[0] is True
+        assert stored == []
+        assert manager.validate_token(token_value)[0] is True
+        assert stored == ["token_metadata"]
+        assert len(manager.usage_journal) == 0
+
+    def test_max_usage_enforced_exactly(self, vault) -> None:
+        manager = TokenManager(vault, usage_flush_interval=3600, usage_flush_batch=1000)
+        token_id, token_value = create_api_key(manager, "limited_service", ["read"], 3)
+        results = [manager.validate_token(token_value) for _ in range(5)]
+        assert [valid for valid, _, _ in results] == [True, True, True, False, False]
+        assert results[3][2] == "Usage limit exceeded"
+        assert manager.token_metadata[token_id].usage_count == 3
+
+    def test_unflushed_usage_replayed_after_crash(self, vault) -> None:
+        manager = TokenManager(vault, usage_flush_interval=3600, usage_flush_batch=1000)
+        token_id, token_value = create_api_key(manager, "crash_service", ["read"], 5)
+        for _ in range(4):
+            manager.validate_token(token_value)
+        # Arrêt brutal : aucune consolidation, seul le journal a les 4 usages
+        restarted = TokenManager(vault, usage_flush_interval=3600, usage_flush_batch=1000)
+        assert restarted.token_metadata[token_id].usage_count == 4
+        assert restarted.validate_token(token_value)[0] is True
+        assert restarted.validate_token(token_value)[2] == "Usage limit exceeded"
+
+    def test_consolidated_journal_not_counted_twice(self, vault) -> None:
+        manager = TokenManager(vault, usage_flush_interval=3600, usage_flush_batch=1000)
+        token_id, token_value = create_api_key(manager, "checkpoint_service", ["read"])
+        for _ in range(3):
+            manager.validate_token(token_value)
+        journal = manager.usage_journal.path.read_text()
+        assert manager.flush_usage() is True
+        manager.close()
+        # Arrêt entre l'écriture dans le vault et la remise à zéro du journal
+        manager.usage_journal.path.write_text(journal)
+
+        restarted = TokenManager(vault)
+        assert restarted.token_metadata[token_id].usage_count == 3
+
+    def test_hot_session_token_skips_jwt_decode(self, token_manager, monkeypatch) -> None:
+        token_id, token_value = token_manager.generate_token(TokenType.SESSION, user_id="hot")
+        assert token_manager.validate_token(token_value)[0] is True
+
+        def no_decode(*args, **kwargs):
+            raise AssertionError("jwt.decode called for a cached token")
+
+        def no_vault_read(name):
+            raise AssertionError(f"vault read during validation: {name}")
+
+        monkeypatch.setattr(token_lifecycle.jwt, "decode", no_decode)
+        monkeypatch.setattr(token_manager.vault, "retrieve_secret", no_vault_read)
+        for _ in range(3):
+            assert token_manager.validate_token(token_value)[0] is True
+        assert token_manager.claims_cache.hits == 3
+        assert token_manager.token_metadata[token_id].usage_count == 4
+
+    def test_cached_token_rejected_after_revocation(self, token_manager) -> None:
+        token_id, token_value = token_manager.generate_token(TokenType.SESSION, user_id="u")
+        assert token_manager.validate_token(token_value)[0] is True
+        token_manager.revoke_token(token_id)
+        assert token_manager.validate_token(token_value)[2] == "Token revoked"
+
+    def test_revocations_restored_on_restart(self, vault, token_manager) -> None:
+        token_id, _ = token_manager.generate_token(TokenType.SESSION, user_id="u")
+        token_manager.revoke_token(token_id)
+        assert token_id in TokenManager(vault).revoked_tokens
+
+    def test_jwt_key_rotation_invalidates_cached_claims(self, vault, token_manager) -> None:
+        _, old_token = token_manager.generate_token(TokenType.SESSION, user_id="u")
+        assert token_manager.validate_token(old_token)[0] is True
+
+        vault.store_secret(token_manager.jwt_secret_name, ROTATED_SECRET, overwrite=True)
+        assert len(token_manager.claims_cache) == 0
+        assert token_manager.validate_token(old_token)[0] is False
+        _, new_token = token_manager.generate_token(TokenType.SESSION, user_id="u")
+        assert token_manager.validate_token(new_token)[0] is True
+
+    def test_jwt_key_rotated_by_other_process_reloaded(self, temp_vault_dir, vault) -> None:
+        manager = TokenManager(vault, jwt_key_refresh_interval=0)
+        # Validation préalable : la clé courante est dans le cache du vault
+        _, own_token = manager.generate_token(TokenType.SESSION, user_id="u")
+        assert manager.validate_token(own_token)[0] is True
+        assert vault.cache.get(manager.jwt_secret_name) is not None
+
+        other = TokenManager(ArkaliaVault(base_dir=temp_vault_dir))
+        other.vault.store_secret(other.jwt_secret_name, ROTATED_SECRET, overwrite=True)
+        token_id, token_value = other.generate_token(TokenType.SESSION, user_id="u")
+        manager.token_metadata[token_id] = other.token_metadata[token_id]
+
+        # Signature inconnue : la clé est relue une fois depuis le vault
+        assert manager.validate_token(token_value)[0] is True
+        assert manager._get_jwt_secret() == ROTATED_SECRET
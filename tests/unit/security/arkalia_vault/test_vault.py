@@ -1,6 +1,7 @@
 # tests/unit/security/arkalia_vault/test_vault.py
 # Tests pour la classe ArkaliaVault
 
+import json
 import shutil
 import tempfile
 from collections.abc import Generator
@@ -8,8 +9,10 @@ from datetime import datetime, timedelta
 from pathlib import Path
 
 import pytest
+from cryptography.fernet import Fernet
 
 from modules.security.crypto import ArkaliaVault, VaultError
+from modules.security.crypto.vault_manager import SecretCache
 
 
 class TestArkaliaVault:
@@ -114,3 +117,90 @@ class TestArkaliaVault:
         assert stats["active_secrets"] == 1
         assert stats["expired_secrets"] == 1
         assert stats["vault_size_bytes"] > 0
+
+    def test_retrieve_decrypts_only_the_requested_record(self, vault, monkeypatch) -> None:
+        for i in range(200):
+            vault.store_secret(f"secret_{i}", f"value_{i}")
+        vault.cache.invalidate()
+        decrypted: list[bytes] = []
+        decrypt = vault.cipher_suite.decrypt
+        monkeypatch.setattr(
+            vault.cipher_suite, "decrypt", lambda token: decrypted.append(token) or decrypt(token)
+        )
+        assert vault.retrieve_secret("secret_42") == "value_42"
+        assert len(decrypted) == 1
+        # Deuxième lecture servie par le cache
+        assert vault.retrieve_secret("secret_42") == "value_42"
+        assert len(decrypted) == 1
+        assert vault.secrets_metadata["secret_42"].access_count == 2
+
+    def test_overwrite_and_delete_invalidate_cache(self, vault) -> None:
+        vault.store_secret("cached", "value1")
+        assert vault.retrieve_secret("cached") == "value1"
+        vault.store_secret("cached", "value2", overwrite=True)
+        assert vault.retrieve_secret("cached") == "value2"
+        vault.delete_secret("cached")
+        assert len(vault.cache) == 0
+
+    def test_vault_reopened_from_records(self, vault, temp_vault_dir) -> None:
+        vault.store_secret("persisted", "value", tags=["keep"])
+        vault.retrieve_secret("persisted")
+        vault.close()
+        reopened = ArkaliaVault(base_dir=temp_vault_dir)
+        assert reopened.retrieve_secret("persisted") == "value"
+        assert reopened.secrets_metadata["persisted"].tags == ["keep"]
+        assert reopened.secrets_metadata["persisted"].access_count == 2
+
+    def test_swapped_records_detected(self, vault) -> None:
+        vault.store_secret("first", "value1")
+        vault.store_secret("second", "value2")
+        vault.cache.invalidate()
+        with vault._db_lock:
+            token = vault._db.execute("SELECT token FROM secrets WHERE name = 'first'").fetchone()
+            vault._db.execute("UPDATE secrets SET token = ? WHERE name = 'second'", token)
+            vault._db.commit()
+        with pytest.raises(VaultError, match="does not match"):
+            vault.retrieve_secret("second")
+
+    def test_legacy_vault_migrated(self, temp_vault_dir) -> None:
+        key = Fernet.generate_key()
+        vault_dir = temp_vault_dir / "security" / "vault"
+        vault_dir.mkdir(parents=True)
+        secrets = {"legacy_a": "value_a", "legacy_b": "value_b"}
+        legacy = Fernet(key).encrypt(json.dumps(secrets).encode())
+        (vault_dir / "secrets.encrypted").write_bytes(legacy)
+        created_at = datetime(2024, 1, 1).isoformat()
+        (vault_dir / "metadata.json").write_text(
+            json.dumps(
+                {
+                    "legacy_a": {
+                        "name": "legacy_a",
+                        "created_at": created_at,
+                        "expires_at": None,
+                        "tags": ["old"],
+                        "access_count": 5,
+                    }
+                }
+            )
+        )
+        vault = ArkaliaVault(base_dir=temp_vault_dir, master_key=key)
+        assert vault.retrieve_secret("legacy_a") == "value_a"
+        assert vault.retrieve_secret("legacy_b") == "value_b"
+        assert vault.secrets_metadata["legacy_a"].access_count == 6
+        assert not (vault_dir / "secrets.encrypted").exists()
+
+
+def test_secret_cache_ttl_and_zeroized_eviction(monkeypatch) -> None:
+    now = [0.0]
+    monkeypatch.setattr("modules.security.crypto.vault_manager.time.monotonic", lambda: now[0])
+    cache = SecretCache(max_entries=2, ttl=10.0)
+    cache.put("a", "alpha")
+    buffer = cache._entries["a"][0]
+    cache.put("b", "beta")
+    cache.put("c", "gamma")  # évince "a"
+    assert cache.get("a") is None
+    assert buffer == bytearray(len("alpha"))
+    assert cache.get("b") == "beta"
+    now[0] = 11.0
+    assert cache.get("b") is None
+    assert len(cache) == 1
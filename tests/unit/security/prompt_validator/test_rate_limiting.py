@@ -0,0 +1,119 @@
+# 🧪 tests/unit/security/prompt_validator/test_rate_limiting.py
+# Tests pour le rate limiting à fenêtre glissante
+
+import pytest
+
+from modules.assistantia.security.prompt_validator import PromptValidator
+from modules.assistantia.security.rate_limiter import (
+    MemoryRateLimiter,
+    RateLimiter,
+    SQLiteRateLimiter,
+)
+
+
+class FakeClock:
+    def __init__(self, now: float = 1_000_000.0) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def make_limiter(request, tmp_path):
+    limiters = []
+
+    def make(**kwargs):
+        if request.param == "memory":
+            limiter = MemoryRateLimiter(**kwargs)
+        else:
+            limiter = SQLiteRateLimiter(tmp_path / "rate_limits.db", **kwargs)
+        limiters.append(limiter)
+        return limiter
+
+    yield make
+    for limiter in limiters:
+        if isinstance(limiter, SQLiteRateLimiter):
+            limiter.close()
+
+
+def test_limit_then_sliding_recovery(make_limiter):
+    """🧠 Limite appliquée, puis récupérée progressivement avec la fenêtre glissante"""
+    clock = FakeClock()
+    limiter = make_limiter(clock=clock)
+
+    results = [limiter.hit("client", 10, 60) for _ in range(11)]
+    assert all(r.allowed for r in results[:10])
+    assert results[9].remaining == 0
+    denied = results[10]
+    assert not denied.allowed
+    assert 0 < denied.retry_after <= 120
+
+    # Un refus ne consomme pas de quota ; passé le délai indiqué, la requête passe
+    clock.now += denied.retry_after + 1e-6
+    assert limiter.hit("client", 10, 60).allowed
+    # Les autres clés sont indépendantes
+    assert limiter.hit("other", 10, 60).allowed
+
+
+def test_previous_window_weight_decays(make_limiter):
+    """🧠 Les requêtes de la fenêtre précédente comptent au prorata du temps restant"""
+    clock = FakeClock(600.0)  # début d'une fenêtre de 60 s
+    limiter = make_limiter(clock=clock)
+    for _ in range(10):
+        assert limiter.allow("k", 10, 60)
+
+    clock.now = 660.0 + 15  # 25 % de la fenêtre suivante : ~7,5 requêtes encore comptées
+    allowed = sum(limiter.allow("k", 10, 60) for _ in range(10))
+    assert allowed == 2
+
+    clock.now = 720.0 + 59  # la fenêtre précédente ne pèse presque plus
+    assert limiter.allow("k", 10, 60)
+
+
+def test_key_space_bounded_and_swept(make_limiter):
+    """🧠 Nombre de clés borné (LRU) et purge des clés inactives"""
+    clock = FakeClock()
+    limiter = make_limiter(clock=clock, max_keys=100, sweep_interval=30)
+    for i in range(500):
+        limiter.hit(f"client-{i}", 10, 60)
+    limiter.sweep()
+    assert len(limiter) == 100
+
+    clock.now += 121  # deux fenêtres sans activité
+    limiter.hit("recent", 10, 60)  # déclenche la purge périodique
+    assert len(limiter) == 1
+
+
+def test_sqlite_limit_shared_between_workers(tmp_path):
+    """🧠 Deux limiteurs sur la même base (deux workers) partagent la limite"""
+    clock = FakeClock()
+    db = tmp_path / "shared.db"
+    worker_a = SQLiteRateLimiter(db, clock=clock)
+    worker_b = SQLiteRateLimiter(db, clock=clock)
+    try:
+        allowed = [(worker_a if i % 2 else worker_b).allow("client", 10, 60) for i in range(20)]
+        assert sum(allowed) == 10
+    finally:
+        worker_a.close()
+        worker_b.close()
+
+
+def test_base_limiter_is_abstract():
+    with pytest.raises(TypeError):
+        RateLimiter()
+
+
+def test_validator_rate_limit_by_prompt_and_client():
+    """🧠 Le validateur limite par prompt, ou par client quand il est fourni"""
+    validator = PromptValidator(rate_limiter=MemoryRateLimiter(clock=FakeClock()))
+    prompt = "Quel est l'état de ZeroIA ?"
+
+    results = [validator.validate_input(prompt) for _ in range(11)]
+    assert "Rate limit dépassé" not in results[9].issues
+    assert "Rate limit dépassé" in results[10].issues
+
+    for i in range(10):
+        assert "Rate limit dépassé" not in validator.validate_input(f"q{i}", "alice").issues
+    assert "Rate limit dépassé" in validator.validate_input("autre", "alice").issues
+    assert "Rate limit dépassé" not in validator.validate_input("autre", "bob").issues
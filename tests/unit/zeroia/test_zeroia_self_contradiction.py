@@ -1,3 +1,4 @@
+import importlib
 from pathlib import Path
 
 import toml
@@ -56,3 +57,31 @@ def test_self_contradiction_detected(tmp_path: Path):
     if log_path.exists():
         log_content = log_path.read_text()
         assert "CONTRADICTION" in log_content.upper() or "contradiction" in log_content.lower()
+
+
+def test_heartbeat_published_next_to_state(tmp_path: Path, isolated_heartbeat_registry):
+    """💓 Le heartbeat ZeroIA suit state_path au lieu du registre du répertoire courant"""
+    from modules.monitoring.heartbeat_registry import HeartbeatRegistry
+
+    # Le paquet modules.zeroia réexporte la fonction reason_loop sous le nom du module
+    rl = importlib.import_module("modules.zeroia.reason_loop")
+    rl.LAST_DECISION = None
+    rl.LAST_DECISION_TIME = None
+    ctx_path = tmp_path / "global_context.toml"
+    reflexia_path = tmp_path / "reflexia_state.toml"
+    toml.dump({"status": {"cpu": 20, "ram": 30, "severity": "normal"}}, ctx_path.open("w"))
+    toml.dump({"decision": {"last_decision": "normal"}}, reflexia_path.open("w"))
+    default_before = isolated_heartbeat_registry.read_all().get("zeroia")
+
+    decision, _ = reason_loop(
+        context_path=ctx_path,
+        reflexia_path=reflexia_path,
+        state_path=tmp_path / "zeroia_state.toml",
+        dashboard_path=tmp_path / "dashboard.json",
+        contradiction_log_path=tmp_path / "conflict.log",
+    )
+
+    heartbeats = HeartbeatRegistry(tmp_path / "module_health.db").read_all()
+    assert heartbeats["zeroia"]["details"]["last_decision"] == decision
+    default_after = isolated_heartbeat_registry.read_all().get("zeroia")
+    assert (default_after or {}).get("updated_at") == (default_before or {}).get("updated_at")